@@ -1,41 +1,44 @@
 from multiprocessing import Process, Queue
-from typing import Any, Callable, TypeVar, Generic
+from typing import Any, Callable, TypeVar, Generic, Optional
 
-from pysim.actors.channel import Channel
-from pysim.actors.environment import collect_exported_methods
+from pysim.actors.channel import Channel, QueueChannel
+from pysim.actors.code_cache import CodeCache
+from pysim.actors.environment import create_mapping
+from pysim.actors.shared_memory_channel import SharedMemoryChannel
 
 T = TypeVar('T')
 
 
-def _create_mapping_from_environment(environment) -> dict[str, Any]:
-    exported_members_ids = collect_exported_methods(type(environment))
-    result = {}
-
-    for member_id in exported_members_ids:
-        # Fighting Python's scope rules
-        def body():
-            nonlocal result
-            member = getattr(environment, member_id)
-            result[member_id] = lambda *args, **kwargs: member(*args, **kwargs)
-
-        body()
-
-    return result
-
-
-def _run(source: str, environment_factory: Callable[[Channel], Any], channel: Channel[T]) -> None:
+def _run(source: str,
+         environment_factory: Callable[[Channel], Any],
+         channel: Channel[T],
+         code_cache: Optional[CodeCache] = None) -> None:
     environment = environment_factory(channel)
-    mapping = _create_mapping_from_environment(environment)
-    exec(source, mapping)
+    mapping = create_mapping(environment)
+    exec(code_cache.compile(source) if code_cache is not None else source, mapping)
 
 
 class Actor(Generic[T]):
     __channel: Channel[T]
 
-    def __init__(self, source: str, environment_factory: Callable[[Channel], Any]):
-        queue: Queue[T] = Queue()
-        self.__channel = Channel(queue)
-        self.__process = Process(target=_run, args=(source, environment_factory, self.__channel))
+    def __init__(self,
+                 source: str,
+                 environment_factory: Callable[[Channel], Any],
+                 shared_memory: bool = False,
+                 code_cache: Optional[CodeCache] = None):
+        """
+        With shared_memory, messages are passed through a SharedMemoryChannel instead of a Queue.
+        With a code_cache having a directory, the actor process loads the compiled source from it.
+        """
+        if shared_memory:
+            self.__channel, actor_channel = SharedMemoryChannel.pair()
+        else:
+            queue: Queue[T] = Queue()
+            self.__channel = actor_channel = QueueChannel(queue)
+        if code_cache is not None:
+            # Compiled here so that the actor process finds it on disk
+            code_cache.compile(source)
+        self.__process = Process(target=_run, args=(source, environment_factory, actor_channel, code_cache))
         self.__process.start()
 
     def send(self, message: T):
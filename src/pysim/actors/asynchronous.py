@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Any, AsyncIterator, Callable, Generic, Optional, TypeVar
+
+from pysim.actors.actor import _run
+from pysim.actors.channel import Channel, PipeChannel
+from pysim.actors.code_cache import CodeCache
+
+T = TypeVar('T')
+
+
+async def _readable(file_descriptor: int) -> None:
+    """
+    Waits until the given file descriptor becomes readable, without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def on_readable() -> None:
+        if not future.done():
+            future.set_result(None)
+
+    loop.add_reader(file_descriptor, on_readable)
+    try:
+        await future
+    finally:
+        loop.remove_reader(file_descriptor)
+
+
+class AsyncChannel(Generic[T]):
+    """
+    Event loop side of a PipeChannel. Receiving suspends the calling coroutine instead of blocking,
+    so that one event loop can serve many channels. Each channel should have a single receiving coroutine at a time.
+    Iterating asynchronously yields received messages until the other end is closed.
+    """
+
+    __connection: Connection
+
+    def __init__(self, connection: Connection):
+        self.__connection = connection
+
+    def send(self, message: T) -> None:
+        self.__connection.send(message)
+
+    async def receive(self) -> T:
+        """
+        Raises EOFError if the other end has been closed.
+        """
+        while not self.__connection.poll():
+            await _readable(self.__connection.fileno())
+        # Only the start of a large message may have arrived, so the rest is read off the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, self.__connection.recv)
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        try:
+            return await self.receive()
+        except EOFError:
+            raise StopAsyncIteration()
+
+    def close(self) -> None:
+        self.__connection.close()
+
+
+class AsyncActor(Generic[T]):
+    """
+    Actor whose messages are received by awaiting instead of blocking.
+    """
+
+    __channel: AsyncChannel[T]
+    __process: Process
+
+    def __init__(self,
+                 source: str,
+                 environment_factory: Callable[[Channel], Any],
+                 code_cache: Optional[CodeCache] = None):
+        connection, actor_connection = Pipe(duplex=True)
+        self.__channel = AsyncChannel(connection)
+        self.__process = Process(
+            target=_run,
+            args=(source, environment_factory, PipeChannel(actor_connection), code_cache),
+            daemon=True
+        )
+        self.__process.start()
+        # Only the actor process keeps its end open, so that receiving ends once it exits
+        actor_connection.close()
+
+    @property
+    def channel(self) -> AsyncChannel[T]:
+        return self.__channel
+
+    def send(self, message: T) -> None:
+        self.__channel.send(message)
+
+    async def receive(self) -> T:
+        return await self.__channel.receive()
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self.__channel.__aiter__()
+
+    async def wait(self) -> Optional[int]:
+        """
+        Waits for the actor process to exit and returns its exit code.
+        """
+        await _readable(self.__process.sentinel)
+        self.__process.join()
+        return self.__process.exitcode
+
+    def kill(self) -> None:
+        """
+        Stops the actor process at once.
+        """
+        self.__process.kill()
+
+    def close(self) -> None:
+        """
+        Kills the actor process if it is still running and releases it along with the channel.
+        """
+        if self.__process.is_alive():
+            self.__process.kill()
+        self.__process.join()
+        self.__process.close()
+        self.__channel.close()
@@ -1,11 +1,28 @@
+from abc import ABC, abstractmethod
 from multiprocessing import Queue
+from multiprocessing.connection import Connection
+from queue import Empty
 from typing import TypeVar, Generic
 
 T = TypeVar('T')
 
 
-class Channel(Generic[T]):
+class Channel(ABC, Generic[T]):
+    @abstractmethod
+    def send(self, message: T) -> None:
+        ...
+
+    @abstractmethod
+    def receive(self) -> T:
+        """
+        Raises Empty if no message arrives in time.
+        """
+        ...
+
+
+class QueueChannel(Channel[T]):
     __queue: Queue
+    __timeout: float
 
     def __init__(self, queue: Queue, timeout: float = 1):
         self.__queue = queue
@@ -16,3 +33,24 @@ class Channel(Generic[T]):
 
     def receive(self) -> T:
         return self.__queue.get(block=True, timeout=self.__timeout)
+
+
+class PipeChannel(Channel[T]):
+    """
+    Channel over one end of a duplex Pipe. Unlike a Queue, the other end can be waited on by an event loop.
+    """
+
+    __connection: Connection
+    __timeout: float
+
+    def __init__(self, connection: Connection, timeout: float = 1):
+        self.__connection = connection
+        self.__timeout = timeout
+
+    def send(self, message: T) -> None:
+        self.__connection.send(message)
+
+    def receive(self) -> T:
+        if not self.__connection.poll(self.__timeout):
+            raise Empty()
+        return self.__connection.recv()
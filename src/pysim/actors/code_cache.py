@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import marshal
+import os
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from types import CodeType
+from typing import Any, Optional, Union
+
+# Bumped whenever the validation rules change, invalidating cached results
+_VALIDATION_VERSION = 1
+
+_FILENAME = '<actor>'
+
+
+def _key(source: str) -> str:
+    # Code objects are only valid for the bytecode version they were compiled with
+    digest = hashlib.sha256(MAGIC_NUMBER)
+    digest.update(source.encode())
+    return digest.hexdigest()
+
+
+def _validate(source: str, allow_imports: bool) -> list[str]:
+    try:
+        tree = ast.parse(source, _FILENAME)
+    except SyntaxError as e:
+        return [f'line {e.lineno}: syntax error: {e.msg}']
+    problems = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and not allow_imports:
+            problems.append(f'line {node.lineno}: imports are not allowed')
+        elif isinstance(node, ast.Attribute) and node.attr.startswith('__'):
+            problems.append(f'line {node.lineno}: access to {node.attr} is not allowed')
+    return problems
+
+
+class CodeCache:
+    """
+    Compiles actor source, keeping the code objects both in memory and, if a directory is given,
+    marshalled to disk, so that other processes can load them instead of compiling the source again.
+    Entries are keyed by a hash of the source and are never invalidated, as the same source always compiles to the same code.
+    """
+
+    __directory: Optional[Path]
+    __code: dict[str, CodeType]
+    __problems: dict[tuple[str, bool], list[str]]
+
+    def __init__(self, directory: Union[str, Path, None] = None):
+        self.__directory = Path(directory) if directory is not None else None
+        if self.__directory is not None:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__code = {}
+        self.__problems = {}
+
+    @property
+    def directory(self) -> Optional[Path]:
+        return self.__directory
+
+    def compile(self, source: str) -> CodeType:
+        """
+        Raises SyntaxError if source is invalid.
+        """
+        key = _key(source)
+        code = self.__code.get(key)
+        if code is None:
+            code = self.__load_code(key)
+        if code is None:
+            code = compile(source, _FILENAME, 'exec')
+            self.__store(key, '.code', marshal.dumps(code))
+        self.__code[key] = code
+        return code
+
+    def validate(self, source: str, allow_imports: bool = False) -> list[str]:
+        """
+        Checks source for syntax errors and disallowed constructs, being imports and dunder attributes.
+        Returns a description of every problem found.
+        """
+        key = _key(source)
+        problems = self.__problems.get((key, allow_imports))
+        if problems is None:
+            suffix = f'.{_VALIDATION_VERSION}.{int(allow_imports)}.json'
+            stored = self.__load(key, suffix)
+            if stored is not None:
+                problems = json.loads(stored)
+            else:
+                problems = _validate(source, allow_imports)
+                self.__store(key, suffix, json.dumps(problems).encode())
+            self.__problems[(key, allow_imports)] = problems
+        return list(problems)
+
+    def __load_code(self, key: str) -> Optional[CodeType]:
+        data = self.__load(key, '.code')
+        if data is None:
+            return None
+        try:
+            code = marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            code = None
+        # Anything else is a corrupt or foreign entry, which will be overwritten
+        return code if isinstance(code, CodeType) else None
+
+    def __load(self, key: str, suffix: str) -> Optional[bytes]:
+        if self.__directory is None:
+            return None
+        try:
+            return (self.__directory / (key + suffix)).read_bytes()
+        except OSError:
+            return None
+
+    def __store(self, key: str, suffix: str, data: bytes) -> None:
+        if self.__directory is None:
+            return
+        path = self.__directory / (key + suffix)
+        # Written under a unique name first, so that concurrent readers never see partial files
+        temporary = path.with_suffix(f'{path.suffix}.{os.getpid()}.tmp')
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    def __reduce__(self) -> Any:
+        # Only the directory is passed on to other processes
+        return CodeCache, (self.__directory,)
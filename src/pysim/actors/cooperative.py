@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import ast
+from types import CodeType
+from typing import Any, Collection, List, Optional
+
+from pysim.actors.environment import collect_exported_methods
+
+_FILENAME = '<actor>'
+_PROGRAM = '__program__'
+
+
+def _called_names(function: ast.FunctionDef) -> set[str]:
+    """
+    Returns the names of the functions called directly by the given one, not counting nested definitions.
+    """
+    names = set()
+    pending: List[ast.AST] = list(function.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            names.add(node.func.id)
+        pending.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def _cooperative_functions(tree: ast.Module, exported: Collection[str]) -> set[str]:
+    """
+    Returns the names of the functions defined by the program that call exported functions,
+    directly or through other such functions.
+    """
+    functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+    result: set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for function in functions:
+            if function.name not in result and _called_names(function) & (set(exported) | result):
+                result.add(function.name)
+                changed = True
+    return result
+
+
+def _global_names(statements: List[ast.stmt]) -> set[str]:
+    """
+    Returns the names bound by the given module level statements.
+    """
+    names = set()
+    pending: List[ast.AST] = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            continue
+        if isinstance(node, ast.Lambda):
+            continue
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, ast.alias):
+            names.add((node.asname or node.name).split('.')[0])
+        pending.extend(ast.iter_child_nodes(node))
+    return names
+
+
+class _CallTransformer(ast.NodeTransformer):
+    """
+    Turns calls to exported functions into yields of (name, args, kwargs),
+    and calls to cooperative functions into yield froms.
+    """
+
+    __exported: Collection[str]
+    __cooperative: set[str]
+    # Depth of lambdas and comprehensions, in which yields are not allowed
+    __nesting: int
+
+    def __init__(self, exported: Collection[str], cooperative: set[str]):
+        self.__exported = exported
+        self.__cooperative = cooperative
+        self.__nesting = 0
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Name):
+            self.generic_visit(node)
+            return node
+        # The called name is not visited, as visit_Name would reject it
+        node.args = [self.visit(argument) for argument in node.args]
+        node.keywords = [self.visit(keyword) for keyword in node.keywords]
+        name = node.func.id
+        if name in self.__exported:
+            self.__check_nesting(node, name)
+            keys: List[Optional[ast.expr]] = [ast.Constant(keyword.arg) if keyword.arg is not None else None
+                                              for keyword in node.keywords]
+            request = ast.Tuple(
+                elts=[
+                    ast.Constant(name),
+                    ast.Tuple(elts=node.args, ctx=ast.Load()),
+                    ast.Dict(keys=keys, values=[keyword.value for keyword in node.keywords]),
+                ],
+                ctx=ast.Load()
+            )
+            return ast.copy_location(ast.Yield(value=request), node)
+        if name in self.__cooperative:
+            self.__check_nesting(node, name)
+            return ast.copy_location(ast.YieldFrom(value=node), node)
+        return node
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        # Calls through other references would go undriven, doing nothing
+        if isinstance(node.ctx, ast.Load) and (node.id in self.__exported or node.id in self.__cooperative):
+            raise SyntaxError(f'line {node.lineno}: {node.id} can only be called directly by name')
+        return node
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        return self.__visit_nested(node)
+
+    def visit_ListComp(self, node: ast.ListComp) -> ast.AST:
+        return self.__visit_nested(node)
+
+    def visit_SetComp(self, node: ast.SetComp) -> ast.AST:
+        return self.__visit_nested(node)
+
+    def visit_DictComp(self, node: ast.DictComp) -> ast.AST:
+        return self.__visit_nested(node)
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp) -> ast.AST:
+        return self.__visit_nested(node)
+
+    def __visit_nested(self, node: ast.AST) -> ast.AST:
+        self.__nesting += 1
+        self.generic_visit(node)
+        self.__nesting -= 1
+        return node
+
+    def __check_nesting(self, node: ast.Call, name: str) -> None:
+        if self.__nesting > 0:
+            raise SyntaxError(f'line {node.lineno}: {name} cannot be called from within a lambda or comprehension')
+
+
+def _check_methods(tree: ast.Module, cooperative: set[str]) -> None:
+    """
+    Rejects methods calling exported functions, as calls to methods are not recognized and so would never be driven.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            for member in ast.walk(node):
+                if isinstance(member, ast.FunctionDef) and member.name in cooperative:
+                    raise SyntaxError(f'line {member.lineno}: method {member.name} cannot call exported functions')
+
+
+def compile_cooperative(source: str, exported: Collection[str]) -> CodeType:
+    """
+    Compiles source into a module defining a generator function __program__, which runs source
+    and yields a (name, args, kwargs) tuple at every call to an exported function, expecting its result to be sent back.
+    Functions defined by source that call exported functions become generators themselves, and are called using yield from.
+    Calls are only recognized by name, so exported functions and functions calling them cannot be referred to
+    other than by calling them directly, cannot be methods, and cannot be called from within lambdas or comprehensions.
+    Programs breaking these rules raise SyntaxError.
+    """
+    tree = ast.parse(source, _FILENAME)
+    cooperative = _cooperative_functions(tree, exported)
+    _check_methods(tree, cooperative)
+    global_names = _global_names(tree.body)
+    body = _CallTransformer(exported, cooperative).visit(tree).body
+
+    program = ast.parse(f'def {_PROGRAM}():\n    if False:\n        yield\n', _FILENAME)
+    function = program.body[0]
+    # Module level names must remain globals for the functions defined by source to see them
+    declarations: List[ast.stmt] = [ast.Global(names=sorted(global_names))] if global_names else []
+    function.body = declarations + body + function.body
+    return compile(ast.fix_missing_locations(program), _FILENAME, 'exec')
+
+
+class CooperativeActor:
+    """
+    Agent program running as a generator, performing one exported call each time it is stepped.
+    """
+
+    __environment: Any
+    __generator: Any
+    # Outcome of the last exported call, to be passed to the program when resumed
+    __result: Any
+    __exception: Optional[BaseException]
+    __finished: bool
+    __error: Optional[BaseException]
+    __call_count: int
+
+    def __init__(self, code: CodeType, environment: Any):
+        mapping: dict[str, Any] = {}
+        exec(code, mapping)
+        self.__environment = environment
+        self.__generator = mapping[_PROGRAM]()
+        self.__result = None
+        self.__exception = None
+        self.__finished = False
+        self.__error = None
+        self.__call_count = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """
+        Exception raised by the program, if it ended because of one.
+        """
+        return self.__error
+
+    @property
+    def call_count(self) -> int:
+        return self.__call_count
+
+    def step(self) -> bool:
+        """
+        Runs the program up to its next exported call and performs that call.
+        Returns False if the program has finished instead.
+        """
+        if self.__finished:
+            return False
+        try:
+            if self.__exception is not None:
+                exception, self.__exception = self.__exception, None
+                name, args, kwargs = self.__generator.throw(exception)
+            else:
+                name, args, kwargs = self.__generator.send(self.__result)
+        except StopIteration:
+            self.__finished = True
+            return False
+        except Exception as e:
+            self.__finished = True
+            self.__error = e
+            return False
+        self.__call_count += 1
+        self.__result = None
+        try:
+            # Exceptions are raised in the program as if the call had been made directly
+            self.__result = getattr(self.__environment, name)(*args, **kwargs)
+        except Exception as e:
+            self.__exception = e
+        return True
+
+
+class CooperativeScheduler:
+    """
+    Runs many agent programs in this process, interleaving them at exported calls.
+    Every round, each unfinished program gets to perform exactly one exported call, in the order they were spawned.
+    Scheduling is cooperative: a program computing without making exported calls holds up all others.
+    """
+
+    __actors: List[CooperativeActor]
+    __code: dict[tuple[str, frozenset[str]], CodeType]
+
+    def __init__(self):
+        self.__actors = []
+        self.__code = {}
+
+    @property
+    def actors(self) -> List[CooperativeActor]:
+        return list(self.__actors)
+
+    @property
+    def finished(self) -> bool:
+        return all(actor.finished for actor in self.__actors)
+
+    def spawn(self, source: str, environment: Any) -> CooperativeActor:
+        """
+        Adds a program calling the exported methods of environment. Programs with the same source
+        and environment type are compiled only once.
+        """
+        exported = frozenset(collect_exported_methods(type(environment)))
+        key = (source, exported)
+        code = self.__code.get(key)
+        if code is None:
+            code = self.__code[key] = compile_cooperative(source, exported)
+        actor = CooperativeActor(code, environment)
+        self.__actors.append(actor)
+        return actor
+
+    def step(self) -> int:
+        """
+        Runs a single round, returning the number of exported calls made.
+        """
+        return sum(1 for actor in self.__actors if actor.step())
+
+    def run(self, max_rounds: Optional[int] = None) -> None:
+        """
+        Runs rounds until all programs have finished, or max_rounds rounds have been run.
+        """
+        rounds = 0
+        while (max_rounds is None or rounds < max_rounds) and self.step() > 0:
+            rounds += 1
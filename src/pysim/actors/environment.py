@@ -6,9 +6,35 @@ def export(func):
     return func
 
 
+def is_command(func) -> bool:
+    """
+    Exported methods annotated as returning None are commands: callers need not wait for them to complete.
+    """
+    return func.__annotations__.get('return', ...) in (None, 'None')
+
+
 def is_exported_method(obj: Any) -> bool:
     return hasattr(obj, 'exported') and callable(obj) and obj.exported
 
 
 def collect_exported_methods(cl):
     return [identifier for identifier, member in cl.__dict__.items() if is_exported_method(member)]
+
+
+def create_mapping(environment) -> dict[str, Any]:
+    """
+    Returns the globals under which actor source runs, consisting of the environment's exported methods.
+    """
+    exported_members_ids = collect_exported_methods(type(environment))
+    result = {}
+
+    for member_id in exported_members_ids:
+        # Fighting Python's scope rules
+        def body():
+            nonlocal result
+            member = getattr(environment, member_id)
+            result[member_id] = lambda *args, **kwargs: member(*args, **kwargs)
+
+        body()
+
+    return result
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import resource
+from itertools import count
+from multiprocessing import Queue
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Generic, Iterable, List, Optional, TypeVar
+
+from pysim.actors.actor import _run
+from pysim.actors.channel import Channel, QueueChannel
+from pysim.actors.code_cache import CodeCache
+
+T = TypeVar('T')
+
+_PRELOADED_MODULES = ['pysim.actors.actor', 'pysim.actors.code_cache', 'pysim.actors.environment', 'pysim.simulation.simulation']
+
+
+class _TaggedChannel(QueueChannel[T]):
+    """
+    Channel receiving from inbox and sending to outbox, both shared by all jobs of a worker.
+    Messages are tagged with the job they belong to,
+    so that messages left behind by earlier jobs are skipped instead of received.
+    """
+
+    __outbox: Queue
+    __tag: int
+
+    def __init__(self, inbox: Queue, outbox: Queue, tag: int, timeout: float = 1):
+        super().__init__(inbox, timeout)
+        self.__outbox = outbox
+        self.__tag = tag
+
+    def send(self, message: T) -> None:
+        self.__outbox.put((self.__tag, message))
+
+    def receive(self) -> T:
+        while True:
+            tag, message = super().receive()
+            if tag == self.__tag:
+                return message
+
+
+def _memory_usage() -> int:
+    # Peak resident set size, in bytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _work(connection: Connection,
+          inbox: Queue,
+          outbox: Queue,
+          max_jobs: Optional[int],
+          max_memory_growth: int,
+          code_cache: CodeCache) -> None:
+    baseline = _memory_usage()
+    jobs = range(max_jobs) if max_jobs is not None else count()
+    for job_index in jobs:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        tag, source, environment_factory = job
+        error = None
+        try:
+            # Every job runs with fresh globals, so no state carries over except for imported modules
+            _run(source, environment_factory, _TaggedChannel(inbox, outbox, tag), code_cache)
+        except Exception as e:
+            error = repr(e)
+        gc.collect()
+        retire = job_index + 1 == max_jobs or _memory_usage() - baseline > max_memory_growth
+        connection.send((error, retire))
+        if retire:
+            return
+
+
+class _Worker:
+    __process: multiprocessing.Process
+    __connection: Connection
+    __inbox: Queue
+    __outbox: Queue
+    __job_count: int
+    __actor: Optional[PooledActor]
+    __retired: bool
+
+    def __init__(self, context: Any, max_jobs: Optional[int], max_memory_growth: int, code_cache: CodeCache):
+        self.__connection, child_connection = context.Pipe()
+        self.__inbox = context.Queue()
+        self.__outbox = context.Queue()
+        self.__process = context.Process(
+            target=_work,
+            args=(child_connection, self.__outbox, self.__inbox, max_jobs, max_memory_growth, code_cache),
+            daemon=True
+        )
+        self.__process.start()
+        child_connection.close()
+        self.__job_count = 0
+        self.__actor = None
+        self.__retired = False
+
+    @property
+    def connection(self) -> Connection:
+        return self.__connection
+
+    @property
+    def pid(self) -> int:
+        return self.__process.pid
+
+    @property
+    def is_idle(self) -> bool:
+        return self.__actor is None and not self.__retired
+
+    @property
+    def is_retired(self) -> bool:
+        return self.__retired
+
+    def start(self, source: str, environment_factory: Callable[[Channel], Any]) -> PooledActor:
+        assert self.is_idle
+        self.__job_count += 1
+        self.__connection.send((self.__job_count, source, environment_factory))
+        self.__actor = PooledActor(self, _TaggedChannel(self.__inbox, self.__outbox, self.__job_count))
+        return self.__actor
+
+    def poll(self, timeout: Optional[float] = 0) -> None:
+        """
+        Collects the result of the current job if it has finished.
+        """
+        if self.__actor is not None and self.__connection.poll(timeout):
+            try:
+                error, self.__retired = self.__connection.recv()
+            except EOFError:
+                error, self.__retired = 'worker died', True
+            self.__actor._finish(error)
+            self.__actor = None
+
+    def stop(self) -> None:
+        if not self.__retired:
+            try:
+                self.__connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.__retired = True
+        self.__process.join(timeout=1)
+        if self.__process.is_alive():
+            self.__process.terminate()
+        self.__connection.close()
+
+
+class PooledActor(Generic[T]):
+    """
+    Handle to a program running on one of the workers of an ActorPool.
+    Offers the same interface as Actor, and in addition allows waiting for the program to finish.
+    """
+
+    __worker: _Worker
+    __channel: Channel[T]
+    __finished: bool
+    __error: Optional[str]
+
+    def __init__(self, worker: _Worker, channel: Channel[T]):
+        self.__worker = worker
+        self.__channel = channel
+        self.__finished = False
+        self.__error = None
+
+    @property
+    def pid(self) -> int:
+        return self.__worker.pid
+
+    @property
+    def is_finished(self) -> bool:
+        self.__worker.poll()
+        return self.__finished
+
+    def send(self, message: T) -> None:
+        self.__channel.send(message)
+
+    def receive(self) -> T:
+        return self.__channel.receive()
+
+    def wait(self) -> Optional[str]:
+        """
+        Waits for the program to finish and returns the representation of the exception it raised, if any.
+        """
+        while not self.__finished:
+            self.__worker.poll(timeout=None)
+        return self.__error
+
+    def _finish(self, error: Optional[str]) -> None:
+        self.__finished = True
+        self.__error = error
+
+
+class ActorPool:
+    """
+    Runs actor programs on a fixed number of reusable worker processes, saving the startup cost of a process per actor.
+    Workers are forked from a server which has pysim imported already.
+    A worker is replaced by a fresh one after running max_jobs_per_worker programs,
+    or once its peak memory usage has grown by more than max_memory_growth bytes.
+    Each worker compiles a program only once, and if code_cache has a directory, only one worker does.
+    """
+
+    __context: Any
+    __size: int
+    __max_jobs_per_worker: Optional[int]
+    __max_memory_growth: int
+    __code_cache: CodeCache
+    __workers: List[_Worker]
+
+    def __init__(self,
+                 size: int,
+                 max_jobs_per_worker: Optional[int] = 100,
+                 max_memory_growth: int = 256 * 2 ** 20,
+                 preload: Iterable[str] = _PRELOADED_MODULES,
+                 code_cache: Optional[CodeCache] = None):
+        assert size > 0
+        assert max_jobs_per_worker is None or max_jobs_per_worker > 0
+        self.__context = multiprocessing.get_context('forkserver')
+        self.__context.set_forkserver_preload(list(preload))
+        self.__size = size
+        self.__max_jobs_per_worker = max_jobs_per_worker
+        self.__max_memory_growth = max_memory_growth
+        self.__code_cache = code_cache if code_cache is not None else CodeCache()
+        self.__workers = []
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def start(self, source: str, environment_factory: Callable[[Channel], Any]) -> PooledActor:
+        """
+        Runs source on an idle worker, waiting for one to become available if needed.
+        environment_factory must be picklable.
+        """
+        worker = self.__acquire()
+        if self.__code_cache.directory is not None:
+            self.__code_cache.compile(source)
+        return worker.start(source, environment_factory)
+
+    def close(self) -> None:
+        for worker in self.__workers:
+            worker.stop()
+        self.__workers = []
+
+    def __enter__(self) -> ActorPool:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __acquire(self) -> _Worker:
+        while True:
+            for worker in self.__workers:
+                worker.poll()
+            for worker in [worker for worker in self.__workers if worker.is_retired]:
+                worker.stop()
+                self.__workers.remove(worker)
+            idle = next((worker for worker in self.__workers if worker.is_idle), None)
+            if idle is not None:
+                return idle
+            if len(self.__workers) < self.__size:
+                worker = _Worker(self.__context, self.__max_jobs_per_worker, self.__max_memory_growth, self.__code_cache)
+                self.__workers.append(worker)
+                return worker
+            wait([worker.connection for worker in self.__workers])
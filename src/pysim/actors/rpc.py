@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from multiprocessing import Pipe, Process
+from queue import Empty
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+
+from pysim.actors.channel import Channel, PipeChannel
+from pysim.actors.environment import collect_exported_methods, is_command
+
+T = TypeVar('T')
+
+# Message kinds
+_CALLS = 'calls'
+_RESULTS = 'results'
+_CLOSE = 'close'
+
+Call = tuple[int, str, tuple, dict]
+Result = tuple[int, bool, Any]
+
+
+class RemoteError(Exception):
+    """
+    Raised on the calling side when an exported method raised an exception.
+    """
+    pass
+
+
+def exported_commands(cl) -> dict[str, bool]:
+    """
+    Maps the names of the exported methods of a class to whether they are commands.
+    """
+    return {identifier: is_command(getattr(cl, identifier)) for identifier in collect_exported_methods(cl)}
+
+
+class Future(Generic[T]):
+    __client: RpcClient
+    __done: bool
+    __value: Optional[T]
+    __error: Optional[str]
+
+    def __init__(self, client: RpcClient):
+        self.__client = client
+        self.__done = False
+        self.__value = None
+        self.__error = None
+
+    @property
+    def done(self) -> bool:
+        return self.__done
+
+    def result(self) -> T:
+        """
+        Waits for the call to complete, sending any calls still pending first.
+        """
+        if not self.__done:
+            self.__client.wait_for(self)
+        if self.__error is not None:
+            raise RemoteError(self.__error)
+        return self.__value
+
+    def _resolve(self, succeeded: bool, value: Any) -> None:
+        self.__done = True
+        if succeeded:
+            self.__value = value
+        else:
+            self.__error = value
+
+
+class RpcClient:
+    """
+    Calling side of the protocol, running in the actor process.
+    Calls are numbered and queued until a result is needed, or batch_size of them have accumulated,
+    and are then sent together as a single message.
+    Commands get no reply unless they fail, in which case the error is raised from the next call that is waited for.
+    """
+
+    __channel: Channel
+    __batch_size: int
+    __pending: List[Call]
+    __futures: dict[int, Future]
+    __next_id: int
+    __errors: List[str]
+
+    def __init__(self, channel: Channel, batch_size: int = 64):
+        assert batch_size > 0
+        self.__channel = channel
+        self.__batch_size = batch_size
+        self.__pending = []
+        self.__futures = {}
+        self.__next_id = 0
+        self.__errors = []
+
+    def submit(self, name: str, *args, **kwargs) -> Future:
+        """
+        Queues a call whose result is to be waited for, without waiting.
+        """
+        future = Future(self)
+        self.__futures[self.__enqueue(name, args, kwargs)] = future
+        return future
+
+    def command(self, name: str, *args, **kwargs) -> None:
+        """
+        Queues a call whose result is of no interest.
+        """
+        self.__enqueue(name, args, kwargs)
+
+    def call(self, name: str, *args, **kwargs) -> Any:
+        return self.submit(name, *args, **kwargs).result()
+
+    def flush(self) -> None:
+        if self.__pending:
+            self.__channel.send((_CALLS, self.__pending))
+            self.__pending = []
+
+    def wait_for(self, future: Future) -> None:
+        self.flush()
+        while not future.done:
+            self.__handle_results(self.__receive())
+        self.__raise_errors()
+
+    def close(self) -> None:
+        """
+        Sends pending calls and waits until all have been executed.
+        """
+        self.flush()
+        self.__channel.send((_CLOSE,))
+        while self.__handle_results(self.__receive()):
+            pass
+        self.__raise_errors()
+
+    def create_mapping(self, commands: dict[str, bool]) -> dict[str, Callable]:
+        """
+        Returns stubs for the given exported methods, to be used as globals for actor source.
+        """
+        def stub(name: str, command: bool) -> Callable:
+            if command:
+                return lambda *args, **kwargs: self.command(name, *args, **kwargs)
+            else:
+                return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+        return {name: stub(name, command) for name, command in commands.items()}
+
+    def __enqueue(self, name: str, args: tuple, kwargs: dict) -> int:
+        call_id = self.__next_id
+        self.__next_id += 1
+        self.__pending.append((call_id, name, args, kwargs))
+        if len(self.__pending) >= self.__batch_size:
+            self.flush()
+        return call_id
+
+    def __receive(self) -> Any:
+        # The channel blocks until a message arrives or it times out
+        while True:
+            try:
+                return self.__channel.receive()
+            except Empty:
+                pass
+
+    def __handle_results(self, message: Any) -> bool:
+        """
+        Returns False if the message acknowledges closing.
+        """
+        kind, results = message
+        for call_id, succeeded, value in results:
+            future = self.__futures.pop(call_id, None)
+            if future is not None:
+                future._resolve(succeeded, value)
+            else:
+                self.__errors.append(value)
+        return kind == _RESULTS
+
+    def __raise_errors(self) -> None:
+        if self.__errors:
+            errors, self.__errors = self.__errors, []
+            raise RemoteError('; '.join(errors))
+
+
+class RpcServer:
+    """
+    Executing side of the protocol, calling the exported methods of an environment.
+    Replies once per batch of calls holding at least one query, with the results of all queries in it
+    and the errors raised by commands.
+    """
+
+    __environment: Any
+    __channel: Channel
+    __commands: dict[str, bool]
+    __closed: bool
+
+    def __init__(self, environment: Any, channel: Channel):
+        self.__environment = environment
+        self.__channel = channel
+        self.__commands = exported_commands(type(environment))
+        self.__closed = False
+
+    @property
+    def commands(self) -> dict[str, bool]:
+        return self.__commands
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def handle(self, message: Any) -> None:
+        if message[0] == _CLOSE:
+            self.__closed = True
+            self.__channel.send((_CLOSE, []))
+            return
+        kind, calls = message
+        assert kind == _CALLS
+        results: List[Result] = []
+        has_query = False
+        for call_id, name, args, kwargs in calls:
+            command = self.__commands.get(name)
+            has_query = has_query or not command
+            try:
+                if command is None:
+                    raise AttributeError(f'{name} is not exported')
+                value = getattr(self.__environment, name)(*args, **kwargs)
+                if not command:
+                    results.append((call_id, True, value))
+            except Exception as e:
+                results.append((call_id, False, repr(e)))
+        if has_query or results:
+            self.__channel.send((_RESULTS, results))
+
+
+def _run(source: str, commands: dict[str, bool], channel: Channel, batch_size: int) -> None:
+    client = RpcClient(channel, batch_size)
+    try:
+        exec(source, client.create_mapping(commands))
+    finally:
+        # Calls made before an error are still executed
+        client.close()
+
+
+class RpcActor:
+    """
+    Runs source in a separate process, with the exported methods of an environment living in this process.
+    Calls from source are forwarded using RpcClient and executed by serve.
+    Batches of calls and results are pickled whole, so they are passed over a pipe rather than shared memory.
+    """
+
+    __server: RpcServer
+    __channel: Channel
+    __process: Process
+
+    def __init__(self, source: str, environment: Any, batch_size: int = 64):
+        connection, actor_connection = Pipe()
+        self.__channel = PipeChannel(connection)
+        actor_channel = PipeChannel(actor_connection)
+        self.__server = RpcServer(environment, self.__channel)
+        self.__process = Process(
+            target=_run,
+            args=(source, self.__server.commands, actor_channel, batch_size),
+            daemon=True
+        )
+        self.__process.start()
+
+    @property
+    def finished(self) -> bool:
+        return self.__server.closed
+
+    def serve(self) -> None:
+        """
+        Executes calls until source has finished or its process has died.
+        """
+        while not self.__server.closed:
+            try:
+                self.__server.handle(self.__channel.receive())
+            except Empty:
+                if not self.__process.is_alive():
+                    break
+        self.__process.join()
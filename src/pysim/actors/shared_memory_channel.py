@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import struct
+import time
+from multiprocessing import Queue
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty, Full
+from typing import Any, Optional, TypeVar
+
+from pysim.actors.channel import QueueChannel
+
+T = TypeVar('T')
+
+# Record types
+_FALLBACK = 0
+_NONE = 1
+_BOOL = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_COMMAND = 6
+_WRAP = 255
+
+# Type, unused byte and payload length
+_RECORD_HEADER = struct.Struct('<BxH')
+_ALIGNMENT = 4
+_BOOL_PAYLOAD = struct.Struct('<?')
+_INT_PAYLOAD = struct.Struct('<q')
+_FLOAT_PAYLOAD = struct.Struct('<d')
+_MAX_PAYLOAD = 1024
+_MIN_INT = -2 ** 63
+_MAX_INT = 2 ** 63 - 1
+
+# Read and write counters, placed before the data
+_COUNTERS_SIZE = 16
+
+# Number of times to merely yield to other threads before sleeping while waiting for the other side
+_SPIN_COUNT = 100
+_SLEEP_TIME = 0.0001
+
+
+def _is_int64(value: Any) -> bool:
+    return type(value) is int and _MIN_INT <= value <= _MAX_INT
+
+
+def _back_off(attempt: int) -> None:
+    time.sleep(0 if attempt < _SPIN_COUNT else _SLEEP_TIME)
+
+
+def _encode(message: Any) -> Optional[tuple[int, bytes]]:
+    """
+    Encodes messages of the common kinds: None, bools, ints, floats, short strings
+    and commands, being tuples of a short string followed by ints.
+    Returns None for any other message.
+    """
+    if message is None:
+        return _NONE, b''
+    kind = type(message)
+    if kind is bool:
+        return _BOOL, _BOOL_PAYLOAD.pack(message)
+    if kind is int and _is_int64(message):
+        return _INT, _INT_PAYLOAD.pack(message)
+    if kind is float:
+        return _FLOAT, _FLOAT_PAYLOAD.pack(message)
+    if kind is str:
+        payload = message.encode()
+        return (_STR, payload) if len(payload) <= _MAX_PAYLOAD else None
+    if kind is tuple and len(message) > 0 and type(message[0]) is str and all(map(_is_int64, message[1:])):
+        name = message[0].encode()
+        if len(name) < 256 and 1 + len(name) + 8 * (len(message) - 1) <= _MAX_PAYLOAD:
+            return _COMMAND, bytes([len(name)]) + name + struct.pack(f'<{len(message) - 1}q', *message[1:])
+    return None
+
+
+def _decode(kind: int, payload: bytes) -> Any:
+    if kind == _NONE:
+        return None
+    if kind == _BOOL:
+        return _BOOL_PAYLOAD.unpack(payload)[0]
+    if kind == _INT:
+        return _INT_PAYLOAD.unpack(payload)[0]
+    if kind == _FLOAT:
+        return _FLOAT_PAYLOAD.unpack(payload)[0]
+    if kind == _STR:
+        return payload.decode()
+    assert kind == _COMMAND, f'unknown record type {kind}'
+    name_length = payload[0]
+    name = payload[1:1 + name_length].decode()
+    arguments = payload[1 + name_length:]
+    return (name, *struct.unpack(f'<{len(arguments) // 8}q', arguments))
+
+
+class _RingBuffer:
+    """
+    Single producer, single consumer queue of records in shared memory.
+    Records are written contiguously; one that does not fit before the end of the buffer
+    is preceded by a wrap record telling the consumer to continue at the start.
+    """
+
+    __memory: SharedMemory
+    __owner: bool
+    __capacity: int
+    # Total number of bytes written and read
+    __counters: memoryview
+    __data: memoryview
+    __closed: bool
+
+    def __init__(self, memory: SharedMemory, owner: bool):
+        self.__memory = memory
+        self.__owner = owner
+        self.__closed = False
+        self.__capacity = memory.size - _COUNTERS_SIZE
+        self.__counters = memory.buf[:_COUNTERS_SIZE].cast('Q')
+        self.__data = memory.buf[_COUNTERS_SIZE:_COUNTERS_SIZE + self.__capacity]
+
+    @staticmethod
+    def create(capacity: int) -> _RingBuffer:
+        assert capacity % _ALIGNMENT == 0
+        assert capacity >= 2 * (_RECORD_HEADER.size + _MAX_PAYLOAD + _ALIGNMENT)
+        memory = SharedMemory(create=True, size=_COUNTERS_SIZE + capacity)
+        memory.buf[:_COUNTERS_SIZE] = bytes(_COUNTERS_SIZE)
+        return _RingBuffer(memory, owner=True)
+
+    def write(self, kind: int, payload: bytes) -> bool:
+        """
+        Appends a record, or returns False if there is no room for it.
+        """
+        capacity = self.__capacity
+        written, read = self.__counters
+        size = -(-(_RECORD_HEADER.size + len(payload)) // _ALIGNMENT) * _ALIGNMENT
+        offset = written % capacity
+        padding = capacity - offset if offset + size > capacity else 0
+        if written + padding + size - read > capacity:
+            return False
+        if padding:
+            _RECORD_HEADER.pack_into(self.__data, offset, _WRAP, 0)
+            offset = 0
+        _RECORD_HEADER.pack_into(self.__data, offset, kind, len(payload))
+        start = offset + _RECORD_HEADER.size
+        self.__data[start:start + len(payload)] = payload
+        # The record is complete before the consumer gets to see it
+        self.__counters[0] = written + padding + size
+        return True
+
+    def read(self) -> Optional[tuple[int, bytes]]:
+        """
+        Removes and returns the oldest record, or returns None if there is none.
+        """
+        capacity = self.__capacity
+        written, read = self.__counters
+        if read == written:
+            return None
+        offset = read % capacity
+        kind, length = _RECORD_HEADER.unpack_from(self.__data, offset)
+        if kind == _WRAP:
+            read += capacity - offset
+            offset = 0
+            kind, length = _RECORD_HEADER.unpack_from(self.__data, offset)
+        start = offset + _RECORD_HEADER.size
+        payload = bytes(self.__data[start:start + length])
+        size = -(-(_RECORD_HEADER.size + length) // _ALIGNMENT) * _ALIGNMENT
+        self.__counters[1] = read + size
+        return kind, payload
+
+    def close(self) -> None:
+        if self.__closed:
+            return
+        self.__closed = True
+        # Views must be released before the memory can be closed
+        self.__counters.release()
+        self.__data.release()
+        self.__memory.close()
+        if self.__owner:
+            self.__memory.unlink()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __reduce__(self) -> Any:
+        return _attach, (self.__memory.name,)
+
+
+def _attach(name: str) -> _RingBuffer:
+    return _RingBuffer(SharedMemory(name=name), owner=False)
+
+
+class SharedMemoryChannel(QueueChannel[T]):
+    """
+    Channel passing messages through a ring buffer in shared memory per direction,
+    avoiding the pickling, feeder thread and pipe of a Queue.
+    Common kinds of messages (see _encode) are stored in a compact fixed layout;
+    all others are pickled onto a queue, with a marker in the ring buffer keeping them in order.
+    Channels are created in connected pairs, one for each side.
+    """
+
+    __inbox: _RingBuffer
+    __outbox: _RingBuffer
+    __fallback_outbox: Queue
+    __timeout: float
+
+    def __init__(self,
+                 inbox: _RingBuffer,
+                 outbox: _RingBuffer,
+                 fallback_inbox: Queue,
+                 fallback_outbox: Queue,
+                 timeout: float = 1):
+        super().__init__(fallback_inbox, timeout)
+        self.__inbox = inbox
+        self.__outbox = outbox
+        self.__fallback_outbox = fallback_outbox
+        self.__timeout = timeout
+
+    @staticmethod
+    def pair(capacity: int = 2 ** 16, timeout: float = 1) -> tuple[SharedMemoryChannel, SharedMemoryChannel]:
+        """
+        Creates two channels, each receiving what the other sends.
+        The shared memory is released when the first channel is closed.
+        """
+        forth = _RingBuffer.create(capacity)
+        back = _RingBuffer.create(capacity)
+        fallback_forth = Queue()
+        fallback_back = Queue()
+        return (
+            SharedMemoryChannel(back, forth, fallback_back, fallback_forth, timeout),
+            SharedMemoryChannel(forth, back, fallback_forth, fallback_back, timeout),
+        )
+
+    def send(self, message: T) -> None:
+        encoded = _encode(message)
+        fallback = encoded is None
+        if fallback:
+            encoded = _FALLBACK, b''
+        deadline = time.monotonic() + self.__timeout
+        attempt = 0
+        while not self.__outbox.write(*encoded):
+            if time.monotonic() > deadline:
+                raise Full()
+            _back_off(attempt)
+            attempt += 1
+        # Only queued once its marker is in place, so a full ring buffer leaves nothing behind;
+        # the receiver waits for it on the queue if it sees the marker first
+        if fallback:
+            self.__fallback_outbox.put(message)
+
+    def receive(self) -> T:
+        deadline = time.monotonic() + self.__timeout
+        attempt = 0
+        record = self.__inbox.read()
+        while record is None:
+            if time.monotonic() > deadline:
+                raise Empty()
+            _back_off(attempt)
+            attempt += 1
+            record = self.__inbox.read()
+        kind, payload = record
+        if kind == _FALLBACK:
+            return super().receive()
+        return _decode(kind, payload)
+
+    def close(self) -> None:
+        self.__inbox.close()
+        self.__outbox.close()
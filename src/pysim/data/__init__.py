@@ -1,2 +1,4 @@
+from .array_grid import ArrayGrid
+from .chunked_grid import ChunkedGrid
 from .grid import Grid
 from .vector import Vector
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import TypeVar, Generic, Any, Iterable, Optional
+
+import numpy as np
+
+from .vector import Vector
+
+T = TypeVar('T')
+
+
+class ArrayGrid(Generic[T]):
+    """
+    Dense grid storing one small integer code per cell in a NumPy array.
+    Cells can additionally hold an object (their contents), which is kept
+    in a side table so that only occupied cells cost a Python object.
+    """
+
+    __codes: np.ndarray
+    __contents: dict[Vector, T]
+
+    def __init__(self, width: int, height: int, fill: int = 0, dtype: Any = np.uint8):
+        assert width >= 1
+        assert height >= 1
+        self.__codes = np.full((height, width), fill, dtype=dtype)
+        self.__contents = {}
+
+    @staticmethod
+    def from_array(codes: np.ndarray, contents: Optional[dict[Vector, T]] = None) -> ArrayGrid[T]:
+        assert codes.ndim == 2
+        height, width = codes.shape
+        result = ArrayGrid[T](width, height, dtype=codes.dtype)
+        result.__codes[:, :] = codes
+        if contents is not None:
+            for position, obj in contents.items():
+                result.set_contents(position, obj)
+        return result
+
+    def __getitem__(self, position: Vector) -> int:
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        return int(self.__codes[position.y, position.x])
+
+    def __setitem__(self, position: Vector, code: int) -> None:
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        self.__codes[position.y, position.x] = code
+
+    def is_inside(self, position: Vector) -> bool:
+        return 0 <= position.x < self.width and 0 <= position.y < self.height
+
+    @property
+    def width(self) -> int:
+        return self.__codes.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.__codes.shape[0]
+
+    @property
+    def positions(self) -> Iterable[Vector]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Vector(x, y)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """
+        Read-only view on all codes, indexed as [y, x].
+        """
+        return ArrayGrid.__read_only(self.__codes)
+
+    def row(self, y: int) -> np.ndarray:
+        assert 0 <= y < self.height
+        return ArrayGrid.__read_only(self.__codes[y])
+
+    def column(self, x: int) -> np.ndarray:
+        assert 0 <= x < self.width
+        return ArrayGrid.__read_only(self.__codes[:, x])
+
+    def region(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        assert 0 <= left and left + width <= self.width
+        assert 0 <= top and top + height <= self.height
+        return ArrayGrid.__read_only(self.__codes[top:top + height, left:left + width])
+
+    def mask(self, code: int) -> np.ndarray:
+        return self.__codes == code
+
+    def positions_of(self, code: int) -> Iterable[Vector]:
+        for y, x in np.argwhere(self.__codes == code):
+            yield Vector(int(x), int(y))
+
+    def contents(self, position: Vector) -> Optional[T]:
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        return self.__contents.get(position)
+
+    def set_contents(self, position: Vector, obj: Optional[T]) -> None:
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        if obj is None:
+            self.__contents.pop(position, None)
+        else:
+            self.__contents[position] = obj
+
+    @property
+    def occupied_positions(self) -> Iterable[Vector]:
+        return self.__contents.keys()
+
+    def __copy__(self) -> ArrayGrid[T]:
+        return ArrayGrid.from_array(self.__codes, self.__contents)
+
+    def __deepcopy__(self, memo: Any) -> ArrayGrid[T]:
+        return ArrayGrid.from_array(self.__codes, deepcopy(self.__contents, memo))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ArrayGrid):
+            return False
+        return np.array_equal(self.__codes, other.__codes) and self.__contents == other.__contents
+
+    @staticmethod
+    def __read_only(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import TypeVar, Generic, Callable, Any, Iterable
+
+from .vector import Vector
+
+T = TypeVar('T')
+
+
+class ChunkedGrid(Generic[T]):
+    """
+    Grid divided in square chunks which are shared between snapshots.
+    A chunk is copied only when it is written to while shared,
+    so that a snapshot costs time proportional to the number of chunks modified since the last one.
+    """
+
+    __width: int
+    __height: int
+    __chunk_size: int
+    __chunks_per_row: int
+    __chunks: list[list[T]]
+    __owns_chunk_list: bool
+    __owned_chunks: set[int]
+    __copy_item: Callable[[T], T]
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 initializer: Callable[[Vector], T],
+                 copy_item: Callable[[T], T] = deepcopy,
+                 chunk_size: int = 8):
+        assert width >= 1
+        assert height >= 1
+        assert chunk_size >= 1
+        self.__width = width
+        self.__height = height
+        self.__chunk_size = chunk_size
+        self.__chunks_per_row = (width + chunk_size - 1) // chunk_size
+        self.__copy_item = copy_item
+        self.__chunks = [
+            [
+                initializer(Vector(x, y))
+                for y in range(top, min(top + chunk_size, height))
+                for x in range(left, min(left + chunk_size, width))
+            ]
+            for top in range(0, height, chunk_size)
+            for left in range(0, width, chunk_size)
+        ]
+        self.__owns_chunk_list = True
+        self.__owned_chunks = set(range(len(self.__chunks)))
+
+    def __getitem__(self, position: Vector) -> T:
+        """
+        Returns the item at the given position.
+        The item may be shared with snapshots and must not be modified; use writable for that purpose.
+        """
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        chunk_index, index = self.__locate(position)
+        return self.__chunks[chunk_index][index]
+
+    def __setitem__(self, position: Vector, value: T) -> None:
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        chunk_index, index = self.__locate(position)
+        self.__own_chunk(chunk_index)[index] = value
+
+    def writable(self, position: Vector) -> T:
+        """
+        Returns the item at the given position, making sure it is not shared with any snapshot.
+        """
+        assert self.is_inside(position), f'{position} is outside of the grid'
+        chunk_index, index = self.__locate(position)
+        return self.__own_chunk(chunk_index)[index]
+
+    def is_inside(self, position: Vector) -> bool:
+        return 0 <= position.x < self.__width and 0 <= position.y < self.__height
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def positions(self) -> Iterable[Vector]:
+        for y in range(self.height):
+            for x in range(self.width):
+                yield Vector(x, y)
+
+    def snapshot(self) -> ChunkedGrid[T]:
+        result = ChunkedGrid.__new__(ChunkedGrid)
+        result.__width = self.__width
+        result.__height = self.__height
+        result.__chunk_size = self.__chunk_size
+        result.__chunks_per_row = self.__chunks_per_row
+        result.__copy_item = self.__copy_item
+        result.__chunks = self.__chunks
+        result.__owns_chunk_list = False
+        result.__owned_chunks = set()
+        self.__owns_chunk_list = False
+        self.__owned_chunks.clear()
+        return result
+
+    def __locate(self, position: Vector) -> tuple[int, int]:
+        chunk_size = self.__chunk_size
+        chunk_x, x = divmod(position.x, chunk_size)
+        chunk_y, y = divmod(position.y, chunk_size)
+        chunk_width = min(chunk_size, self.__width - chunk_x * chunk_size)
+        return chunk_y * self.__chunks_per_row + chunk_x, y * chunk_width + x
+
+    def __own_chunk(self, chunk_index: int) -> list[T]:
+        if chunk_index not in self.__owned_chunks:
+            if not self.__owns_chunk_list:
+                self.__chunks = list(self.__chunks)
+                self.__owns_chunk_list = True
+            self.__chunks[chunk_index] = [self.__copy_item(item) for item in self.__chunks[chunk_index]]
+            self.__owned_chunks.add(chunk_index)
+        return self.__chunks[chunk_index]
+
+    def __copy__(self) -> ChunkedGrid[T]:
+        return self.snapshot()
+
+    def __deepcopy__(self, memo: Any) -> ChunkedGrid[T]:
+        return self.snapshot()
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ChunkedGrid):
+            return False
+        if (self.__width, self.__height) != (other.__width, other.__height):
+            return False
+        if self.__chunk_size != other.__chunk_size:
+            return all(self[position] == other[position] for position in self.positions)
+        return all(mine is theirs or mine == theirs for mine, theirs in zip(self.__chunks, other.__chunks))
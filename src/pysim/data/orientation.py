@@ -1,100 +1,66 @@
 from __future__ import annotations
 
-from abc import abstractmethod, ABC
+from enum import IntEnum
 
+import numpy as np
 
-class Orientation(ABC):
-    @abstractmethod
-    def turn_left(self) -> Orientation:
-        ...
-
-    @abstractmethod
-    def turn_right(self) -> Orientation:
-        ...
-
-    @abstractmethod
-    def turn_around(self) -> Orientation:
-        ...
-
-    @property
-    @abstractmethod
-    def angle(self) -> float:
-        ...
-
-
-class _North(Orientation):
-    def turn_left(self) -> Orientation:
-        return WEST
-
-    def turn_right(self) -> Orientation:
-        return EAST
-
-    def turn_around(self) -> Orientation:
-        return SOUTH
-
-    @property
-    def angle(self) -> float:
-        return 270
 
-    def __str__(self) -> str:
-        return "NORTH"
+class Orientation(IntEnum):
+    """
+    Orientations are numbered clockwise starting from north,
+    so that they can be used directly as indices in the tables below.
+    """
 
+    NORTH = 0
+    EAST = 1
+    SOUTH = 2
+    WEST = 3
 
-class _East(Orientation):
     def turn_left(self) -> Orientation:
-        return NORTH
+        return _ORIENTATIONS[TURN_LEFT[self]]
 
     def turn_right(self) -> Orientation:
-        return SOUTH
+        return _ORIENTATIONS[TURN_RIGHT[self]]
 
     def turn_around(self) -> Orientation:
-        return WEST
+        return _ORIENTATIONS[TURN_AROUND[self]]
 
     @property
     def angle(self) -> float:
-        return 0
-
-    def __str__(self) -> str:
-        return "EAST"
-
-
-class _South(Orientation):
-    def turn_left(self) -> Orientation:
-        return EAST
-
-    def turn_right(self) -> Orientation:
-        return WEST
-
-    def turn_around(self) -> Orientation:
-        return NORTH
+        return ANGLES[self]
 
-    @property
-    def angle(self) -> float:
-        return 90
+    @staticmethod
+    def from_code(code: int) -> Orientation:
+        return _ORIENTATIONS[code]
 
     def __str__(self) -> str:
-        return "SOUTH"
+        return self.name
 
 
-class _West(Orientation):
-    def turn_left(self) -> Orientation:
-        return SOUTH
+NORTH = Orientation.NORTH
+EAST = Orientation.EAST
+SOUTH = Orientation.SOUTH
+WEST = Orientation.WEST
 
-    def turn_right(self) -> Orientation:
-        return NORTH
+_ORIENTATIONS = (NORTH, EAST, SOUTH, WEST)
 
-    def turn_around(self) -> Orientation:
-        return EAST
+# Lookup tables for scalar code, indexed by orientation
+DELTA_X: tuple[int, ...] = (0, 1, 0, -1)
+DELTA_Y: tuple[int, ...] = (-1, 0, 1, 0)
+TURN_LEFT: tuple[int, ...] = (3, 0, 1, 2)
+TURN_RIGHT: tuple[int, ...] = (1, 2, 3, 0)
+TURN_AROUND: tuple[int, ...] = (2, 3, 0, 1)
+ANGLES: tuple[float, ...] = (270, 0, 90, 180)
 
-    @property
-    def angle(self) -> float:
-        return 180
 
-    def __str__(self) -> str:
-        return "WEST"
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
 
 
-NORTH = _North()
-WEST = _West()
-SOUTH = _South()
-EAST = _East()
+# The same tables as arrays, for vectorized code indexing with arrays of orientation codes
+DELTAS_ARRAY = _read_only(np.array(list(zip(DELTA_X, DELTA_Y)), dtype=np.int8))
+TURN_LEFT_ARRAY = _read_only(np.array(TURN_LEFT, dtype=np.uint8))
+TURN_RIGHT_ARRAY = _read_only(np.array(TURN_RIGHT, dtype=np.uint8))
+TURN_AROUND_ARRAY = _read_only(np.array(TURN_AROUND, dtype=np.uint8))
+ANGLES_ARRAY = _read_only(np.array(ANGLES, dtype=np.float64))
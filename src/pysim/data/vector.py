@@ -1,11 +1,22 @@
 from __future__ import annotations
 
-from typing import Iterable
+import sys
+from typing import Iterable, Any
 
-from pysim.data.orientation import Orientation, NORTH, WEST, SOUTH, EAST
+from pysim.data.orientation import Orientation, DELTA_X, DELTA_Y
+
+_HASH_BITS = 30
+
+_HASH_OFFSET = 1 << (_HASH_BITS - 1)
+
+_HASH_MODULUS = sys.hash_info.modulus
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15 % _HASH_MODULUS
 
 
 class Vector:
+    __slots__ = ('__x', '__y')
+
     __x: int
     __y: int
 
@@ -15,16 +26,7 @@ class Vector:
 
     @staticmethod
     def from_orientation(orientation: Orientation) -> Vector:
-        if orientation is NORTH:
-            return Vector(0, -1)
-        elif orientation is WEST:
-            return Vector(-1, 0)
-        elif orientation is SOUTH:
-            return Vector(0, 1)
-        elif orientation is EAST:
-            return Vector(1, 0)
-        else:
-            assert False
+        return _UNIT_VECTORS[orientation]
 
     @property
     def x(self) -> int:
@@ -45,37 +47,50 @@ class Vector:
         return Vector(x, y)
 
     def __add__(self, other: Vector) -> Vector:
-        x = self.x + other.x
-        y = self.y + other.y
+        x = self.__x + other.__x
+        y = self.__y + other.__y
         return Vector(x, y)
 
     def __sub__(self, other: Vector) -> Vector:
-        x = self.x - other.x
-        y = self.y - other.y
+        x = self.__x - other.__x
+        y = self.__y - other.__y
         return Vector(x, y)
 
     def __mul__(self, factor: int) -> Vector:
-        x = self.x * factor
-        y = self.y * factor
+        x = self.__x * factor
+        y = self.__y * factor
         return Vector(x, y)
 
     def __neg__(self) -> Vector:
-        x = -self.x
-        y = -self.y
+        x = -self.__x
+        y = -self.__y
         return Vector(x, y)
 
     def __eq__(self, other: object) -> bool:
-        return isinstance(other, Vector) and self.x == other.x and self.y == other.y
+        return isinstance(other, Vector) and self.__x == other.__x and self.__y == other.__y
 
     def __iter__(self) -> Iterable[int]:
-        yield self.x
-        yield self.y
+        yield self.__x
+        yield self.__y
 
     def move(self, orientation: Orientation, distance: int = 1) -> Vector:
-        return self + Vector.from_orientation(orientation) * distance
+        return Vector(self.__x + DELTA_X[orientation] * distance, self.__y + DELTA_Y[orientation] * distance)
 
     def __hash__(self) -> int:
-        return hash(self.x) ^ hash(self.y)
+        # Packing is injective for coordinates within ±2**29 and multiplication modulo a prime is a bijection,
+        # so distinct positions never collide while their hashes are spread over all bits
+        packed = ((self.__x + _HASH_OFFSET) << _HASH_BITS) ^ (self.__y + _HASH_OFFSET)
+        return packed * _HASH_MULTIPLIER % _HASH_MODULUS
+
+    def __copy__(self) -> Vector:
+        return self
+
+    def __deepcopy__(self, memo: Any) -> Vector:
+        return self
 
     def __str__(self) -> str:
-        return f"Vector({self.x}, {self.y})"
+        return f"Vector({self.__x}, {self.__y})"
+
+
+# Indexed by orientation
+_UNIT_VECTORS: tuple[Vector, ...] = tuple(Vector(dx, dy) for dx, dy in zip(DELTA_X, DELTA_Y))
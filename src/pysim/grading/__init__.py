@@ -0,0 +1 @@
+from .evaluator import Job, run_job, create_jobs, grade, FINISHED, STEP_LIMIT, TIME_LIMIT, ERROR, INVALID
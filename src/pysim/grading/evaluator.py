@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import json
+import math
+import multiprocessing
+import os
+import signal
+import time
+from itertools import product
+from multiprocessing.connection import Connection, wait
+from typing import Any, Iterable, List, NamedTuple, Optional, TextIO
+
+from pysim.actors.code_cache import CodeCache
+from pysim.actors.environment import create_mapping, export
+from pysim.data import Vector
+from pysim.simulation.agent import Agent
+from pysim.simulation.levels import parse_world, format_world
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.simulation import Simulation
+
+FINISHED = 'finished'
+STEP_LIMIT = 'step_limit'
+TIME_LIMIT = 'time_limit'
+ERROR = 'error'
+INVALID = 'invalid'
+
+# Used by run_job when not given a cache
+_code_cache = CodeCache()
+
+
+class Job(NamedTuple):
+    """
+    Runs a program against a level. The level is given as rows understood by parse_world,
+    and is solved when all targets, given as (x, y) pairs, are covered by blocks.
+    """
+    program_id: str
+    source: str
+    level_id: str
+    rows: List[str]
+    targets: List[tuple[int, int]] = []
+    max_steps: int = 10_000
+    time_limit: float = 10
+
+
+# Derived from BaseException so that programs catching Exception cannot swallow them
+class _StepLimitReached(BaseException):
+    pass
+
+
+class _TimeLimitReached(BaseException):
+    pass
+
+
+class _GradingEnvironment:
+    __simulation: Simulation
+    __max_steps: int
+    __step_count: int
+
+    def __init__(self, simulation: Simulation, max_steps: int):
+        self.__simulation = simulation
+        self.__max_steps = max_steps
+        self.__step_count = 0
+
+    @property
+    def step_count(self) -> int:
+        return self.__step_count
+
+    @export
+    def forward(self, agent_index: int = 0) -> bool:
+        """
+        Returns whether the agent moved.
+        """
+        if self.__step_count == self.__max_steps:
+            raise _StepLimitReached()
+        self.__step_count += 1
+        return self.__simulation.advance(agent_index) is not Outcome.BLOCKED
+
+    @export
+    def agent_count(self) -> int:
+        return len(self.__simulation.world.agent_positions)
+
+
+def _raise_time_limit_reached(signum, frame):
+    raise _TimeLimitReached()
+
+
+def run_job(job: Job, code_cache: Optional[CodeCache] = None, validate: bool = False) -> dict[str, Any]:
+    """
+    Runs a single job in the current process and returns its result.
+    The time limit relies on SIGALRM and must therefore be enforced from the main thread.
+    Programs are not isolated from the calling process; grade runs jobs in worker processes.
+    With validate, programs failing CodeCache.validate are not run and get status INVALID.
+    """
+    code_cache = code_cache if code_cache is not None else _code_cache
+    simulation = Simulation(parse_world(job.rows))
+    environment = _GradingEnvironment(simulation, job.max_steps)
+    error = None
+    start = time.perf_counter()
+    problems = code_cache.validate(job.source) if validate else []
+    if problems:
+        return _result(job, simulation, environment, INVALID, '; '.join(problems), start)
+    previous_handler = signal.signal(signal.SIGALRM, _raise_time_limit_reached)
+    signal.setitimer(signal.ITIMER_REAL, job.time_limit)
+    try:
+        exec(code_cache.compile(job.source), create_mapping(environment))
+        status = FINISHED
+    except _StepLimitReached:
+        status = STEP_LIMIT
+    except _TimeLimitReached:
+        status = TIME_LIMIT
+    except Exception as e:
+        status = ERROR
+        error = repr(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+    return _result(job, simulation, environment, status, error, start)
+
+
+def _result(job: Job,
+            simulation: Simulation,
+            environment: _GradingEnvironment,
+            status: str,
+            error: Optional[str],
+            start: float) -> dict[str, Any]:
+    return {
+        'program': job.program_id,
+        'level': job.level_id,
+        'status': status,
+        'steps': environment.step_count,
+        'solved': _is_solved(simulation, job.targets),
+        'seconds': time.perf_counter() - start,
+        'error': error,
+        'world': format_world(simulation.world),
+    }
+
+
+def _failure(job: Job, status: str, error: str, start: float) -> dict[str, Any]:
+    """
+    Result of a job whose process did not report back, leaving its final state unknown.
+    """
+    return {
+        'program': job.program_id,
+        'level': job.level_id,
+        'status': status,
+        'steps': None,
+        'solved': False,
+        'seconds': time.perf_counter() - start,
+        'error': error,
+        'world': None,
+    }
+
+
+def _is_solved(simulation: Simulation, targets: List[tuple[int, int]]) -> bool:
+    world = simulation.world
+    for x, y in targets:
+        contents = world.peek(Vector(x, y)).contents
+        if contents is None or isinstance(contents, Agent):
+            return False
+    return True
+
+
+def create_jobs(programs: dict[str, str], levels: dict[str, tuple[List[str], List[tuple[int, int]]]],
+                max_steps: int = 10_000, time_limit: float = 10) -> Iterable[Job]:
+    """
+    Pairs every program with every level. Programs and levels are given by id,
+    levels as pairs of rows and targets.
+    """
+    for (program_id, source), (level_id, (rows, targets)) in product(programs.items(), levels.items()):
+        yield Job(program_id, source, level_id, rows, targets, max_steps, time_limit)
+
+
+def _work(connection: Connection, code_cache: CodeCache, validate: bool) -> None:
+    # Tells that startup is over, which is not to count towards the time limit of the first job
+    connection.send(None)
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        connection.send(run_job(job, code_cache, validate))
+
+
+class _Worker:
+    """
+    Process running one job at a time, until it is stopped or dies.
+    """
+
+    __process: Any
+    __connection: Connection
+    __job: Optional[Job]
+    __job_count: int
+    __start: float
+    __deadline: float
+    __grace_seconds: float
+    __ready: bool
+    __alive: bool
+
+    def __init__(self, context: Any, code_cache: CodeCache, validate: bool):
+        self.__connection, child_connection = context.Pipe()
+        self.__process = context.Process(target=_work, args=(child_connection, code_cache, validate), daemon=True)
+        self.__process.start()
+        # Only the worker keeps its end open, so that receiving fails once it exits
+        child_connection.close()
+        self.__job = None
+        self.__job_count = 0
+        self.__start = 0
+        self.__deadline = math.inf
+        self.__grace_seconds = 0
+        self.__ready = False
+        self.__alive = True
+
+    @property
+    def connection(self) -> Connection:
+        return self.__connection
+
+    @property
+    def deadline(self) -> float:
+        return self.__deadline
+
+    @property
+    def job_count(self) -> int:
+        return self.__job_count
+
+    @property
+    def is_alive(self) -> bool:
+        return self.__alive
+
+    def start(self, job: Job, grace_seconds: float) -> None:
+        assert self.__alive and self.__job is None
+        self.__job = job
+        self.__job_count += 1
+        self.__grace_seconds = grace_seconds
+        self.__start = time.perf_counter()
+        if self.__ready:
+            self.__start_clock()
+        self.__connection.send(job)
+
+    def result(self) -> Optional[dict[str, Any]]:
+        """
+        Receives the result once the connection is ready, which it also becomes when the process dies.
+        Returns None if the worker has only just finished starting up.
+        """
+        job = self.__job
+        try:
+            message = self.__connection.recv()
+        except EOFError:
+            self.__job = None
+            self.__alive = False
+            self.__process.join()
+            return _failure(job, ERROR, f'process exited with code {self.__process.exitcode}', self.__start)
+        if not self.__ready:
+            self.__ready = True
+            self.__start_clock()
+            return None
+        self.__job = None
+        return message
+
+    def kill(self) -> dict[str, Any]:
+        job, self.__job = self.__job, None
+        self.__alive = False
+        self.__process.kill()
+        return _failure(job, TIME_LIMIT, 'killed after exceeding the time limit', self.__start)
+
+    def stop(self) -> None:
+        if self.__alive and self.__job is None:
+            try:
+                self.__connection.send(None)
+                self.__process.join(timeout=1)
+            except (BrokenPipeError, OSError):
+                pass
+        if self.__process.is_alive():
+            self.__process.kill()
+        self.__alive = False
+        self.__process.join()
+        self.__connection.close()
+
+    def __start_clock(self) -> None:
+        self.__start = time.perf_counter()
+        self.__deadline = self.__start + self.__job.time_limit + self.__grace_seconds
+
+
+def grade(jobs: Iterable[Job],
+          output: TextIO,
+          processes: Optional[int] = None,
+          code_cache: Optional[CodeCache] = None,
+          validate: bool = False,
+          grace_seconds: float = 5,
+          max_jobs_per_worker: Optional[int] = 100) -> int:
+    """
+    Runs jobs on a pool of worker processes, processes of them, one per core by default,
+    and writes each result to output as a line of JSON as soon as it is available. Results come in order of completion.
+    Returns the number of jobs run.
+    Every program runs with fresh globals, but modules it changes stay changed for the next jobs of its worker;
+    workers are replaced after max_jobs_per_worker jobs, so with a limit of 1 programs cannot affect each other.
+    A worker exiting without reporting a result gives status ERROR, and one still running grace_seconds
+    after the time limit of its job is killed and gives status TIME_LIMIT. Either way only that worker is replaced.
+    Workers compile programs themselves, and if code_cache has a directory, load them from the compilation here.
+    With validate, programs failing CodeCache.validate are not run and get status INVALID.
+    """
+    assert max_jobs_per_worker is None or max_jobs_per_worker > 0
+    processes = processes or os.cpu_count() or 1
+    code_cache = code_cache if code_cache is not None else CodeCache()
+    context = multiprocessing.get_context('forkserver')
+    pending = iter(jobs)
+    idle: List[_Worker] = []
+    busy: List[_Worker] = []
+    count = 0
+
+    def write(result: dict[str, Any]) -> None:
+        nonlocal count
+        output.write(json.dumps(result))
+        output.write('\n')
+        output.flush()
+        count += 1
+
+    try:
+        while True:
+            while len(busy) < processes:
+                job = next(pending, None)
+                if job is None:
+                    break
+                if code_cache.directory is not None:
+                    try:
+                        code_cache.compile(job.source)
+                    except SyntaxError:
+                        # Reported by the worker like any other error
+                        pass
+                worker = idle.pop() if idle else _Worker(context, code_cache, validate)
+                worker.start(job, grace_seconds)
+                busy.append(worker)
+            if not busy:
+                return count
+            deadline = min(worker.deadline for worker in busy)
+            timeout = max(0.0, deadline - time.perf_counter()) if deadline < math.inf else None
+            ready = wait([worker.connection for worker in busy], timeout)
+            now = time.perf_counter()
+            for worker in list(busy):
+                if worker.connection in ready:
+                    result = worker.result()
+                    if result is None:
+                        continue
+                    write(result)
+                elif worker.deadline <= now:
+                    write(worker.kill())
+                else:
+                    continue
+                busy.remove(worker)
+                if worker.is_alive and (max_jobs_per_worker is None or worker.job_count < max_jobs_per_worker):
+                    idle.append(worker)
+                else:
+                    worker.stop()
+    finally:
+        for worker in idle + busy:
+            worker.stop()
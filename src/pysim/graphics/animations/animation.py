@@ -20,6 +20,13 @@ class Animation(ABC, Generic[T]):
     def map(self, transformer: Callable[[T], U]) -> Animation[U]:
         return _AnimationMapper[T, U](self, transformer)
 
+    def compile(self) -> Animation[T]:
+        """
+        Returns an equivalent animation which is cheaper to sample, meant for animations sampled many times.
+        Sequences are flattened into timelines which are searched by binary search.
+        """
+        return self
+
 
 class _AnimationMapper(Generic[T, U], Animation[T]):
     __animation: Animation[U]
@@ -36,3 +43,6 @@ class _AnimationMapper(Generic[T, U], Animation[T]):
     def __getitem__(self, time: float) -> T:
         x = self.__animation[time]
         return self.__transformer(x)
+
+    def compile(self) -> Animation[T]:
+        return _AnimationMapper(self.__animation.compile(), self.__transformer)
@@ -1,39 +1,51 @@
-from random import Random
-from typing import List
+import math
 
-from pygame import Vector2, Color
+import numpy as np
+from pygame import Vector2
 
 from pysim.graphics.animations.animation import Animation
-from pysim.graphics.animations.particle import Particle
 from pysim.graphics.layer import Layer
-from pysim.graphics.primitives.operations import UnionPrimitive
 from pysim.graphics.primitives.primitive import Primitive
+from pysim.graphics.primitives.shapes import Rectangles
 
 
 class Explosion(Animation[Primitive]):
-    __particles: List[Particle]
+    """
+    Square particles flying away from a position while shrinking to nothing.
+    Particles are kept in arrays and updated together. The same seed always produces the same explosion,
+    so explosions shown together need distinct seeds to look different.
+    """
+
+    __layer: Layer
+    __position: np.ndarray
+    __velocities: np.ndarray
+    __sizes: np.ndarray
+    __colors: np.ndarray
     __duration: float
 
-    def __init__(self, layer: Layer, n_particles: int, position: Vector2, duration: float):
-        def random_particle() -> Particle:
-            rnd = Random()
-            speed = rnd.uniform(50, 100)
-            angle = rnd.uniform(0, 360)
-            velocity = Vector2()
-            velocity.from_polar((speed, angle))
-            size = 24
-            r = rnd.randint(220, 255)
-            g = rnd.randint(0, 200)
-            b = 0
-            color = Color(r, g, b)
-            return Particle(layer, position, velocity, size, duration, color)
-
+    def __init__(self, layer: Layer, n_particles: int, position: Vector2, duration: float, seed: int):
+        assert duration > 0
+        rng = np.random.default_rng(seed)
+        speeds = rng.uniform(50, 100, n_particles)
+        angles = rng.uniform(0, 2 * math.pi, n_particles)
+        self.__layer = layer
+        self.__position = np.array([position.x, position.y], dtype=float)
+        self.__velocities = np.column_stack((speeds * np.cos(angles), speeds * np.sin(angles)))
+        self.__sizes = np.full(n_particles, 24, dtype=float)
+        self.__colors = np.column_stack((
+            rng.integers(220, 255, n_particles, endpoint=True),
+            rng.integers(0, 200, n_particles, endpoint=True),
+            np.zeros(n_particles, dtype=np.int64),
+        ))
         self.__duration = duration
-        self.__particles = [random_particle() for _ in range(n_particles)]
 
     @property
-    def duration(self):
-        return self.duration
+    def duration(self) -> float:
+        return self.__duration
 
     def __getitem__(self, time: float) -> Primitive:
-        return UnionPrimitive([p[time] for p in self.__particles])
+        assert 0 <= time < self.__duration
+        sizes = self.__sizes * (1 - time / self.__duration)
+        corners = self.__position + time * self.__velocities - sizes[:, np.newaxis] / 2
+        rects = np.column_stack((corners, sizes, sizes)).astype(np.int64)
+        return Rectangles(self.__layer, rects, self.__colors)
@@ -9,15 +9,20 @@ U = TypeVar('U')
 class ParallelAnimation(Animation[U]):
     __children: tuple[Animation[T], ...]
     __reducer: Callable[[Iterable[T]], U]
+    __duration: float
 
     def __init__(self, reducer: Callable[[Iterable[T]], U], *children: Animation[T]):
         assert len(children) > 0
         self.__children = children
         self.__reducer = reducer
+        self.__duration = min(child.duration for child in children)
 
     def __getitem__(self, time: float) -> U:
         return self.__reducer(child[time] for child in self.__children)
 
     @property
     def duration(self) -> float:
-        return min(child.duration for child in self.__children)
+        return self.__duration
+
+    def compile(self) -> Animation[U]:
+        return ParallelAnimation(self.__reducer, *(child.compile() for child in self.__children))
@@ -1,6 +1,7 @@
 from typing import List, TypeVar
 
 from .animation import Animation
+from .timeline import Timeline
 
 T = TypeVar('T')
 
@@ -23,3 +24,17 @@ class SequenceAnimation(Animation[T]):
     @property
     def duration(self) -> float:
         return sum(child.duration for child in self.__children)
+
+    @property
+    def children(self) -> List[Animation[T]]:
+        return list(self.__children)
+
+    def compile(self) -> Animation[T]:
+        children: List[Animation[T]] = []
+        for child in self.__children:
+            compiled = child.compile()
+            if isinstance(compiled, Timeline):
+                children.extend(compiled.children)
+            else:
+                children.append(compiled)
+        return Timeline(children)
@@ -0,0 +1,46 @@
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Sequence, TypeVar
+
+from .animation import Animation
+
+T = TypeVar('T')
+
+
+class Timeline(Animation[T]):
+    """
+    Sequence of animations with precomputed start times, so that sampling takes logarithmic time
+    in the number of animations. Created by compiling SequenceAnimations, which takes care of flattening
+    nested sequences. Children must not change duration after being added.
+    """
+
+    __children: List[Animation[T]]
+    # Start time of every child, strictly increasing as children without duration are left out
+    __starts: List[float]
+    __duration: float
+
+    def __init__(self, children: Sequence[Animation[T]]):
+        self.__children = [child for child in children if child.duration > 0]
+        durations = [child.duration for child in self.__children]
+        self.__starts = [0.0, *accumulate(durations)][:-1] if durations else []
+        self.__duration = sum(durations)
+
+    @property
+    def children(self) -> List[Animation[T]]:
+        return list(self.__children)
+
+    def __getitem__(self, time: float) -> T:
+        assert 0 <= time < self.__duration
+        index = bisect_right(self.__starts, time) - 1
+        child = self.__children[index]
+        # Rounding in the prefix sums can push time just past the end of the child
+        local_time = min(time - self.__starts[index], math.nextafter(child.duration, 0))
+        return child[local_time]
+
+    @property
+    def duration(self) -> float:
+        return self.__duration
+
+    def compile(self) -> Animation[T]:
+        return self
@@ -1,16 +1,20 @@
-from pygame import Rect
+from pygame import Rect, Vector2
 
 from pysim.data import Vector
 from pysim.graphics.animations.animation import Animation
 from pysim.graphics.animations.constant import ConstantAnimation
+from pysim.graphics.animations.function import FunctionAnimation
 from pysim.graphics.animations.parallel import ParallelAnimation
 from pysim.graphics.context import GraphicsContext
 from pysim.graphics.layer import Layer
 from pysim.graphics.primitives.operations import UnionPrimitive
 from pysim.graphics.primitives.primitive import Primitive
-from pysim.simulation.events import Event
+from pysim.graphics.tile_cache import TileCache
+from pysim.simulation.events import Event, Motion
 from pysim.simulation.world import World
 
+_STEP_DURATION = 10
+
 
 class _GraphicsContext(GraphicsContext):
     __entity_layer: Layer
@@ -42,19 +46,51 @@ class _GraphicsContext(GraphicsContext):
 
 
 class Animator:
+    """
+    Creates the animation of a single step from the world after it and the event it produced.
+    Only entities moved by the event get animations of their own, drawn over a cached image of everything else,
+    so that the cost of animating a step depends on the number of moving entities rather than on the size of the world.
+    """
+
     __tile_layer: Layer
     __entity_layer: Layer
+    __context: GraphicsContext
+    __tile_cache: TileCache
 
     def __init__(self, tile_layer: Layer, entity_layer: Layer):
         self.__tile_layer = tile_layer
         self.__entity_layer = entity_layer
+        self.__context = _GraphicsContext(tile_layer=tile_layer, entity_layer=entity_layer)
+        self.__tile_cache = TileCache(self.__context)
+
+    def invalidate_tile(self, position: Vector) -> None:
+        """
+        Must be called when the tile at the given position changes appearance.
+        """
+        self.__tile_cache.invalidate(position)
+
+    def invalidate(self) -> None:
+        """
+        Must be called before animating a world which was not reached by the steps animated so far.
+        """
+        self.__tile_cache.invalidate_all()
 
     def animate(self, world: World, event: Event) -> Animation[Primitive]:
-        def render_tile_at(position):
-            tile = world[position]
-            tile_image = tile.render(context, position)
-            return ConstantAnimation(tile_image, 10)
-
-        context = _GraphicsContext(tile_layer=self.__tile_layer, entity_layer=self.__entity_layer)
-        tile_primitives = [render_tile_at(Vector(x, y)) for x in range(world.width) for y in range(world.height)]
-        return ParallelAnimation(UnionPrimitive, *tile_primitives)
+        motions = list(event.motions)
+        for motion in motions:
+            # Origins lose their entities, which must no longer be drawn at rest
+            self.__tile_cache.invalidate(motion.origin)
+        background = self.__tile_cache.render(world, [motion.destination for motion in motions])
+        animations = [ConstantAnimation(background, _STEP_DURATION)]
+        animations.extend(self.__animate_motion(motion) for motion in motions)
+        return ParallelAnimation(UnionPrimitive, *animations)
+
+    def __animate_motion(self, motion: Motion) -> Animation[Primitive]:
+        origin = Vector2(self.__context.tile_rectangle(motion.origin).center)
+        destination = Vector2(self.__context.tile_rectangle(motion.destination).center)
+
+        def render(time: float) -> Primitive:
+            center = origin.lerp(destination, time / _STEP_DURATION)
+            return motion.entity.render(self.__context, center)
+
+        return FunctionAnimation(_STEP_DURATION, render)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Tuple, Iterable
 
 from pygame import Vector2, Rect, Color, Surface
@@ -7,6 +8,7 @@ from .operations import UnionPrimitive
 from .primitive import Primitive
 from .shapes import Rectangle
 from ..layer import Layer
+from ..sprite_cache import sprite_cache
 
 
 class CarPrimitiveBuilder:
@@ -61,12 +63,21 @@ class CarPrimitiveBuilder:
         return Rectangle(self.__layer, rect, color)
 
 
-def create_car(layer: Layer, color: Color, size: float) -> Image:
+@lru_cache(maxsize=64)
+def _render_car(rgba: Tuple[int, int, int, int], size: float) -> Surface:
     width = size
     height = 0.6 * size
     primitive_layer = Layer()
-    primitive = CarPrimitiveBuilder(primitive_layer, color, (width, height)).build()
+    primitive = CarPrimitiveBuilder(primitive_layer, Color(*rgba), (width, height)).build()
     surface = Surface((width, height))
     surface.set_colorkey((255, 255, 255))
     primitive.render(surface, primitive_layer)
-    return Image(layer, Vector2(0, 0), surface)
+    sprite_cache.prebake(surface)
+    return surface
+
+
+def create_car(layer: Layer, color: Color, size: float) -> Image:
+    """
+    Cars of the same color and size share their surface, which must therefore not be modified.
+    """
+    return Image(layer, Vector2(0, 0), _render_car(tuple(color), size))
@@ -1,7 +1,8 @@
-from pygame import Surface, Vector2, transform
+from pygame import Surface, Vector2
 
 from pysim.graphics.layer import Layer
 from pysim.graphics.primitives.primitive import Primitive, LayerPrimitive
+from pysim.graphics.sprite_cache import sprite_cache
 
 
 class Image(LayerPrimitive):
@@ -13,11 +14,15 @@ class Image(LayerPrimitive):
         self.__center = center
         self.__surface = surface
 
+    @property
+    def surface(self) -> Surface:
+        return self.__surface
+
     def _render_on_layer(self, surface: Surface) -> None:
         width, height = self.__surface.get_size()
         position = self.__center - Vector2(width / 2, height / 2)
         surface.blit(self.__surface, position)
 
     def transform(self, displacement: Vector2, rotation_angle: float) -> Primitive:
-        rotated = transform.rotate(self.__surface, -rotation_angle)
+        rotated = sprite_cache.transform(self.__surface, -rotation_angle)
         return Image(self.layer, self.__center + displacement, rotated)
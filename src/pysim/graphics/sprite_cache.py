@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from pygame import Surface, transform
+
+from pysim.data.orientation import ANGLES
+
+# Rotations applied to face each orientation, with sprites facing east when unrotated
+_ORIENTATION_ROTATIONS = tuple(-angle % 360 for angle in ANGLES)
+
+
+class SpriteCache:
+    """
+    Bounded cache of rotated and scaled surfaces, evicting the least recently used when full.
+    Angles are rounded to multiples of angle_step degrees, so that animations sampling arbitrary angles
+    share entries. Source surfaces are kept alive by the entries made from them and must not be modified,
+    nor may the returned surfaces.
+    """
+
+    __capacity: int
+    __angle_step: float
+    __entries: OrderedDict[tuple[Surface, float, float], Surface]
+    # Prebaked rotations, kept out of the entries so that they are never evicted
+    __baked: dict[tuple[Surface, float, float], Surface]
+
+    def __init__(self, capacity: int = 1024, angle_step: float = 1):
+        assert capacity > 0
+        assert angle_step > 0
+        self.__capacity = capacity
+        self.__angle_step = angle_step
+        self.__entries = OrderedDict()
+        self.__baked = {}
+
+    def __len__(self) -> int:
+        return len(self.__entries) + len(self.__baked)
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def transform(self, surface: Surface, angle: float, scale: float = 1) -> Surface:
+        """
+        Returns surface rotated counterclockwise by angle degrees and scaled by scale.
+        """
+        key = (surface, self.__quantize(angle), scale)
+        result = self.__baked.get(key)
+        if result is not None:
+            return result
+        result = self.__entries.get(key)
+        if result is not None:
+            self.__entries.move_to_end(key)
+            return result
+        result = self.__render(key)
+        self.__entries[key] = result
+        if len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+        return result
+
+    def prebake(self, surface: Surface) -> None:
+        """
+        Computes the rotations of surface facing each of the four orientations ahead of time.
+        These do not count towards the capacity and stay until the cache is cleared.
+        """
+        for rotation in _ORIENTATION_ROTATIONS:
+            key = (surface, self.__quantize(rotation), 1)
+            if key not in self.__baked:
+                result = self.__entries.pop(key, None)
+                self.__baked[key] = result if result is not None else self.__render(key)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__baked.clear()
+
+    @staticmethod
+    def __render(key: tuple[Surface, float, float]) -> Surface:
+        surface, rotation, scale = key
+        if scale == 1:
+            return transform.rotate(surface, rotation)
+        return transform.rotozoom(surface, rotation, scale)
+
+    def __quantize(self, angle: float) -> float:
+        return round(angle / self.__angle_step) * self.__angle_step % 360
+
+
+sprite_cache = SpriteCache()
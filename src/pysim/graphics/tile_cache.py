@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Collection, Optional
+
+import pygame
+from pygame import Surface, Vector2
+
+from pysim.data import Vector
+from pysim.graphics.context import GraphicsContext
+from pysim.graphics.primitives.image import Image
+from pysim.simulation.world import World
+
+
+class TileCache:
+    """
+    Keeps the tiles of a world, along with the entities resting on them, rendered on an offscreen surface,
+    so that they can be drawn with a single blit.
+    Tiles are assumed to keep their appearance: cells are only rendered again after being invalidated,
+    when their entity starts or stops moving, or when a world of different dimensions is rendered.
+    """
+
+    __context: GraphicsContext
+    __surface: Optional[Surface]
+    __dirty: set[Vector]
+    # Cells whose entity was left out of the last render
+    __moving: set[Vector]
+
+    def __init__(self, context: GraphicsContext):
+        self.__context = context
+        self.__surface = None
+        self.__dirty = set()
+        self.__moving = set()
+
+    def invalidate(self, position: Vector) -> None:
+        """
+        Marks the cell at the given position to be rendered again.
+        """
+        self.__dirty.add(position)
+
+    def invalidate_all(self) -> None:
+        self.__surface = None
+        self.__dirty.clear()
+
+    def render(self, world: World, moving: Collection[Vector] = ()) -> Image:
+        """
+        Brings the cached surface up to date with world and returns an image of the whole world.
+        Entities on cells in moving are left out, so that they can be animated separately.
+        The image shares the surface with the cache and so reflects later updates.
+        """
+        context = self.__context
+        tile_size = context.tile_size
+        size = (int(world.width * tile_size), int(world.height * tile_size))
+        if self.__surface is None or self.__surface.get_size() != size:
+            self.__surface = Surface(size, pygame.SRCALPHA)
+            self.__dirty = set(world.positions)
+            self.__moving = set()
+        moving = set(moving)
+        self.__dirty |= self.__moving ^ moving
+        self.__moving = moving
+        surface = self.__surface
+        for position in self.__dirty:
+            rect = context.tile_rectangle(position)
+            surface.fill((0, 0, 0, 0), rect)
+            # Keeps cells drawing outside of their bounds from overwriting their neighbours
+            surface.set_clip(rect)
+            tile = world.peek(position)
+            tile.render(context, position).render(surface, context.tile_layer)
+            if tile.contents is not None and position not in moving:
+                center = Vector2(rect.center)
+                tile.contents.render(context, center).render(surface, context.entity_layer)
+        surface.set_clip(None)
+        self.__dirty.clear()
+        width, height = size
+        return Image(context.tile_layer, Vector2(width / 2, height / 2), surface)
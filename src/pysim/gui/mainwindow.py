@@ -1,3 +1,5 @@
+import asyncio
+import time
 from typing import cast
 
 import pygame
@@ -25,28 +27,45 @@ class MainWindow:
         return self.__screen
 
     def run(self):
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return
-                elif event.type == pygame.KEYDOWN:
-                    key = event.key
-                    ctrl = (event.mod & pygame.KMOD_CTRL) != 0
+        while self.__run_frame(self.__clock.tick(settings['max_fps']) / 1000):
+            pass
 
-                    if key == pygame.K_f and ctrl:
-                        settings['show_fps'] = not settings['show_fps']
+    async def run_async(self):
+        """
+        Same as run, but waits for the next frame on the event loop instead of sleeping,
+        so that other tasks, such as ones communicating with actors, run while the frame waits.
+        """
+        while True:
+            frame_start = time.perf_counter()
+            if not self.__run_frame(self.__clock.tick() / 1000):
+                break
+            max_fps = settings['max_fps']
+            if max_fps > 0:
+                remaining = 1 / max_fps - (time.perf_counter() - frame_start)
+            else:
+                remaining = 0
+            await asyncio.sleep(max(remaining, 0))
 
-            elapsed_seconds = self.__get_elapsed_seconds()
+    def __run_frame(self, elapsed_seconds: float) -> bool:
+        """
+        Handles pending events and renders a single frame. Returns False when the window is to be closed.
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.KEYDOWN:
+                key = event.key
+                ctrl = (event.mod & pygame.KMOD_CTRL) != 0
 
-            self.screen.update(elapsed_seconds)
-            self.screen.render(self.__surface)
-            self.__fps.render(self.__surface)
+                if key == pygame.K_f and ctrl:
+                    settings['show_fps'] = not settings['show_fps']
 
-            pygame.display.flip()
+        self.screen.update(elapsed_seconds)
+        self.screen.render(self.__surface)
+        self.__fps.render(self.__surface)
 
-    def __get_elapsed_seconds(self):
-        max_fps = settings['max_fps']
-        return self.__clock.tick(max_fps) / 1000
+        pygame.display.flip()
+        return True
 
     @property
     def fps(self):
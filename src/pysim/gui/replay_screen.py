@@ -0,0 +1,85 @@
+from pygame import Surface
+
+from pysim.graphics.animations.animation import Animation
+from pysim.graphics.animator import Animator
+from pysim.graphics.layer import Layer
+from pysim.graphics.primitives.primitive import Primitive
+from pysim.simulation.events import Event
+from pysim.simulation.recording import Recording
+from pysim.simulation.simulation import Simulation
+from .screen import Screen
+
+
+class ReplayScreen(Screen):
+    """
+    Plays back a recording, animating one step after the other and pausing at its end.
+    seek jumps to any step on the timeline at the cost of reconstructing the world at that step.
+    """
+
+    __recording: Recording
+    __tile_layer: Layer
+    __entity_layer: Layer
+    __animator: Animator
+    __speed: float
+    __paused: bool
+    __step_index: int
+    __simulation: Simulation
+    __animation: Animation[Primitive]
+    __time: float
+
+    def __init__(self, recording: Recording, speed: float = 1):
+        self.__recording = recording
+        self.__tile_layer = Layer()
+        self.__entity_layer = Layer()
+        self.__animator = Animator(self.__tile_layer, self.__entity_layer)
+        self.__speed = speed
+        self.__paused = False
+        self.seek(0)
+
+    @property
+    def step_index(self) -> int:
+        """
+        Number of steps taken by the world being shown.
+        """
+        return self.__step_index
+
+    @property
+    def paused(self) -> bool:
+        return self.__paused
+
+    @paused.setter
+    def paused(self, value: bool) -> None:
+        self.__paused = value
+
+    def seek(self, step_index: int) -> None:
+        assert 0 <= step_index <= self.__recording.step_count
+        self.__simulation = Simulation(self.__recording.world_at(step_index))
+        self.__step_index = step_index
+        self.__animator.invalidate()
+        self.__animation = self.__animate(Event.zero())
+        self.__time = 0
+
+    def update(self, elapsed_seconds: float) -> None:
+        if self.__paused:
+            return
+        self.__time += elapsed_seconds * self.__speed
+        while self.__time >= self.__animation.duration:
+            if self.__step_index == self.__recording.step_count:
+                # Playback stops on a still image of the last world
+                self.__animation = self.__animate(Event.zero())
+                self.__time = 0
+                self.__paused = True
+                return
+            self.__time -= self.__animation.duration
+            step = self.__simulation.step(self.__recording.agent_index(self.__step_index))
+            self.__step_index += 1
+            self.__animation = self.__animate(step.event)
+
+    def render(self, surface: Surface) -> None:
+        primitive = self.__animation[self.__time]
+        for layer in (self.__tile_layer, self.__entity_layer):
+            primitive.render(surface, layer)
+
+    def __animate(self, event: Event) -> Animation[Primitive]:
+        # Sampled every frame until the next step, so worth compiling
+        return self.__animator.animate(self.__simulation.world, event).compile()
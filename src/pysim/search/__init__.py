@@ -0,0 +1,3 @@
+from .heuristics import PushDistances
+from .problem import Problem, State
+from .solver import breadth_first_search, a_star, iterative_deepening_a_star, solve, SearchLimitReached
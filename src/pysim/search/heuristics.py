@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+
+from pysim.search.problem import Problem, State
+from pysim.simulation.kinds import NO_ENTITY
+from pysim.simulation.outcome import Outcome
+
+
+class PushDistances:
+    """
+    For every target, the minimum number of pushes needed to bring a block from any cell to it,
+    ignoring all other blocks and agents. Blocks can only be pushed in the directions agents face.
+
+    Since every action pushes at most one block, summing for each uncovered target
+    the distance of the closest block yields an admissible heuristic.
+    Cells from which a block can reach no target at all are dead: if there are as many blocks as targets,
+    every block must end up on a target and a block on a dead cell makes the state unsolvable.
+    """
+
+    __problem: Problem
+    # Indexed by block code, then target, then cell
+    __distances: dict[int, dict[int, list[float]]]
+    __dead_cells: dict[int, frozenset[int]]
+    __prune_dead_cells: bool
+
+    def __init__(self, problem: Problem):
+        self.__problem = problem
+        block_codes = {code for _, code in problem.blocks(problem.initial_state)}
+        self.__distances = {
+            code: {target: self.__distances_to(target, code) for target in problem.targets}
+            for code in block_codes
+        }
+        self.__dead_cells = {
+            code: frozenset(
+                cell
+                for cell in range(problem.cell_count)
+                if all(math.isinf(distances[cell]) for distances in per_target.values())
+            )
+            for code, per_target in self.__distances.items()
+        }
+        block_count = sum(1 for _ in problem.blocks(problem.initial_state))
+        self.__prune_dead_cells = block_count == len(problem.targets)
+
+    def dead_cells(self, block_code: int) -> frozenset[int]:
+        return self.__dead_cells.get(block_code, frozenset())
+
+    def distance(self, block_code: int, cell: int, target: int) -> float:
+        return self.__distances[block_code][target][cell]
+
+    def is_dead(self, state: State) -> bool:
+        if not self.__prune_dead_cells:
+            return False
+        return any(cell in self.__dead_cells[code] for cell, code in self.__problem.blocks(state))
+
+    def __call__(self, state: State) -> float:
+        """
+        Returns a lower bound on the number of actions needed to reach a goal,
+        or infinity if the state is known to be unsolvable.
+        """
+        if self.is_dead(state):
+            return math.inf
+        blocks = list(self.__problem.blocks(state))
+        covered = {cell for cell, _ in blocks}
+        total = 0
+        for target in self.__problem.targets:
+            if target not in covered:
+                total += min((self.__distances[code][target][cell] for cell, code in blocks), default=math.inf)
+        return total
+
+    def __distances_to(self, target: int, block_code: int) -> list[float]:
+        """
+        Breadth-first search backwards from the target, undoing pushes.
+        """
+        problem = self.__problem
+        distances = [math.inf] * problem.cell_count
+        distances[target] = 0
+        queue = deque([target])
+        while queue:
+            cell = queue.popleft()
+            for orientation in set(problem.agent_orientations):
+                # Block is pushed from origin to cell by an agent standing on pusher
+                origin = problem.neighbor(cell, orientation.turn_around())
+                if origin < 0 or not math.isinf(distances[origin]):
+                    continue
+                pusher = problem.neighbor(origin, orientation.turn_around())
+                if pusher < 0 or not self.__can_push(origin, cell, block_code) or not self.__can_stand(pusher):
+                    continue
+                distances[origin] = distances[cell] + 1
+                queue.append(origin)
+        return distances
+
+    def __can_push(self, origin: int, destination: int, block_code: int) -> bool:
+        problem = self.__problem
+        if problem.static_entity_code(origin) != NO_ENTITY:
+            return False
+        outcome = problem.transitions.lookup(
+            problem.tile_code(origin), block_code,
+            problem.tile_code(destination), problem.static_entity_code(destination)
+        )
+        return outcome is Outcome.PUSHED
+
+    def __can_stand(self, cell: int) -> bool:
+        problem = self.__problem
+        outcome = problem.transitions.lookup(
+            problem.tile_code(cell), problem.static_entity_code(cell),
+            problem.transitions.outside, NO_ENTITY
+        )
+        return outcome is Outcome.MOVED
+
+
+def zero_heuristic(state: State) -> float:
+    return 0
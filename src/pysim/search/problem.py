@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from pysim.data import Vector
+from pysim.data.orientation import Orientation, DELTA_X, DELTA_Y
+from pysim.simulation.agent import Agent
+from pysim.simulation.kinds import encode_world, entity_codes, entity_kinds, NO_ENTITY
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.transitions import transition_table, TransitionTable
+from pysim.simulation.world import World
+
+# Entries for blocks in a state combine the cell and entity code
+_CODE_RANGE = 256
+
+State = tuple[int, ...]
+
+
+class Problem:
+    """
+    Search problem asking to cover all targets with blocks, where the only action is
+    an agent moving forward.
+    Only entities move, so a state consists of the cell of each agent followed by the sorted cells
+    (combined with their entity codes) of the movable entities, which are all referred to as blocks.
+    Cells are numbered in reading order.
+    Moves are determined by the same transition table as Simulation.forward.
+    """
+
+    __width: int
+    __height: int
+    __tiles: list[int]
+    __static_entities: dict[int, int]
+    __agent_codes: tuple[int, ...]
+    __agent_orientations: tuple[Orientation, ...]
+    __neighbors: tuple[tuple[int, ...], ...]
+    __targets: frozenset[int]
+    __transitions: TransitionTable
+    __initial_state: State
+
+    def __init__(self, world: World, targets: Iterable[Vector]):
+        self.__width = world.width
+        self.__height = world.height
+        encoded = encode_world(world)
+        self.__tiles = [int(code) for code in encoded.codes.flat]
+        codes = entity_codes(encoded)
+        agents = [world.peek(position).contents for position in world.agent_positions]
+        self.__agent_codes = tuple(entity_kinds.code_of(agent) for agent in agents)
+        self.__agent_orientations = tuple(agent.orientation for agent in agents)
+        self.__static_entities = {
+            self.cell(position): int(codes[position.y, position.x])
+            for position in encoded.occupied_positions
+            if not encoded.contents(position).is_movable()
+        }
+        self.__neighbors = tuple(
+            tuple(self.__neighbor(cell, orientation) for cell in range(self.__width * self.__height))
+            for orientation in Orientation
+        )
+        self.__targets = frozenset(self.cell(target) for target in targets)
+        self.__transitions = transition_table()
+        self.__initial_state = self.encode(world)
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def cell_count(self) -> int:
+        return self.__width * self.__height
+
+    @property
+    def initial_state(self) -> State:
+        return self.__initial_state
+
+    @property
+    def agent_count(self) -> int:
+        return len(self.__agent_codes)
+
+    @property
+    def agent_orientations(self) -> tuple[Orientation, ...]:
+        return self.__agent_orientations
+
+    @property
+    def targets(self) -> frozenset[int]:
+        return self.__targets
+
+    @property
+    def transitions(self) -> TransitionTable:
+        return self.__transitions
+
+    def cell(self, position: Vector) -> int:
+        return position.y * self.__width + position.x
+
+    def position(self, cell: int) -> Vector:
+        y, x = divmod(cell, self.__width)
+        return Vector(x, y)
+
+    def neighbor(self, cell: int, orientation: Orientation) -> int:
+        """
+        Returns the cell next to the given one in the given direction, or -1 if it lies outside the world.
+        """
+        return self.__neighbors[orientation][cell]
+
+    def tile_code(self, cell: int) -> int:
+        return self.__tiles[cell]
+
+    def static_entity_code(self, cell: int) -> int:
+        return self.__static_entities.get(cell, NO_ENTITY)
+
+    def encode(self, world: World) -> State:
+        """
+        Encodes the state of a world with the same layout as the one this problem was created with.
+        """
+        agent_cells = tuple(self.cell(position) for position in world.agent_positions)
+        block_entries = []
+        for position in world.positions:
+            entity = world.peek(position).contents
+            if entity is not None and entity.is_movable() and not isinstance(entity, Agent):
+                block_entries.append(self.cell(position) * _CODE_RANGE + entity_kinds.code_of(entity))
+        return agent_cells + tuple(sorted(block_entries))
+
+    def blocks(self, state: State) -> Iterable[tuple[int, int]]:
+        """
+        Returns the cells and entity codes of all blocks.
+        """
+        for entry in state[len(self.__agent_codes):]:
+            yield divmod(entry, _CODE_RANGE)
+
+    def is_goal(self, state: State) -> bool:
+        covered = {cell for cell, _ in self.blocks(state)}
+        return self.__targets <= covered
+
+    def successor(self, state: State, agent_index: int) -> Optional[State]:
+        """
+        Returns the state reached by making the given agent move forward, or None if nothing happens.
+        """
+        agent_count = len(self.__agent_codes)
+        agent_cells = state[:agent_count]
+        blocks = {entry // _CODE_RANGE: entry % _CODE_RANGE for entry in state[agent_count:]}
+
+        def entity_at(cell: int) -> int:
+            if cell in blocks:
+                return blocks[cell]
+            if cell in agent_cells:
+                return self.__agent_codes[agent_cells.index(cell)]
+            return self.__static_entities.get(cell, NO_ENTITY)
+
+        orientation = self.__agent_orientations[agent_index]
+        origin = agent_cells[agent_index]
+        destination = self.__neighbors[orientation][origin]
+        if destination < 0:
+            return None
+        beyond = self.__neighbors[orientation][destination]
+        if beyond < 0:
+            beyond_tile = self.__transitions.outside
+            beyond_entity = NO_ENTITY
+        else:
+            beyond_tile = self.__tiles[beyond]
+            beyond_entity = entity_at(beyond)
+        outcome = self.__transitions.lookup(self.__tiles[destination], entity_at(destination), beyond_tile, beyond_entity)
+
+        if outcome is Outcome.BLOCKED:
+            return None
+        new_agent_cells = list(agent_cells)
+        new_agent_cells[agent_index] = destination
+        if outcome is Outcome.PUSHED:
+            if destination in blocks:
+                blocks[beyond] = blocks.pop(destination)
+            else:
+                new_agent_cells[agent_cells.index(destination)] = beyond
+        block_entries = sorted(cell * _CODE_RANGE + code for cell, code in blocks.items())
+        return tuple(new_agent_cells) + tuple(block_entries)
+
+    def successors(self, state: State) -> Iterable[tuple[int, State]]:
+        """
+        Yields pairs of agent indices and the states reached by making that agent move forward.
+        """
+        for agent_index in range(len(self.__agent_codes)):
+            successor = self.successor(state, agent_index)
+            if successor is not None:
+                yield agent_index, successor
+
+    def __neighbor(self, cell: int, orientation: Orientation) -> int:
+        y, x = divmod(cell, self.__width)
+        x += DELTA_X[orientation]
+        y += DELTA_Y[orientation]
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            return y * self.__width + x
+        else:
+            return -1
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections import deque
+from itertools import count
+from typing import Callable, Optional, List, Iterable
+
+from pysim.data import Vector
+from pysim.search.heuristics import PushDistances
+from pysim.search.problem import Problem, State
+from pysim.simulation.world import World
+
+Heuristic = Callable[[State], float]
+
+
+class SearchLimitReached(Exception):
+    pass
+
+
+class _Budget:
+    __remaining: float
+
+    def __init__(self, max_states: Optional[int]):
+        self.__remaining = math.inf if max_states is None else max_states
+
+    def spend(self) -> None:
+        self.__remaining -= 1
+        if self.__remaining < 0:
+            raise SearchLimitReached()
+
+
+def _reconstruct(parents: dict[State, Optional[tuple[State, int]]], state: State) -> List[int]:
+    actions = []
+    while parents[state] is not None:
+        state, action = parents[state]
+        actions.append(action)
+    actions.reverse()
+    return actions
+
+
+def breadth_first_search(problem: Problem,
+                         heuristic: Optional[Heuristic] = None,
+                         max_states: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Returns a shortest list of agent indices to move forward in order to reach the goal,
+    or None if the goal is unreachable. The heuristic is only used to prune states it deems unsolvable.
+    Raises SearchLimitReached when more than max_states states are visited.
+    """
+    heuristic = heuristic or PushDistances(problem)
+    budget = _Budget(max_states)
+    start = problem.initial_state
+    parents: dict[State, Optional[tuple[State, int]]] = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if problem.is_goal(state):
+            return _reconstruct(parents, state)
+        for action, successor in problem.successors(state):
+            if successor not in parents and not math.isinf(heuristic(successor)):
+                budget.spend()
+                parents[successor] = (state, action)
+                queue.append(successor)
+    return None
+
+
+def a_star(problem: Problem,
+           heuristic: Optional[Heuristic] = None,
+           max_states: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Same as breadth_first_search, but explores states in order of increasing estimated cost.
+    Solutions are optimal as long as the heuristic is admissible.
+    """
+    heuristic = heuristic or PushDistances(problem)
+    budget = _Budget(max_states)
+    start = problem.initial_state
+    if math.isinf(heuristic(start)):
+        return None
+    tie_breaker = count()
+    best_costs = {start: 0}
+    parents: dict[State, Optional[tuple[State, int]]] = {start: None}
+    # Ties are broken in favor of deeper states
+    frontier = [(heuristic(start), 0, next(tie_breaker), start)]
+    while frontier:
+        _, negated_cost, _, state = heapq.heappop(frontier)
+        cost = -negated_cost
+        if cost > best_costs[state]:
+            continue
+        if problem.is_goal(state):
+            return _reconstruct(parents, state)
+        for action, successor in problem.successors(state):
+            successor_cost = cost + 1
+            if successor_cost < best_costs.get(successor, math.inf):
+                estimate = heuristic(successor)
+                if math.isinf(estimate):
+                    continue
+                budget.spend()
+                best_costs[successor] = successor_cost
+                parents[successor] = (state, action)
+                heapq.heappush(frontier, (successor_cost + estimate, -successor_cost, next(tie_breaker), successor))
+    return None
+
+
+def iterative_deepening_a_star(problem: Problem,
+                               heuristic: Optional[Heuristic] = None,
+                               max_states: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Depth-first variant of a_star using memory proportional to the solution length
+    plus a transposition table holding the lowest cost at which each state was reached in the current iteration.
+    """
+    heuristic = heuristic or PushDistances(problem)
+    budget = _Budget(max_states)
+    start = problem.initial_state
+    if problem.is_goal(start):
+        return []
+    bound = heuristic(start)
+    while not math.isinf(bound):
+        costs = {start: 0}
+        actions: List[int] = []
+        stack: List[Iterable[tuple[int, State]]] = [iter(problem.successors(start))]
+        next_bound = math.inf
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                if actions:
+                    actions.pop()
+                continue
+            action, state = step
+            cost = len(actions) + 1
+            if costs.get(state, math.inf) <= cost:
+                continue
+            budget.spend()
+            costs[state] = cost
+            estimate = cost + heuristic(state)
+            if estimate > bound:
+                next_bound = min(next_bound, estimate)
+                continue
+            actions.append(action)
+            if problem.is_goal(state):
+                return actions
+            stack.append(iter(problem.successors(state)))
+        bound = next_bound
+    return None
+
+
+def solve(world: World, targets: Iterable[Vector], max_states: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Returns a shortest list of agent indices which, when moved forward in turn,
+    cause all targets to be covered by blocks, or None if the level is unsolvable.
+    """
+    return a_star(Problem(world, targets), max_states=max_states)
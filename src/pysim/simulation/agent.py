@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from abc import ABC
-from typing import Any
+from typing import Any, Iterable
+
+from pygame import Color, Vector2
 
 from pysim.data import Vector
 from pysim.data.orientation import Orientation
+from pysim.graphics.context import GraphicsContext
+from pysim.graphics.primitives.car import create_car
+from pysim.graphics.primitives.primitive import Primitive
 from pysim.simulation.entities.entity import Entity
-from pysim.simulation.events import Event
+from pysim.simulation.events import Event, Motion
 
 
 class _ActorEvent(Event, ABC):
@@ -14,20 +19,32 @@ class _ActorEvent(Event, ABC):
 
 
 class _ForwardEvent(_ActorEvent):
+    __agent: Agent
     __origin: Vector
 
-    def __init__(self, origin: Vector):
+    def __init__(self, agent: Agent, origin: Vector):
+        self.__agent = agent
         self.__origin = origin
 
+    @property
+    def motions(self) -> Iterable[Motion]:
+        return (Motion(self.__agent, self.__origin, self.__agent.orientation),)
+
 
 class _MovedEvent(_ActorEvent):
+    __agent: Agent
     __origin: Vector
     __direction: Orientation
 
-    def __init__(self, origin: Vector, direction: Orientation):
+    def __init__(self, agent: Agent, origin: Vector, direction: Orientation):
+        self.__agent = agent
         self.__origin = origin
         self.__direction = direction
 
+    @property
+    def motions(self) -> Iterable[Motion]:
+        return (Motion(self.__agent, self.__origin, self.__direction),)
+
 
 class Agent(Entity, ABC):
     __orientation: Orientation
@@ -40,13 +57,17 @@ class Agent(Entity, ABC):
         return self.__orientation
 
     def forward(self, origin: Vector) -> Event:
-        return _ForwardEvent(origin)
+        return _ForwardEvent(self, origin)
 
     def is_movable(self) -> bool:
         return True
 
     def move(self, position: Vector, direction: Orientation) -> Event:
-        return _MovedEvent(position, direction)
+        return _MovedEvent(self, position, direction)
+
+    def render(self, context: GraphicsContext, center: Vector2) -> Primitive:
+        car = create_car(context.entity_layer, Color(255, 0, 0), context.tile_size * 0.8)
+        return car.transform(center, self.orientation.angle)
 
     # def backward(self) -> None:
     #     self.__position = self.backward_destination()
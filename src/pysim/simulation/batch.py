@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Sequence
+
+import numpy as np
+
+from pysim.data import Grid, Vector
+from pysim.data.orientation import DELTAS_ARRAY
+from pysim.simulation.agent import Agent
+from pysim.simulation.kinds import encode_world, entity_codes, agent_entities, tile_kinds, entity_kinds, NO_ENTITY
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.tiles import Tile
+from pysim.simulation.transitions import TransitionTable, transition_table
+from pysim.simulation.world import World
+
+NO_ACTION = -1
+
+
+class BatchSimulation:
+    """
+    Simulates many worlds of equal size and agent count at once.
+    Worlds are stored as stacked arrays of tile codes, entity codes, agent positions and agent orientations,
+    and follow the same rules as Simulation.
+    """
+
+    __tiles: np.ndarray
+    __entities: np.ndarray
+    __agent_positions: np.ndarray
+    __agent_orientations: np.ndarray
+    __agents: list[list[Agent]]
+    __transitions: TransitionTable
+    __is_agent: np.ndarray
+
+    def __init__(self, worlds: Sequence[World]):
+        assert len(worlds) > 0
+        width, height = worlds[0].width, worlds[0].height
+        agent_count = len(worlds[0].agent_positions)
+        assert all(world.width == width and world.height == height for world in worlds)
+        assert all(len(world.agent_positions) == agent_count for world in worlds)
+
+        encoded = [encode_world(world) for world in worlds]
+        self.__tiles = np.stack([grid.codes for grid in encoded])
+        self.__entities = np.stack([entity_codes(grid) for grid in encoded])
+        self.__agents = [
+            [deepcopy(world.peek(position).contents) for position in world.agent_positions]
+            for world in worlds
+        ]
+        self.__agent_positions = np.array(
+            [[tuple(position) for position in world.agent_positions] for world in worlds],
+            dtype=np.int64
+        ).reshape(len(worlds), agent_count, 2)
+        self.__agent_orientations = np.array(
+            [[agent.orientation for agent in agents] for agents in self.__agents],
+            dtype=np.uint8
+        ).reshape(len(worlds), agent_count)
+
+        # Tables are built after encoding so that they cover all kinds encountered
+        self.__transitions = transition_table()
+        self.__is_agent = agent_entities()
+
+    @staticmethod
+    def replicate(world: World, count: int) -> BatchSimulation:
+        """
+        Creates a batch of count copies of the given world, encoding it only once.
+        """
+        assert count >= 1
+        result = BatchSimulation([world])
+        result.__tiles = np.repeat(result.__tiles, count, axis=0)
+        result.__entities = np.repeat(result.__entities, count, axis=0)
+        result.__agent_positions = np.repeat(result.__agent_positions, count, axis=0)
+        result.__agent_orientations = np.repeat(result.__agent_orientations, count, axis=0)
+        result.__agents = result.__agents * count
+        return result
+
+    @property
+    def size(self) -> int:
+        return self.__tiles.shape[0]
+
+    @property
+    def tiles(self) -> np.ndarray:
+        """
+        Tile codes, indexed as [world, y, x].
+        """
+        return BatchSimulation.__read_only(self.__tiles)
+
+    @property
+    def entities(self) -> np.ndarray:
+        """
+        Entity codes, indexed as [world, y, x].
+        """
+        return BatchSimulation.__read_only(self.__entities)
+
+    @property
+    def agent_positions(self) -> np.ndarray:
+        """
+        Agent positions, indexed as [world, agent] and holding (x, y) pairs.
+        """
+        return BatchSimulation.__read_only(self.__agent_positions)
+
+    @property
+    def agent_orientations(self) -> np.ndarray:
+        return BatchSimulation.__read_only(self.__agent_orientations)
+
+    def forward(self, agent_indices: np.ndarray) -> np.ndarray:
+        """
+        Makes, in every world, the agent with the corresponding index move forward.
+        Worlds for which the index equals NO_ACTION are left untouched.
+        Returns an array of Outcome codes.
+        """
+        agent_indices = np.asarray(agent_indices)
+        assert agent_indices.shape == (self.size,)
+        height, width = self.__tiles.shape[1:]
+
+        worlds = np.arange(self.size)
+        active = agent_indices != NO_ACTION
+        agents = np.where(active, agent_indices, 0)
+        origins = self.__agent_positions[worlds, agents]
+        deltas = DELTAS_ARRAY[self.__agent_orientations[worlds, agents]].astype(np.int64)
+        destinations = origins + deltas
+        assert BatchSimulation.__inside(destinations[active], width, height).all(), 'agent moves outside of world'
+
+        # Inactive worlds look at their agent's own position, which is always inside the world
+        destinations = np.where(active[:, np.newaxis], destinations, origins)
+        destination_tiles = self.__tiles[worlds, destinations[:, 1], destinations[:, 0]]
+        destination_entities = self.__entities[worlds, destinations[:, 1], destinations[:, 0]]
+
+        beyond = destinations + deltas
+        beyond_inside = BatchSimulation.__inside(beyond, width, height)
+        beyond = np.where(beyond_inside[:, np.newaxis], beyond, destinations)
+        beyond_tiles = np.where(beyond_inside, self.__tiles[worlds, beyond[:, 1], beyond[:, 0]], self.__transitions.outside)
+        beyond_entities = np.where(beyond_inside, self.__entities[worlds, beyond[:, 1], beyond[:, 0]], NO_ENTITY)
+
+        outcomes = self.__transitions.outcomes[destination_tiles, destination_entities, beyond_tiles, beyond_entities]
+        outcomes[~active] = Outcome.BLOCKED
+        moves = outcomes == Outcome.MOVED
+        pushes = outcomes == Outcome.PUSHED
+
+        # Pushed agents need their position updated
+        at_destination = (self.__agent_positions == destinations[:, np.newaxis, :]).all(axis=2)
+        pushed_worlds, pushed_agents = np.nonzero(pushes[:, np.newaxis] & at_destination)
+        self.__agent_positions[pushed_worlds, pushed_agents] = beyond[pushed_worlds]
+        pushers = worlds[pushes]
+        self.__entities[pushers, beyond[pushes, 1], beyond[pushes, 0]] = destination_entities[pushes]
+
+        movers = worlds[moves | pushes]
+        mover_origins = origins[movers]
+        mover_destinations = destinations[movers]
+        self.__entities[movers, mover_destinations[:, 1], mover_destinations[:, 0]] = \
+            self.__entities[movers, mover_origins[:, 1], mover_origins[:, 0]]
+        self.__entities[movers, mover_origins[:, 1], mover_origins[:, 0]] = NO_ENTITY
+        self.__agent_positions[movers, agents[movers]] = mover_destinations
+        return outcomes
+
+    def world(self, index: int) -> World:
+        """
+        Reconstructs the world with the given index.
+        """
+        assert 0 <= index < self.size
+        tiles = self.__tiles[index]
+        entities = self.__entities[index]
+        agents = {
+            Vector(int(x), int(y)): agent
+            for (x, y), agent in zip(self.__agent_positions[index], self.__agents[index])
+        }
+
+        def initialize(position: Vector) -> Tile:
+            tile = deepcopy(tile_kinds.prototype(int(tiles[position.y, position.x])))
+            entity_code = int(entities[position.y, position.x])
+            if entity_code != NO_ENTITY:
+                if self.__is_agent[entity_code]:
+                    tile.contents = agents[position]
+                else:
+                    tile.contents = deepcopy(entity_kinds.prototype(entity_code))
+            return tile
+
+        grid = Grid[Tile](tiles.shape[1], tiles.shape[0], initialize)
+        positions = [Vector(int(x), int(y)) for x, y in self.__agent_positions[index]]
+        return World(grid, positions)
+
+    @staticmethod
+    def __read_only(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def __inside(positions: np.ndarray, width: int, height: int) -> np.ndarray:
+        return (0 <= positions[:, 0]) & (positions[:, 0] < width) & (0 <= positions[:, 1]) & (positions[:, 1] < height)
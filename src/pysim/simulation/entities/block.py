@@ -1,21 +1,47 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from pygame import Color, Rect, Vector2
+
 from pysim.data import Vector
 from pysim.data.orientation import Orientation
+from pysim.graphics.context import GraphicsContext
+from pysim.graphics.primitives.primitive import Primitive
+from pysim.graphics.primitives.shapes import Rectangle
 from pysim.simulation.entities.entity import Entity
-from pysim.simulation.events import Event
+from pysim.simulation.events import Event, Motion
 
 
 class _MovedEvent(Event):
+    __block: Block
     __position: Vector
     __direction: Orientation
 
-    def __init__(self, position: Vector, direction: Orientation):
+    def __init__(self, block: Block, position: Vector, direction: Orientation):
+        self.__block = block
         self.__position = position
         self.__direction = direction
 
+    @property
+    def motions(self) -> Iterable[Motion]:
+        return (Motion(self.__block, self.__position, self.__direction),)
+
 
 class Block(Entity):
     def move(self, position: Vector, direction: Orientation) -> Event:
-        return _MovedEvent(position, direction)
+        return _MovedEvent(self, position, direction)
 
     def is_movable(self) -> bool:
         return True
+
+    def render(self, context: GraphicsContext, center: Vector2) -> Primitive:
+        size = context.tile_size * 0.8
+        rect = Rect(center.x - size / 2, center.y - size / 2, size, size)
+        return Rectangle(context.entity_layer, rect, Color(139, 90, 43))
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Block)
+
+    def __hash__(self) -> int:
+        return 0
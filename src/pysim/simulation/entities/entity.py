@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 
+from pygame import Vector2
+
 from pysim.data import Vector
 from pysim.data.orientation import Orientation
+from pysim.graphics.context import GraphicsContext
+from pysim.graphics.primitives.primitive import Primitive
 from pysim.simulation.events import Event
 
 
@@ -13,3 +17,11 @@ class Entity(ABC):
     @abstractmethod
     def move(self, position: Vector, direction: Orientation) -> Event:
         ...
+
+    @abstractmethod
+    def render(self, context: GraphicsContext, center: Vector2) -> Primitive:
+        """
+        Renders this entity on the entity layer, centered on the given point.
+        Unlike tiles, entities are not bound to cells, so that they can be drawn while moving between them.
+        """
+        ...
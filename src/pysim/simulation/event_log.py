@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import struct
+from typing import BinaryIO, Iterator, NamedTuple
+
+from pysim.data import Vector
+from pysim.data.orientation import Orientation
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.simulation import Simulation
+from pysim.simulation.step import Step
+
+_MAGIC = b'PSEL'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBB')
+
+# Agent index, outcome, origin x, origin y, orientation
+_RECORD = struct.Struct('<HBhhB')
+
+
+class EventLogError(Exception):
+    pass
+
+
+class LogRecord(NamedTuple):
+    agent_index: int
+    outcome: Outcome
+    origin: Vector
+    orientation: Orientation
+
+
+class EventLogWriter:
+    """
+    Appends one fixed-size record per step to a binary file.
+    Events themselves are not stored: they follow deterministically from the steps,
+    so that replaying the records into a simulation starting from the same world recreates them.
+    Records are buffered and only written once buffer_size of them have accumulated, or on flush.
+    """
+
+    __file: BinaryIO
+    __buffer: bytearray
+    __buffer_size: int
+    __record_count: int
+
+    def __init__(self, file: BinaryIO, buffer_size: int = 4096):
+        assert buffer_size > 0
+        self.__file = file
+        self.__buffer = bytearray()
+        self.__buffer_size = buffer_size
+        self.__record_count = 0
+        file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+
+    @property
+    def record_count(self) -> int:
+        return self.__record_count
+
+    def append(self, step: Step) -> None:
+        origin = step.origin
+        self.__buffer += _RECORD.pack(step.agent_index, step.outcome, origin.x, origin.y, step.agent.orientation)
+        self.__record_count += 1
+        if len(self.__buffer) >= self.__buffer_size * _RECORD.size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.__file.write(self.__buffer)
+        self.__buffer.clear()
+        self.__file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.__file.close()
+
+    def __enter__(self) -> EventLogWriter:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class EventLogReader:
+    """
+    Reads the records written by EventLogWriter, a chunk at a time.
+    """
+
+    __file: BinaryIO
+    __chunk_size: int
+
+    def __init__(self, file: BinaryIO, chunk_size: int = 4096):
+        assert chunk_size > 0
+        self.__file = file
+        self.__chunk_size = chunk_size
+        header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise EventLogError('missing header')
+        magic, version, record_size = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise EventLogError('unsupported event log format')
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        chunk_bytes = self.__chunk_size * _RECORD.size
+        while True:
+            chunk = self.__file.read(chunk_bytes)
+            if len(chunk) % _RECORD.size != 0:
+                raise EventLogError('truncated record')
+            for agent_index, outcome, x, y, orientation in _RECORD.iter_unpack(chunk):
+                yield LogRecord(agent_index, Outcome(outcome), Vector(x, y), Orientation(orientation))
+            if len(chunk) < chunk_bytes:
+                return
+
+    def replay(self, simulation: Simulation) -> Iterator[Step]:
+        """
+        Makes the simulation take the logged steps one by one, yielding them as it goes.
+        The simulation must start from the world the log was recorded from;
+        an EventLogError is raised as soon as a step turns out differently than recorded.
+        Events are created lazily by the steps, so that a viewer only pays for the ones it animates.
+        """
+        for record in self:
+            step = simulation.step(record.agent_index)
+            if (step.outcome, step.origin, step.agent.orientation) != record[1:]:
+                raise EventLogError(f'simulation diverges from log at {record}')
+            yield step
+
+    def close(self) -> None:
+        self.__file.close()
+
+    def __enter__(self) -> EventLogReader:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
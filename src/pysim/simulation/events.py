@@ -3,7 +3,26 @@ from __future__ import annotations
 from abc import ABC
 from functools import reduce
 from operator import xor
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from pysim.data import Vector
+from pysim.data.orientation import Orientation
+
+if TYPE_CHECKING:
+    from pysim.simulation.entities.entity import Entity
+
+
+class Motion(NamedTuple):
+    """
+    An entity moving one cell from origin in the given direction.
+    """
+    entity: Entity
+    origin: Vector
+    direction: Orientation
+
+    @property
+    def destination(self) -> Vector:
+        return self.origin.move(self.direction)
 
 
 class Event(ABC):
@@ -14,6 +33,13 @@ class Event(ABC):
     def zero() -> Event:
         return ZeroOperation()
 
+    @property
+    def motions(self) -> Iterable[Motion]:
+        """
+        Entities moved by this event, which animators need to animate.
+        """
+        return ()
+
 
 class ParallelEvent(Event):
     __children: tuple[Event, ...]
@@ -31,6 +57,11 @@ class ParallelEvent(Event):
     def children(self) -> tuple[Event, ...]:
         return self.__children
 
+    @property
+    def motions(self) -> Iterable[Motion]:
+        for child in self.__children:
+            yield from child.motions
+
 
 class ZeroOperation(Event):
     def __eq__(self, other) -> bool:
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import TypeVar, Generic, Iterable, Optional, Callable, TYPE_CHECKING
+
+import numpy as np
+
+from pysim.data import ArrayGrid, Grid, Vector
+from pysim.simulation.agent import Agent
+from pysim.simulation.entities import Block, Entity
+from pysim.simulation.tiles import Tile, Empty, Wall, Chasm
+
+if TYPE_CHECKING:
+    from pysim.simulation.world import World
+
+T = TypeVar('T')
+
+
+class KindRegistry(Generic[T]):
+    """
+    Assigns small integer codes to classes.
+    Classes are registered on first encounter, so that custom tiles and entities
+    receive a code without having to be declared up front.
+    For each kind, a prototype instance is kept so that code can be turned back into objects.
+    """
+
+    __kinds: list[type]
+    __codes: dict[type, int]
+    __prototypes: dict[int, T]
+    __copy_prototype: Callable[[T], T]
+    __version: int
+
+    def __init__(self, kinds: Iterable[type], copy_prototype: Callable[[T], T] = deepcopy):
+        self.__kinds = []
+        self.__codes = {}
+        self.__prototypes = {}
+        self.__copy_prototype = copy_prototype
+        self.__version = 0
+        for kind in kinds:
+            self.register(kind)
+
+    def register(self, kind: type) -> int:
+        code = self.__codes.get(kind)
+        if code is None:
+            code = len(self.__kinds)
+            assert code <= np.iinfo(np.uint8).max, 'too many kinds to fit in a byte'
+            self.__kinds.append(kind)
+            self.__codes[kind] = code
+            self.__version += 1
+        return code
+
+    def code_of(self, obj: Optional[T]) -> int:
+        code = self.register(type(obj))
+        if obj is not None and code not in self.__prototypes:
+            self.__prototypes[code] = self.__copy_prototype(obj)
+            self.__version += 1
+        return code
+
+    def kind(self, code: int) -> type:
+        return self.__kinds[code]
+
+    def prototype(self, code: int) -> Optional[T]:
+        return self.__prototypes.get(code)
+
+    @property
+    def version(self) -> int:
+        """
+        Increases each time a kind or prototype is added,
+        allowing tables derived from the registry to detect they are out of date.
+        """
+        return self.__version
+
+    def __len__(self) -> int:
+        return len(self.__kinds)
+
+
+def _empty_copy(tile: Tile) -> Tile:
+    result = deepcopy(tile)
+    if result.contents is not None:
+        result.contents = None
+    return result
+
+
+tile_kinds = KindRegistry[Tile]([Empty, Wall, Chasm], copy_prototype=_empty_copy)
+
+# Code 0 is reserved for the absence of an entity
+entity_kinds = KindRegistry[Entity]([type(None), Agent, Block])
+
+EMPTY = tile_kinds.code_of(Empty())
+WALL = tile_kinds.code_of(Wall())
+CHASM = tile_kinds.code_of(Chasm())
+NO_ENTITY = entity_kinds.code_of(None)
+
+
+def _encode(width: int, height: int, tile_at: Callable[[Vector], Tile]) -> ArrayGrid[Entity]:
+    result = ArrayGrid[Entity](width, height)
+    for position in result.positions:
+        tile = tile_at(position)
+        result[position] = tile_kinds.code_of(tile)
+        result.set_contents(position, tile.contents)
+    return result
+
+
+def encode_grid(grid: Grid[Tile]) -> ArrayGrid[Entity]:
+    return _encode(grid.width, grid.height, grid.__getitem__)
+
+
+def encode_world(world: World) -> ArrayGrid[Entity]:
+    return _encode(world.width, world.height, world.peek)
+
+
+def decode_grid(grid: ArrayGrid[Entity]) -> Grid[Tile]:
+    def initialize(position: Vector) -> Tile:
+        code = grid[position]
+        prototype = tile_kinds.prototype(code)
+        assert prototype is not None, f'no known instance of {tile_kinds.kind(code)}'
+        tile = deepcopy(prototype)
+        contents = grid.contents(position)
+        if contents is not None:
+            tile.contents = contents
+        return tile
+
+    return Grid(grid.width, grid.height, initialize)
+
+
+def entity_codes(grid: ArrayGrid[Entity]) -> np.ndarray:
+    result = np.full((grid.height, grid.width), NO_ENTITY, dtype=np.uint8)
+    for position in grid.occupied_positions:
+        result[position.y, position.x] = entity_kinds.code_of(grid.contents(position))
+    return result
+
+
+def agent_entities() -> np.ndarray:
+    """
+    Returns a table indexed by entity code telling whether entities of that kind are agents.
+    The table only covers the kinds registered at the time of the call.
+    """
+    kinds = [entity_kinds.kind(code) for code in range(len(entity_kinds))]
+    return np.array([issubclass(kind, Agent) for kind in kinds], dtype=bool)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import List, Callable, Optional
+
+from pysim.data import Grid, Vector
+from pysim.data.orientation import NORTH, EAST, SOUTH, WEST, Orientation
+from pysim.simulation.agent import Agent
+from pysim.simulation.entities import Block, Entity
+from pysim.simulation.tiles import Tile, Empty, Wall, Chasm
+from pysim.simulation.world import World
+
+_TILES: dict[str, Callable[[], Tile]] = {
+    '.': Empty,
+    'W': Wall,
+    'C': Chasm,
+    'B': Empty,
+    '^': Empty,
+    '>': Empty,
+    'v': Empty,
+    '<': Empty,
+}
+
+_AGENTS: dict[str, Orientation] = {
+    '^': NORTH,
+    '>': EAST,
+    'v': SOUTH,
+    '<': WEST,
+}
+
+
+def parse_world(rows: List[str]) -> World:
+    """
+    Creates a world from a textual description.
+    '.' denotes an empty tile, 'W' a wall, 'C' a chasm, 'B' a block
+    and '^', '>', 'v', '<' an agent facing north, east, south or west.
+    Agents are indexed in reading order.
+    """
+    assert len(rows) > 0
+    assert len(set(len(row) for row in rows)) == 1, "Rows must be of equal length"
+
+    def initialize(position: Vector) -> Tile:
+        char = rows[position.y][position.x]
+        assert char in _TILES, f'unknown character {char!r}'
+        tile = _TILES[char]()
+        entity = _create_entity(char)
+        if entity is not None:
+            tile.contents = entity
+        return tile
+
+    grid = Grid[Tile](len(rows[0]), len(rows), initialize)
+    agent_positions = [position for position in grid.positions if isinstance(grid[position].contents, Agent)]
+    return World(grid, agent_positions)
+
+
+def _create_entity(char: str) -> Optional[Entity]:
+    if char in _AGENTS:
+        return Agent(_AGENTS[char])
+    elif char == 'B':
+        return Block()
+    else:
+        return None
+
+
+def format_world(world: World) -> List[str]:
+    """
+    Inverse of parse_world.
+    """
+    def char_at(position: Vector) -> str:
+        tile = world.peek(position)
+        contents = tile.contents
+        if isinstance(contents, Agent):
+            return next(char for char, orientation in _AGENTS.items() if orientation is contents.orientation)
+        elif isinstance(contents, Block):
+            return 'B'
+        elif isinstance(tile, Wall):
+            return 'W'
+        elif isinstance(tile, Chasm):
+            return 'C'
+        else:
+            return '.'
+
+    return [''.join(char_at(Vector(x, y)) for x in range(world.width)) for y in range(world.height)]
@@ -0,0 +1,11 @@
+from enum import IntEnum
+
+
+class Outcome(IntEnum):
+    """
+    Result of an agent trying to move forward.
+    """
+
+    BLOCKED = 0
+    MOVED = 1
+    PUSHED = 2
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, List
+
+from pysim.data import Vector
+from pysim.simulation.agent import Agent
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.simulation import Simulation
+from pysim.simulation.step import Step
+from pysim.simulation.world import World
+
+
+class Recording:
+    """
+    Run that can be reconstructed at any step.
+    Every checkpoint_interval steps, a snapshot of the world is kept as checkpoint.
+    In between, each step is stored as a delta consisting of the entity moves it caused.
+    Reconstructing the world at a given step takes one snapshot of the preceding checkpoint
+    followed by at most checkpoint_interval deltas.
+    Since snapshots share unmodified chunks, checkpoints only cost memory for the parts of the world that changed.
+    """
+
+    __simulation: Simulation
+    __checkpoint_interval: int
+    __checkpoints: List[World]
+    __agent_indices: array
+    # Entity moves as consecutive origin x, origin y, destination x and destination y
+    __moves: array
+    # Number of moves made before each step, followed by the total number of moves
+    __move_offsets: array
+
+    def __init__(self, world: World, checkpoint_interval: int = 1024):
+        assert checkpoint_interval > 0
+        self.__simulation = Simulation(world.snapshot())
+        self.__checkpoint_interval = checkpoint_interval
+        self.__checkpoints = [world.snapshot()]
+        self.__agent_indices = array('H')
+        self.__moves = array('h')
+        self.__move_offsets = array('q', [0])
+
+    @property
+    def world(self) -> World:
+        """
+        World as it is after the last recorded step.
+        """
+        return self.__simulation.world
+
+    @property
+    def step_count(self) -> int:
+        return len(self.__agent_indices)
+
+    @property
+    def checkpoint_interval(self) -> int:
+        return self.__checkpoint_interval
+
+    def agent_index(self, step_index: int) -> int:
+        return self.__agent_indices[step_index]
+
+    def advance(self, agent_index: int) -> Outcome:
+        """
+        Makes the given agent move forward and records the step.
+        """
+        world = self.__simulation.world
+        origin = world.agent_positions[agent_index]
+        agent = world.peek(origin).contents
+        assert isinstance(agent, Agent)
+        outcome = self.__simulation.advance(agent_index)
+        self.__record(agent_index, outcome, origin, agent)
+        return outcome
+
+    def step(self, agent_index: int) -> Step:
+        """
+        Same as advance, but returns the step so that its event can be animated.
+        """
+        step = self.__simulation.step(agent_index)
+        self.__record(agent_index, step.outcome, step.origin, step.agent)
+        return step
+
+    def world_at(self, step_index: int) -> World:
+        """
+        Returns a new world in the state reached after the given number of steps.
+        """
+        assert 0 <= step_index <= self.step_count
+        checkpoint_index = step_index // self.__checkpoint_interval
+        world = self.__checkpoints[checkpoint_index].snapshot()
+        moves = self.__moves
+        first = self.__move_offsets[checkpoint_index * self.__checkpoint_interval]
+        last = self.__move_offsets[step_index]
+        for i in range(4 * first, 4 * last, 4):
+            world.move_entity(Vector(moves[i], moves[i + 1]), Vector(moves[i + 2], moves[i + 3]))
+        return world
+
+    def replay(self, step_index: int) -> Iterator[Step]:
+        """
+        Yields the steps following the given one, starting from world_at(step_index).
+        Events of the steps are created on demand, so skipped steps cost no event allocations.
+        """
+        simulation = Simulation(self.world_at(step_index))
+        for agent_index in self.__agent_indices[step_index:]:
+            yield simulation.step(agent_index)
+
+    def __record(self, agent_index: int, outcome: Outcome, origin: Vector, agent: Agent) -> None:
+        orientation = agent.orientation
+        destination = origin.move(orientation)
+        if outcome is Outcome.PUSHED:
+            beyond = destination.move(orientation)
+            self.__moves.extend((destination.x, destination.y, beyond.x, beyond.y))
+        if outcome is not Outcome.BLOCKED:
+            self.__moves.extend((origin.x, origin.y, destination.x, destination.y))
+        self.__agent_indices.append(agent_index)
+        self.__move_offsets.append(len(self.__moves) // 4)
+        if self.step_count % self.__checkpoint_interval == 0:
+            self.__checkpoints.append(self.__simulation.world.snapshot())
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+import numpy as np
+
+from pysim.data import Vector
+from pysim.data.orientation import DELTAS_ARRAY
+from pysim.simulation.kinds import encode_world, entity_codes, entity_kinds
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.step import Step
+from pysim.simulation.world import World
+
+T = TypeVar('T')
+
+# Version, width, height and agent count
+_HEADER_SIZE = 4 * 8
+
+# Number of attempts at reading while the publisher is writing before yielding, and before sleeping
+_SPIN_COUNT = 100
+_YIELD_COUNT = 200
+_SLEEP_TIME = 0.0001
+
+
+def _back_off(attempt: int) -> None:
+    # Publishing takes little time, so readers first retry right away
+    if attempt >= _YIELD_COUNT:
+        time.sleep(_SLEEP_TIME)
+    elif attempt >= _SPIN_COUNT:
+        time.sleep(0)
+
+
+class _Layout:
+    """
+    Arrays making up a shared world, laid out one after the other in a block of memory.
+    """
+
+    header: np.ndarray
+    tiles: np.ndarray
+    entities: np.ndarray
+    agent_positions: np.ndarray
+    agent_orientations: np.ndarray
+
+    def __init__(self, buffer: memoryview, width: int, height: int, agent_count: int):
+        cells = width * height
+        self.header = np.ndarray((4,), dtype=np.uint64, buffer=buffer)
+        offset = _HEADER_SIZE
+        self.agent_positions = np.ndarray((agent_count, 2), dtype=np.int64, buffer=buffer, offset=offset)
+        offset += self.agent_positions.nbytes
+        self.tiles = np.ndarray((height, width), dtype=np.uint8, buffer=buffer, offset=offset)
+        offset += cells
+        self.entities = np.ndarray((height, width), dtype=np.uint8, buffer=buffer, offset=offset)
+        offset += cells
+        self.agent_orientations = np.ndarray((agent_count,), dtype=np.uint8, buffer=buffer, offset=offset)
+
+    @staticmethod
+    def size(width: int, height: int, agent_count: int) -> int:
+        return _HEADER_SIZE + agent_count * 16 + 2 * width * height + agent_count
+
+    def release(self) -> None:
+        del self.header, self.tiles, self.entities, self.agent_positions, self.agent_orientations
+
+
+class SharedWorldPublisher:
+    """
+    Publishes the state of a world into shared memory, as tile codes, entity codes,
+    agent positions as (x, y) pairs and agent orientations, for SharedWorldView to read from other processes.
+    The version is odd while an update is being written and increases by two with every publish.
+    Codes are those assigned by the registries in kinds of the publishing process;
+    actor processes forked after the world was first published share them.
+    """
+
+    __world: World
+    __memory: SharedMemory
+    __layout: _Layout
+
+    def __init__(self, world: World):
+        self.__world = world
+        width, height, agent_count = world.width, world.height, len(world.agent_positions)
+        self.__memory = SharedMemory(create=True, size=_Layout.size(width, height, agent_count))
+        self.__layout = _Layout(self.__memory.buf, width, height, agent_count)
+        self.__layout.header[:] = (0, width, height, agent_count)
+        self.publish()
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    @property
+    def version(self) -> int:
+        return int(self.__layout.header[0])
+
+    def view(self) -> SharedWorldView:
+        """
+        Returns a view to be passed to actor processes.
+        """
+        return SharedWorldView(self.name)
+
+    def publish(self, changed: Optional[Iterable[Vector]] = None) -> None:
+        """
+        Copies the current state of the world into shared memory.
+        If changed is given, only the entities on those cells and the agent positions are copied,
+        taking time proportional to their number instead of to the size of the world.
+        This relies on tiles never changing and on entities only moving, which keeps orientations as they were.
+        """
+        if changed is None:
+            self.__publish_all()
+            return
+        world = self.__world
+        layout = self.__layout
+        updates = [(position, entity_kinds.code_of(world.peek(position).contents)) for position in changed]
+        layout.header[0] += 1
+        for position, code in updates:
+            layout.entities[position.y, position.x] = code
+        layout.agent_positions[:] = [tuple(position) for position in world.agent_positions]
+        layout.header[0] += 1
+
+    def publish_step(self, step: Step) -> None:
+        """
+        Publishes the changes made by a step, given that all earlier changes have been published.
+        """
+        if step.outcome is Outcome.BLOCKED:
+            return
+        distance = 3 if step.outcome is Outcome.PUSHED else 2
+        orientation = step.agent.orientation
+        self.publish([step.origin.move(orientation, i) for i in range(distance)])
+
+    def __publish_all(self) -> None:
+        world = self.__world
+        layout = self.__layout
+        encoded = encode_world(world)
+        orientations = [world.peek(position).contents.orientation for position in world.agent_positions]
+        layout.header[0] += 1
+        layout.tiles[:] = encoded.codes
+        layout.entities[:] = entity_codes(encoded)
+        layout.agent_positions[:] = [tuple(position) for position in world.agent_positions]
+        layout.agent_orientations[:] = orientations
+        layout.header[0] += 1
+
+    def close(self) -> None:
+        self.__layout.release()
+        self.__memory.close()
+        self.__memory.unlink()
+
+
+class SharedWorldView:
+    """
+    Read-only access to a world published by a SharedWorldPublisher, possibly from another process.
+    The arrays are updated in place by the publisher; snapshot returns consistent copies.
+    """
+
+    __memory: SharedMemory
+    __layout: _Layout
+
+    def __init__(self, name: str):
+        self.__memory = SharedMemory(name=name)
+        header = np.ndarray((4,), dtype=np.uint64, buffer=self.__memory.buf)
+        width, height, agent_count = (int(value) for value in header[1:])
+        del header
+        self.__layout = _Layout(self.__memory.buf, width, height, agent_count)
+        for array in (self.__layout.header, self.__layout.tiles, self.__layout.entities,
+                      self.__layout.agent_positions, self.__layout.agent_orientations):
+            array.flags.writeable = False
+
+    @property
+    def version(self) -> int:
+        return int(self.__layout.header[0])
+
+    @property
+    def width(self) -> int:
+        return self.__layout.tiles.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.__layout.tiles.shape[0]
+
+    @property
+    def tiles(self) -> np.ndarray:
+        return self.__layout.tiles
+
+    @property
+    def entities(self) -> np.ndarray:
+        return self.__layout.entities
+
+    @property
+    def agent_positions(self) -> np.ndarray:
+        return self.__layout.agent_positions
+
+    @property
+    def agent_orientations(self) -> np.ndarray:
+        return self.__layout.agent_orientations
+
+    def snapshot(self) -> tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the version along with copies of the tiles, entities, agent positions and orientations,
+        retrying for as long as the publisher is writing.
+        """
+        layout = self.__layout
+        version, copies = self.__read(lambda: (layout.tiles.copy(), layout.entities.copy(),
+                                               layout.agent_positions.copy(), layout.agent_orientations.copy()))
+        return (version, *copies)
+
+    def ahead(self, agent_index: int, distance: int = 1) -> Optional[tuple[int, int]]:
+        """
+        Returns the tile and entity codes of the cell at the given distance in front of an agent,
+        or None if it lies outside of the world. Like snapshot, retries for as long as the publisher is writing.
+        """
+        layout = self.__layout
+
+        def read() -> Optional[tuple[int, int]]:
+            delta = DELTAS_ARRAY[layout.agent_orientations[agent_index]] * distance
+            x, y = (int(value) for value in layout.agent_positions[agent_index] + delta)
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return None
+            return int(layout.tiles[y, x]), int(layout.entities[y, x])
+
+        return self.__read(read)[1]
+
+    def __read(self, read: Callable[[], T]) -> tuple[int, T]:
+        """
+        Calls read until it runs while the publisher is not writing, and returns the version along with its result.
+        """
+        header = self.__layout.header
+        attempt = 0
+        while True:
+            version = int(header[0])
+            if version % 2 == 0:
+                result = read()
+                if int(header[0]) == version:
+                    return version, result
+            _back_off(attempt)
+            attempt += 1
+
+    def close(self) -> None:
+        self.__layout.release()
+        self.__memory.close()
+
+    def __reduce__(self) -> Any:
+        return SharedWorldView, (self.__memory.name,)
@@ -1,49 +1,106 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional, List
 
 from pysim.simulation.agent import Agent
 from pysim.simulation.events import Event
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.step import Step
+from pysim.simulation.transitions import forward_outcome
 from pysim.simulation.world import World
 
 
 class Simulation:
     __world: World
 
-    def __init__(self, world: World) -> None:
+    # Journal length at the start of each step, None if history is not kept
+    __steps: Optional[List[int]]
+
+    def __init__(self, world: World, keep_history: bool = False) -> None:
         assert world is not None
         self.__world = world
+        if keep_history:
+            world.start_journal()
+            self.__steps = []
+        else:
+            self.__steps = None
+
+    @property
+    def world(self) -> World:
+        return self.__world
 
     def forward(self, agent_index: int) -> Event:
-        agent_position = self.__world.agent_positions[agent_index]
-        agent = self.__world[agent_position].contents
+        return self.step(agent_index).event
+
+    def step(self, agent_index: int) -> Step:
+        """
+        Same as forward, but leaves creating the event to whoever asks the returned step for it.
+        """
+        world = self.__world
+        origin = world.agent_positions[agent_index]
+        agent = world.peek(origin).contents
         assert isinstance(agent, Agent)
-        agent_destination = agent_position.move(agent.orientation)
-        destination_tile = self.__world[agent_destination]
-        if destination_tile.is_traversable():
-            entity = destination_tile.contents
-            if entity is not None:
-                if entity.is_movable():
-                    push_direction = agent.orientation
-                    entity_position = agent_destination
-                    entity_destination = agent_position.move(agent.orientation, distance=2)
-                    tile_receiving_object = self.__world[entity_destination]
-                    if tile_receiving_object.accepts_objects:
-                        destination_tile.contents = None
-                        tile_receiving_object.contents = destination_tile.contents
-                        forward_event = agent.forward(agent_position)
-                        self.__world.agent_positions[agent_index] = agent_destination
-                        move_event = entity.move(entity_position, push_direction)
-                        return forward_event.parallel_with(move_event)
-                    else:
-                        return Event.zero()
-                else:
-                    return Event.zero()
-            else:
-                self.__world.agent_positions[agent_index] = agent_destination
-                return agent.forward(agent_position)
-        else:
-            return Event.zero()
+        pushed = world.peek(origin.move(agent.orientation)).contents
+        outcome = self.advance(agent_index)
+        return Step(agent_index, outcome, agent, origin, pushed if outcome is Outcome.PUSHED else None)
+
+    def advance(self, agent_index: int) -> Outcome:
+        """
+        Applies the same rules as forward without creating any event, for runs nobody watches.
+        """
+        world = self.__world
+        if self.__steps is not None:
+            self.__steps.append(world.journal_length)
+        agent_position = world.agent_positions[agent_index]
+        agent = world.peek(agent_position).contents
+        assert isinstance(agent, Agent)
+        orientation = agent.orientation
+        agent_destination = agent_position.move(orientation)
+        entity_destination = agent_position.move(orientation, distance=2)
+        destination_tile = world.peek(agent_destination)
+        beyond_tile = world.peek(entity_destination) if world.is_inside(entity_destination) else None
+        outcome = forward_outcome(destination_tile, beyond_tile)
+        if outcome is Outcome.MOVED:
+            world.move_entity(agent_position, agent_destination)
+        elif outcome is Outcome.PUSHED:
+            world.move_entity(agent_destination, entity_destination)
+            world.move_entity(agent_position, agent_destination)
+        return outcome
+
+    def undo(self) -> None:
+        self.rewind(1)
+
+    def rewind(self, step_count: int) -> None:
+        """
+        Undoes the last step_count steps.
+        Takes time proportional to the number of changes made by these steps.
+        """
+        assert self.__steps is not None, 'simulation does not keep history'
+        assert 0 <= step_count <= len(self.__steps)
+        if step_count > 0:
+            self.__world.revert(self.__steps[-step_count])
+            del self.__steps[-step_count:]
+
+    def checkpoint(self) -> int:
+        """
+        Returns a token to be passed to restore in order to go back to the current state.
+        """
+        assert self.__steps is not None, 'simulation does not keep history'
+        return len(self.__steps)
+
+    def restore(self, checkpoint: int) -> None:
+        assert self.__steps is not None, 'simulation does not keep history'
+        assert checkpoint <= len(self.__steps), 'checkpoint has been rewound past'
+        self.rewind(len(self.__steps) - checkpoint)
+
+    @property
+    def step_count(self) -> int:
+        assert self.__steps is not None, 'simulation does not keep history'
+        return len(self.__steps)
+
+    def __deepcopy__(self, memo: Any) -> Simulation:
+        # Copies start without history
+        return Simulation(self.__world.snapshot(), keep_history=self.__steps is not None)
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Simulation):
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pysim.data import Vector
+from pysim.simulation.agent import Agent
+from pysim.simulation.entities.entity import Entity
+from pysim.simulation.events import Event
+from pysim.simulation.outcome import Outcome
+
+
+class Step:
+    """
+    Record of an agent moving forward, holding just enough to create the corresponding event.
+    The event is only created when first asked for, so that steps nobody looks at cost no event allocations.
+    """
+
+    __agent_index: int
+    __outcome: Outcome
+    __agent: Agent
+    __origin: Vector
+    __pushed: Optional[Entity]
+    __event: Optional[Event]
+
+    def __init__(self, agent_index: int, outcome: Outcome, agent: Agent, origin: Vector, pushed: Optional[Entity] = None):
+        assert (outcome is Outcome.PUSHED) == (pushed is not None)
+        self.__agent_index = agent_index
+        self.__outcome = outcome
+        self.__agent = agent
+        self.__origin = origin
+        self.__pushed = pushed
+        self.__event = None
+
+    @property
+    def agent_index(self) -> int:
+        return self.__agent_index
+
+    @property
+    def outcome(self) -> Outcome:
+        return self.__outcome
+
+    @property
+    def agent(self) -> Agent:
+        return self.__agent
+
+    @property
+    def origin(self) -> Vector:
+        return self.__origin
+
+    @property
+    def pushed(self) -> Optional[Entity]:
+        return self.__pushed
+
+    @property
+    def event(self) -> Event:
+        if self.__event is None:
+            self.__event = self.__create_event()
+        return self.__event
+
+    def __create_event(self) -> Event:
+        if self.__outcome is Outcome.MOVED:
+            return self.__agent.forward(self.__origin)
+        elif self.__outcome is Outcome.PUSHED:
+            orientation = self.__agent.orientation
+            forward_event = self.__agent.forward(self.__origin)
+            move_event = self.__pushed.move(self.__origin.move(orientation), orientation)
+            return forward_event.parallel_with(move_event)
+        else:
+            return Event.zero()
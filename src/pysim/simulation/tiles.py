@@ -90,7 +90,7 @@ class Empty(CanContainObject, Tile):
         return Rectangle(context.tile_layer, rect, color)
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Empty)
+        return isinstance(other, Empty) and self.contents == other.contents
 
     def __deepcopy__(self, memo: Any) -> Empty:
         contents = deepcopy(self.contents, memo)
@@ -126,7 +126,7 @@ class Chasm(CanContainObject, Tile):
         return Rectangle(context.tile_layer, rect, color)
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Chasm)
+        return isinstance(other, Chasm) and self.contents == other.contents
 
     def __deepcopy__(self, memo: Any) -> Chasm:
         contents = deepcopy(self.contents, memo)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from itertools import product
+from typing import Optional
+
+import numpy as np
+
+from pysim.simulation.kinds import tile_kinds, entity_kinds, NO_ENTITY
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.tiles import Tile
+
+_OUTCOMES = tuple(Outcome)
+
+
+def _outcome(destination: Tile, beyond: Optional[Tile]) -> Outcome:
+    """
+    Rules for an agent moving forward onto destination, with beyond being the tile behind it.
+    A beyond of None means the destination lies at the border of the world.
+    """
+    if not destination.is_traversable():
+        return Outcome.BLOCKED
+    entity = destination.contents
+    if entity is None:
+        return Outcome.MOVED
+    if not entity.is_movable():
+        return Outcome.BLOCKED
+    if beyond is not None and beyond.accepts_objects:
+        return Outcome.PUSHED
+    return Outcome.BLOCKED
+
+
+def _create_tile(tile_code: int, entity_code: int) -> Optional[Tile]:
+    """
+    Creates a tile of the given kind holding an entity of the given kind,
+    or returns None if no such tile can exist.
+    """
+    prototype = tile_kinds.prototype(tile_code)
+    if prototype is None:
+        return None
+    tile = deepcopy(prototype)
+    if entity_code != NO_ENTITY:
+        entity = entity_kinds.prototype(entity_code)
+        if entity is None:
+            return None
+        try:
+            tile.contents = entity
+        except NotImplementedError:
+            return None
+    return tile
+
+
+class TransitionTable:
+    """
+    Outcome of an agent moving forward, indexed by the tile and entity codes of its destination
+    and of the position beyond it. Positions outside the world use the tile code outside.
+    The table is generated by applying the rules to instances of all registered tile and entity kinds.
+    """
+
+    __outcomes: np.ndarray
+    __nested: list
+    __tile_version: int
+    __entity_version: int
+
+    def __init__(self):
+        self.__tile_version = tile_kinds.version
+        self.__entity_version = entity_kinds.version
+        tile_count = len(tile_kinds)
+        entity_count = len(entity_kinds)
+        tiles = {
+            (tile_code, entity_code): _create_tile(tile_code, entity_code)
+            for tile_code, entity_code in product(range(tile_count), range(entity_count))
+        }
+        outcomes = np.full((tile_count + 1, entity_count, tile_count + 1, entity_count), Outcome.BLOCKED, dtype=np.uint8)
+        for destination_codes, beyond_codes in product(tiles.keys(), repeat=2):
+            destination = tiles[destination_codes]
+            beyond = tiles[beyond_codes]
+            if destination is not None and beyond is not None:
+                outcomes[destination_codes + beyond_codes] = _outcome(destination, beyond)
+        for destination_codes, destination in tiles.items():
+            if destination is not None:
+                outcomes[destination_codes + (tile_count, NO_ENTITY)] = _outcome(destination, None)
+        outcomes.flags.writeable = False
+        self.__outcomes = outcomes
+        self.__nested = outcomes.tolist()
+
+    @property
+    def outside(self) -> int:
+        return self.__outcomes.shape[0] - 1
+
+    @property
+    def outcomes(self) -> np.ndarray:
+        return self.__outcomes
+
+    @property
+    def is_up_to_date(self) -> bool:
+        return self.__tile_version == tile_kinds.version and self.__entity_version == entity_kinds.version
+
+    def lookup(self, destination_tile: int, destination_entity: int, beyond_tile: int, beyond_entity: int) -> Outcome:
+        return _OUTCOMES[self.__nested[destination_tile][destination_entity][beyond_tile][beyond_entity]]
+
+
+_table: Optional[TransitionTable] = None
+
+
+def transition_table() -> TransitionTable:
+    """
+    Returns a transition table covering all tile and entity kinds registered so far.
+    """
+    global _table
+    if _table is None or not _table.is_up_to_date:
+        _table = TransitionTable()
+    return _table
+
+
+def forward_outcome(destination: Tile, beyond: Optional[Tile]) -> Outcome:
+    """
+    Looks up what happens when an agent moves onto destination, beyond being the tile
+    behind it or None if destination lies at the border of the world.
+    """
+    destination_tile = tile_kinds.code_of(destination)
+    destination_entity = entity_kinds.code_of(destination.contents)
+    if beyond is None:
+        beyond_tile = None
+        beyond_entity = NO_ENTITY
+    else:
+        beyond_tile = tile_kinds.code_of(beyond)
+        beyond_entity = entity_kinds.code_of(beyond.contents)
+    # Codes are computed first, as encountering new kinds outdates the table
+    table = transition_table()
+    if beyond_tile is None:
+        beyond_tile = table.outside
+    return table.lookup(destination_tile, destination_entity, beyond_tile, beyond_entity)
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any, List
+from typing import Any, Iterable, List, Optional
 
-from pysim.data import Grid, Vector
+from pysim.data import ChunkedGrid, Grid, Vector
+from pysim.simulation.agent import Agent
 from pysim.simulation.tiles import Tile
+from pysim.simulation.zobrist import compute_hash, move_key
 
 
 class World:
-    __grid: Grid[Tile]
+    __grid: ChunkedGrid[Tile]
 
     __agent_positions: List[Vector]
 
+    __journal: Optional[List[tuple[Vector, Vector]]]
+
+    # Zobrist hash, kept up to date by move_entity
+    __zobrist: int
+
     def __init__(self, grid: Grid[Tile], agent_locations: List[Vector]) -> None:
-        self.__grid = deepcopy(grid)
+        self.__grid = ChunkedGrid(grid.width, grid.height, lambda position: deepcopy(grid[position]))
         self.__agent_positions = deepcopy(agent_locations)
+        self.__journal = None
+        self.__zobrist = self.compute_zobrist()
 
     @property
     def width(self) -> int:
@@ -24,16 +33,116 @@ class World:
     def height(self) -> int:
         return self.__grid.height
 
+    @property
+    def positions(self) -> Iterable[Vector]:
+        return self.__grid.positions
+
     @property
     def agent_positions(self) -> List[Vector]:
         return self.__agent_positions
 
     def __getitem__(self, position: Vector) -> Tile:
+        """
+        Returns the tile at the given position.
+        The tile is owned by this world and can be modified without affecting snapshots.
+        Entities should be moved using move_entity, so that the journal and hash remain correct.
+        """
+        return self.__grid.writable(position)
+
+    def peek(self, position: Vector) -> Tile:
+        """
+        Returns the tile at the given position without taking ownership of it.
+        The tile may be shared with snapshots and must not be modified.
+        """
         return self.__grid[position]
 
+    def is_inside(self, position: Vector) -> bool:
+        return self.__grid.is_inside(position)
+
+    def move_entity(self, origin: Vector, destination: Vector) -> None:
+        """
+        Moves the entity at origin to destination, keeping track of agent positions.
+        """
+        self.__move_entity(origin, destination)
+        if self.__journal is not None:
+            self.__journal.append((origin, destination))
+
+    def start_journal(self) -> None:
+        """
+        Starts recording entity moves, so that they can be reverted.
+        """
+        if self.__journal is None:
+            self.__journal = []
+
+    @property
+    def journal_length(self) -> int:
+        assert self.__journal is not None, 'journal has not been started'
+        return len(self.__journal)
+
+    def revert(self, journal_length: int) -> None:
+        """
+        Undoes all moves recorded after the journal had the given length.
+        Takes time proportional to the number of moves undone.
+        """
+        assert self.__journal is not None, 'journal has not been started'
+        assert 0 <= journal_length <= len(self.__journal)
+        while len(self.__journal) > journal_length:
+            origin, destination = self.__journal.pop()
+            self.__move_entity(destination, origin)
+
+    def __move_entity(self, origin: Vector, destination: Vector) -> None:
+        origin_tile = self[origin]
+        destination_tile = self[destination]
+        entity = origin_tile.contents
+        assert entity is not None, f'no entity at {origin}'
+        origin_tile.contents = None
+        destination_tile.contents = entity
+        if isinstance(entity, Agent):
+            agent_index = self.__agent_positions.index(origin)
+            self.__agent_positions[agent_index] = destination
+        else:
+            agent_index = None
+        self.__zobrist ^= move_key(origin, destination, entity, agent_index)
+
+    @property
+    def zobrist(self) -> int:
+        """
+        64-bit Zobrist hash over tile kinds, entity placements and agent positions and orientations,
+        maintained incrementally as entities move.
+        """
+        return self.__zobrist
+
+    def compute_zobrist(self) -> int:
+        """
+        Computes the Zobrist hash from scratch, taking time proportional to the size of the world.
+        """
+        tiles = ((position, self.peek(position)) for position in self.positions)
+        return compute_hash(tiles, self.__agent_positions)
+
+    def snapshot(self) -> World:
+        """
+        Creates a copy of this world. The copy shares all tiles with this world
+        until either of them modifies them, so that taking a snapshot
+        costs time proportional to the number of modifications made since the previous one.
+        """
+        result = World.__new__(World)
+        result.__grid = self.__grid.snapshot()
+        result.__agent_positions = list(self.__agent_positions)
+        result.__journal = None
+        result.__zobrist = self.__zobrist
+        return result
+
+    def __hash__(self) -> int:
+        """
+        A world must not be modified while it is used as a key.
+        """
+        return self.__zobrist
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, World):
             return False
+        if self.__zobrist != other.__zobrist:
+            return False
         if self.__grid != other.__grid:
             return False
         if self.__agent_positions != other.__agent_positions:
@@ -44,5 +153,4 @@ class World:
         raise NotImplementedError()
 
     def __deepcopy__(self, memo: Any) -> World:
-        # Constructor takes care of deep copying
-        return World(self.__grid, self.__agent_positions)
+        return self.snapshot()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import Iterable, Optional
+
+from pysim.data import Vector
+from pysim.simulation.agent import Agent
+from pysim.simulation.entities import Entity
+from pysim.simulation.kinds import tile_kinds, entity_kinds
+from pysim.simulation.tiles import Tile
+
+_MASK = (1 << 64) - 1
+
+_TILE = 0
+_ENTITY = 1
+_AGENT = 2
+
+
+@cache
+def _key(category: int, position: Vector, value: int) -> int:
+    """
+    Pseudo-random 64-bit key, derived deterministically from its arguments using SplitMix64
+    so that hashes agree across processes.
+    """
+    key = category
+    for component in (position.x, position.y, value):
+        key = _mix((key << 20) ^ (component & 0xFFFFF))
+    return key
+
+
+def _mix(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def tile_key(position: Vector, tile: Tile) -> int:
+    return _key(_TILE, position, tile_kinds.code_of(tile))
+
+
+def entity_key(position: Vector, entity: Optional[Entity]) -> int:
+    if entity is None:
+        return 0
+    return _key(_ENTITY, position, entity_kinds.code_of(entity))
+
+
+def agent_key(agent_index: int, position: Vector, agent: Agent) -> int:
+    return _key(_AGENT, position, agent_index * 4 + agent.orientation)
+
+
+def move_key(origin: Vector, destination: Vector, entity: Entity, agent_index: Optional[int]) -> int:
+    """
+    Value to combine with a hash using xor to account for the entity moving from origin to destination.
+    """
+    result = entity_key(origin, entity) ^ entity_key(destination, entity)
+    if agent_index is not None:
+        assert isinstance(entity, Agent)
+        result ^= agent_key(agent_index, origin, entity) ^ agent_key(agent_index, destination, entity)
+    return result
+
+
+def compute_hash(tiles: Iterable[tuple[Vector, Tile]], agent_positions: list[Vector]) -> int:
+    """
+    Computes the hash of a world from scratch.
+    """
+    result = 0
+    agents = {}
+    for position, tile in tiles:
+        result ^= tile_key(position, tile) ^ entity_key(position, tile.contents)
+        if isinstance(tile.contents, Agent):
+            agents[position] = tile.contents
+    for agent_index, position in enumerate(agent_positions):
+        result ^= agent_key(agent_index, position, agents[position])
+    return result
@@ -0,0 +1,66 @@
+from textwrap import dedent
+
+from pytest import fixture
+
+from pysim.actors.pool import ActorPool
+from actor_tests import Environment
+
+PID = dedent('''
+import os
+say(os.getpid())
+''')
+
+ECHO = dedent('''
+message = hear()
+say(message)
+''')
+
+CHATTY = dedent('''
+say("first")
+say("second")
+''')
+
+FAILING = dedent('''
+raise ValueError("failure")
+''')
+
+
+@fixture
+def pool():
+    with ActorPool(1, max_jobs_per_worker=3) as pool:
+        yield pool
+
+
+def run_pid(pool: ActorPool) -> int:
+    actor = pool.start(PID, Environment)
+    pid = actor.receive()
+    assert actor.wait() is None
+    return pid
+
+
+def test_workers_are_reused(pool):
+    first = run_pid(pool)
+    second = run_pid(pool)
+    assert first == second
+
+
+def test_workers_are_recycled_after_max_jobs(pool):
+    pids = [run_pid(pool) for _ in range(4)]
+    assert len(set(pids[:3])) == 1
+    assert pids[3] != pids[0]
+
+
+def test_leftover_messages_do_not_reach_next_job(pool):
+    chatty = pool.start(CHATTY, Environment)
+    assert chatty.receive() == "first"
+    chatty.wait()
+    echo = pool.start(ECHO, Environment)
+    echo.send("echo")
+    assert echo.receive() == "echo"
+    assert echo.wait() is None
+
+
+def test_errors_are_reported(pool):
+    actor = pool.start(FAILING, Environment)
+    assert 'failure' in actor.wait()
+    assert run_pid(pool) > 0
@@ -0,0 +1,86 @@
+from pygame import Surface
+from pytest import mark
+
+from pysim.data import Vector
+from pysim.graphics.animator import Animator
+from pysim.graphics.layer import Layer
+from pysim.simulation.events import Event
+from pysim.simulation.levels import parse_world
+from pysim.simulation.simulation import Simulation
+
+TILE_SIZE = 32
+EMPTY = (200, 200, 200)
+AGENT = (255, 0, 0)
+BLOCK = (139, 90, 43)
+
+
+def render(layers, animation, time: float, world) -> Surface:
+    surface = Surface((world.width * TILE_SIZE, world.height * TILE_SIZE))
+    primitive = animation[time]
+    for layer in layers:
+        primitive.render(surface, layer)
+    return surface
+
+
+def color_at(surface: Surface, x: float, y: float):
+    return tuple(surface.get_at((int(x * TILE_SIZE + TILE_SIZE / 2), int(y * TILE_SIZE + TILE_SIZE / 2))))[:3]
+
+
+def create_animator():
+    layers = (Layer(), Layer())
+    return Animator(*layers), layers
+
+
+@mark.parametrize('rows, expected', [
+    (['>..'], [AGENT, EMPTY, EMPTY]),
+    (['>B.'], [AGENT, BLOCK, EMPTY]),
+])
+def test_still(rows, expected):
+    animator, layers = create_animator()
+    world = parse_world(rows)
+    animation = animator.animate(world, Event.zero())
+    surface = render(layers, animation, 0, world)
+    assert [color_at(surface, x, 0) for x in range(world.width)] == expected
+
+
+@mark.parametrize('rows, time, expected', [
+    (['>..'], 0, [AGENT, EMPTY, EMPTY]),
+    (['>..'], 5, [EMPTY, EMPTY, EMPTY]),
+    (['>B.'], 0, [AGENT, BLOCK, EMPTY]),
+    (['>B.'], 9.9, [EMPTY, AGENT, BLOCK]),
+])
+def test_forward(rows, time, expected):
+    animator, layers = create_animator()
+    simulation = Simulation(parse_world(rows))
+    animator.animate(simulation.world, Event.zero())
+    event = simulation.forward(0)
+    animation = animator.animate(simulation.world, event)
+    surface = render(layers, animation, time, simulation.world)
+    assert [color_at(surface, x, 0) for x in range(simulation.world.width)] == expected
+
+
+def test_moving_agent_is_drawn_between_cells():
+    animator, layers = create_animator()
+    simulation = Simulation(parse_world(['>..']))
+    animation = animator.animate(simulation.world, simulation.forward(0))
+    surface = render(layers, animation, 5, simulation.world)
+    assert color_at(surface, 0.5, 0) == AGENT
+
+
+def test_entities_come_to_rest():
+    animator, layers = create_animator()
+    simulation = Simulation(parse_world(['>B..']))
+    animator.animate(simulation.world, simulation.forward(0))
+    animator.animate(simulation.world, simulation.forward(0))
+    animation = animator.animate(simulation.world, Event.zero())
+    surface = render(layers, animation, 0, simulation.world)
+    assert [color_at(surface, x, 0) for x in range(4)] == [EMPTY, EMPTY, AGENT, BLOCK]
+
+
+def test_motions():
+    simulation = Simulation(parse_world(['>B.', '>..']))
+    event = simulation.forward(0)
+    assert [(motion.origin, motion.destination) for motion in event.motions] == [
+        (Vector(0, 0), Vector(1, 0)),
+        (Vector(1, 0), Vector(2, 0)),
+    ]
@@ -0,0 +1,96 @@
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+import pysim.simulation.tiles as tiles
+from pysim.data import ArrayGrid, Grid, Vector
+from pysim.simulation.entities import Block
+from pysim.simulation.kinds import encode_grid, decode_grid, entity_codes, EMPTY, WALL, CHASM, NO_ENTITY, \
+    entity_kinds
+
+
+@pytest.mark.parametrize("width, height", [(w, h) for w in [1, 2, 3, 7, 10] for h in [1, 2, 3, 7, 10]])
+def test_size(width, height):
+    grid = ArrayGrid(width, height)
+    assert grid.width == width
+    assert grid.height == height
+
+
+@pytest.mark.parametrize("width, height", [(w, h) for w in [1, 2, 3, 7, 10] for h in [1, 2, 3, 7, 10]])
+def test_set_and_get(width, height):
+    grid = ArrayGrid(width, height)
+    for position in grid.positions:
+        grid[position] = position.x + position.y * width
+    for y in range(height):
+        for x in range(width):
+            assert grid[Vector(x, y)] == (x + y * width) % 256
+
+
+@pytest.mark.parametrize("position, expected", [
+    (Vector(0, 0), True),
+    (Vector(2, 1), True),
+    (Vector(3, 1), False),
+    (Vector(2, 2), False),
+    (Vector(-1, 0), False),
+    (Vector(0, -1), False),
+])
+def test_is_inside(position, expected):
+    grid = ArrayGrid(3, 2)
+    assert grid.is_inside(position) == expected
+
+
+def test_bulk_views():
+    codes = np.array([[0, 1, 2], [1, 1, 0]], dtype=np.uint8)
+    grid = ArrayGrid.from_array(codes)
+    assert list(grid.row(1)) == [1, 1, 0]
+    assert list(grid.column(2)) == [2, 0]
+    assert grid.region(1, 0, 2, 2).tolist() == [[1, 2], [1, 0]]
+    assert grid.mask(1).tolist() == [[False, True, False], [True, True, False]]
+    assert set(grid.positions_of(1)) == {Vector(1, 0), Vector(0, 1), Vector(1, 1)}
+
+
+def test_views_are_read_only():
+    grid = ArrayGrid(3, 3)
+    with pytest.raises(ValueError):
+        grid.row(0)[0] = 1
+    with pytest.raises(ValueError):
+        grid.codes[0, 0] = 1
+
+
+def test_contents():
+    grid = ArrayGrid[str](3, 3)
+    grid.set_contents(Vector(1, 2), 'x')
+    assert grid.contents(Vector(1, 2)) == 'x'
+    assert grid.contents(Vector(2, 1)) is None
+    assert list(grid.occupied_positions) == [Vector(1, 2)]
+    grid.set_contents(Vector(1, 2), None)
+    assert list(grid.occupied_positions) == []
+
+
+def test_copies_are_independent():
+    grid = ArrayGrid[str](2, 2)
+    grid.set_contents(Vector(0, 0), 'x')
+    copy = deepcopy(grid)
+    assert copy == grid
+    copy[Vector(1, 1)] = 3
+    copy.set_contents(Vector(0, 0), None)
+    assert grid[Vector(1, 1)] == 0
+    assert grid.contents(Vector(0, 0)) == 'x'
+    assert copy != grid
+
+
+def test_encoding_round_trip():
+    tile_factories = [tiles.Empty, tiles.Wall, tiles.Chasm, lambda: tiles.Empty(Block())]
+    grid = Grid[tiles.Tile](4, 3, lambda p: tile_factories[(p.x + p.y) % len(tile_factories)]())
+    encoded = encode_grid(grid)
+    assert encoded[Vector(0, 0)] == EMPTY
+    assert encoded[Vector(1, 0)] == WALL
+    assert encoded[Vector(2, 0)] == CHASM
+    assert isinstance(encoded.contents(Vector(3, 0)), Block)
+    assert entity_codes(encoded)[0, 3] == entity_kinds.code_of(Block())
+    assert entity_codes(encoded)[0, 0] == NO_ENTITY
+    decoded = decode_grid(encoded)
+    assert decoded == grid
+    for position in grid.positions:
+        assert type(decoded[position].contents) is type(grid[position].contents)
@@ -0,0 +1,83 @@
+import asyncio
+import signal
+from textwrap import dedent
+
+from pysim.actors.asynchronous import AsyncActor
+from actor_tests import Environment
+
+
+def test_receive():
+    async def main():
+        actor = AsyncActor[str]('say("hello")', Environment)
+        assert await actor.receive() == 'hello'
+        assert await actor.wait() == 0
+
+    asyncio.run(main())
+
+
+def test_async_iteration_ends_with_actor():
+    source = dedent('''
+    for i in range(3):
+        say(str(i))
+    ''')
+
+    async def main():
+        actor = AsyncActor[str](source, Environment)
+        return [message async for message in actor]
+
+    assert asyncio.run(main()) == ['0', '1', '2']
+
+
+def test_many_actors_are_multiplexed():
+    source = dedent('''
+    message = hear()
+    say(message + "!")
+    ''')
+
+    async def converse(index: int) -> str:
+        actor = AsyncActor[str](source, Environment)
+        actor.send(str(index))
+        return await actor.receive()
+
+    async def main():
+        ticks = 0
+
+        async def render_loop():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        renderer = asyncio.create_task(render_loop())
+        replies = await asyncio.gather(*(converse(index) for index in range(8)))
+        renderer.cancel()
+        return replies, ticks
+
+    replies, ticks = asyncio.run(main())
+    assert replies == [f'{index}!' for index in range(8)]
+    assert ticks > 0
+
+
+def test_large_messages_are_received():
+    source = dedent('''
+    say("x" * 10 ** 7)
+    ''')
+
+    async def main():
+        actor = AsyncActor[str](source, Environment)
+        message = await actor.receive()
+        actor.close()
+        return message
+
+    assert asyncio.run(main()) == 'x' * 10 ** 7
+
+
+def test_kill():
+    async def main():
+        actor = AsyncActor[str]('while True: pass', Environment)
+        actor.kill()
+        exit_code = await actor.wait()
+        actor.close()
+        return exit_code
+
+    assert asyncio.run(main()) == -signal.SIGKILL
@@ -0,0 +1,70 @@
+from random import Random
+
+import numpy as np
+from pytest import mark
+
+from pysim.simulation.batch import BatchSimulation, NO_ACTION
+from pysim.simulation.kinds import encode_world, entity_codes
+from pysim.simulation.levels import parse_world, format_world
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.simulation import Simulation
+
+LEVELS = [
+    [
+        'WWWWWW',
+        'W>B.CW',
+        'W.B..W',
+        'W^..<W',
+        'WWWWWW',
+    ],
+    [
+        'WWWWWWW',
+        'W>.B.CW',
+        'WBBv..W',
+        'W..B.BW',
+        'WC.^..W',
+        'WWWWWWW',
+    ],
+]
+
+
+def assert_same_world(simulation, batch, index):
+    expected = encode_world(simulation.world)
+    actual = encode_world(batch.world(index))
+    assert np.array_equal(expected.codes, actual.codes)
+    assert np.array_equal(entity_codes(expected), entity_codes(actual))
+    assert np.array_equal(batch.entities[index], entity_codes(expected))
+    assert simulation.world.agent_positions == batch.world(index).agent_positions
+
+
+@mark.parametrize('rows, expected', [
+    (['>.'], Outcome.MOVED),
+    (['>W'], Outcome.BLOCKED),
+    (['>B.'], Outcome.PUSHED),
+    (['>BC'], Outcome.PUSHED),
+    (['>BW'], Outcome.BLOCKED),
+    (['>BB.'], Outcome.BLOCKED),
+    (['>C'], Outcome.MOVED),
+])
+def test_outcomes(rows, expected):
+    batch = BatchSimulation.replicate(parse_world(rows), 3)
+    outcomes = batch.forward(np.array([0, NO_ACTION, 0]))
+    assert list(outcomes) == [expected, Outcome.BLOCKED, expected]
+
+
+@mark.parametrize('level', LEVELS)
+def test_agrees_with_simulation(level):
+    world_count = 8
+    rnd = Random(42)
+    batch = BatchSimulation.replicate(parse_world(level), world_count)
+    simulations = [Simulation(parse_world(level)) for _ in range(world_count)]
+    agent_count = len(simulations[0].world.agent_positions)
+    for _ in range(6):
+        actions = np.array([rnd.randrange(-1, agent_count) for _ in range(world_count)])
+        batch.forward(actions)
+        for simulation, action in zip(simulations, actions):
+            if action != NO_ACTION:
+                simulation.forward(int(action))
+    for index, simulation in enumerate(simulations):
+        assert_same_world(simulation, batch, index)
+        assert format_world(batch.world(index)) == format_world(simulation.world)
@@ -0,0 +1,61 @@
+import pytest
+
+from pysim.data import ChunkedGrid, Vector
+
+
+class Box:
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Box) and self.value == other.value
+
+
+@pytest.mark.parametrize("width, height, chunk_size", [(w, h, c) for w in [1, 3, 10] for h in [1, 4, 9] for c in [1, 3, 8]])
+def test_initialization(width, height, chunk_size):
+    grid = ChunkedGrid(width, height, lambda p: p.x + p.y * width, chunk_size=chunk_size)
+    assert grid.width == width
+    assert grid.height == height
+    for y in range(height):
+        for x in range(width):
+            assert grid[Vector(x, y)] == x + y * width
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 8])
+def test_snapshot_is_unaffected_by_writes(chunk_size):
+    grid = ChunkedGrid(5, 5, lambda p: Box(p.x), chunk_size=chunk_size)
+    snapshot = grid.snapshot()
+    grid[Vector(1, 1)] = Box(-1)
+    grid.writable(Vector(4, 3)).value = -2
+    assert snapshot[Vector(1, 1)] == Box(1)
+    assert snapshot[Vector(4, 3)] == Box(4)
+    assert grid[Vector(1, 1)] == Box(-1)
+    assert grid[Vector(4, 3)] == Box(-2)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 8])
+def test_original_is_unaffected_by_writes_to_snapshot(chunk_size):
+    grid = ChunkedGrid(5, 5, lambda p: Box(p.y), chunk_size=chunk_size)
+    snapshot = grid.snapshot()
+    snapshot.writable(Vector(2, 3)).value = 7
+    assert grid[Vector(2, 3)] == Box(3)
+    assert snapshot[Vector(2, 3)] == Box(7)
+
+
+def test_untouched_chunks_are_shared():
+    grid = ChunkedGrid(16, 16, lambda p: Box(0), chunk_size=8)
+    snapshot = grid.snapshot()
+    grid.writable(Vector(0, 0)).value = 1
+    assert grid[Vector(15, 15)] is snapshot[Vector(15, 15)]
+    assert grid[Vector(0, 0)] is not snapshot[Vector(0, 0)]
+
+
+def test_equality():
+    grid = ChunkedGrid(4, 4, lambda p: Box(p.x), chunk_size=2)
+    snapshot = grid.snapshot()
+    assert grid == snapshot
+    grid.writable(Vector(3, 3)).value = 0
+    assert grid != snapshot
+    grid.writable(Vector(3, 3)).value = 3
+    assert grid == snapshot
+    assert grid == ChunkedGrid(4, 4, lambda p: Box(p.x), chunk_size=3)
@@ -0,0 +1,74 @@
+import marshal
+from textwrap import dedent
+
+from pytest import mark, raises
+
+from pysim.actors.actor import Actor
+from pysim.actors.code_cache import CodeCache
+from actor_tests import Environment
+
+SOURCE = dedent('''
+x = 1
+say(str(x + 1))
+''')
+
+
+def test_code_is_compiled_once(tmp_path):
+    cache = CodeCache(tmp_path)
+    assert cache.compile(SOURCE) is cache.compile(SOURCE)
+    assert len(list(tmp_path.glob('*.code'))) == 1
+
+
+def test_code_is_loaded_from_disk(tmp_path):
+    CodeCache(tmp_path).compile(SOURCE)
+    path, = tmp_path.glob('*.code')
+    marker = compile('result = "from disk"', '<actor>', 'exec')
+    path.write_bytes(marshal.dumps(marker))
+    mapping = {}
+    exec(CodeCache(tmp_path).compile(SOURCE), mapping)
+    assert mapping['result'] == 'from disk'
+
+
+@mark.parametrize('data', [
+    b'garbage',
+    marshal.dumps('not code'),
+    marshal.dumps([1, 2, 3]),
+])
+def test_corrupt_entries_are_recompiled(tmp_path, data):
+    CodeCache(tmp_path).compile(SOURCE)
+    path, = tmp_path.glob('*.code')
+    path.write_bytes(data)
+    mapping = {'say': lambda message: mapping.update(said=message)}
+    exec(CodeCache(tmp_path).compile(SOURCE), mapping)
+    assert mapping['said'] == '2'
+
+
+def test_memory_only_cache_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = CodeCache()
+    cache.compile(SOURCE)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_syntax_errors_are_raised():
+    with raises(SyntaxError):
+        CodeCache().compile('say(')
+
+
+@mark.parametrize('source, allow_imports, problem_count', [
+    (SOURCE, False, 0),
+    ('import os', False, 1),
+    ('import os', True, 0),
+    ('from os import path\nx = ().__class__', False, 2),
+    ('say(', False, 1),
+])
+def test_validate(tmp_path, source, allow_imports, problem_count):
+    problems = CodeCache(tmp_path).validate(source, allow_imports)
+    assert len(problems) == problem_count
+    assert CodeCache(tmp_path).validate(source, allow_imports) == problems
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+
+def test_actor_with_code_cache(tmp_path):
+    actor = Actor[str](SOURCE, Environment, code_cache=CodeCache(tmp_path))
+    assert actor.receive() == '2'
@@ -0,0 +1,179 @@
+from textwrap import dedent
+from typing import List
+
+from pytest import mark, raises
+
+from pysim.actors.cooperative import CooperativeScheduler, compile_cooperative
+from pysim.actors.environment import export
+from pysim.simulation.levels import parse_world, format_world
+from pysim.simulation.simulation import Simulation
+
+
+class Recorder:
+    name: str
+    log: List[str]
+
+    def __init__(self, name: str, log: List[str]):
+        self.name = name
+        self.log = log
+
+    @export
+    def act(self, value: int = 0) -> int:
+        self.log.append(f'{self.name}{value}')
+        return value * 2
+
+    @export
+    def fail(self) -> None:
+        raise ValueError('failed')
+
+
+class Driver:
+    simulation: Simulation
+    agent_index: int
+
+    def __init__(self, simulation: Simulation, agent_index: int):
+        self.simulation = simulation
+        self.agent_index = agent_index
+
+    @export
+    def forward(self) -> None:
+        self.simulation.advance(self.agent_index)
+
+
+def test_calls_are_interleaved_fairly():
+    log = []
+    scheduler = CooperativeScheduler()
+    scheduler.spawn('act(1)\nact(2)\nact(3)', Recorder('a', log))
+    scheduler.spawn('act(1)', Recorder('b', log))
+    scheduler.spawn('for i in range(2):\n    act(i)', Recorder('c', log))
+    scheduler.run()
+    assert log == ['a1', 'b1', 'c0', 'a2', 'c1', 'a3']
+    assert scheduler.finished
+
+
+def test_results_are_passed_back():
+    log = []
+    scheduler = CooperativeScheduler()
+    scheduler.spawn('x = act(act(3))\nact(x + 1)', Recorder('a', log))
+    scheduler.run()
+    assert log == ['a3', 'a6', 'a13']
+
+
+def test_functions_calling_exported_functions():
+    source = dedent('''
+    total = 0
+
+    def twice(value):
+        global total
+        total += act(value)
+        return act(value)
+
+    def helper():
+        return twice(1) + twice(2)
+
+    result = helper()
+    act(result + total)
+    ''')
+    log = []
+    scheduler = CooperativeScheduler()
+    scheduler.spawn(source, Recorder('a', log))
+    scheduler.run()
+    assert log == ['a1', 'a1', 'a2', 'a2', 'a12']
+
+
+def test_exceptions_are_raised_in_program():
+    source = dedent('''
+    try:
+        fail()
+    except ValueError:
+        act(1)
+    fail()
+    act(2)
+    ''')
+    log = []
+    scheduler = CooperativeScheduler()
+    actor = scheduler.spawn(source, Recorder('a', log))
+    scheduler.run()
+    assert log == ['a1']
+    assert isinstance(actor.error, ValueError)
+    assert actor.call_count == 3
+
+
+def test_program_without_calls():
+    scheduler = CooperativeScheduler()
+    actor = scheduler.spawn('x = 1', Recorder('a', []))
+    assert not actor.step()
+    assert actor.finished and actor.error is None
+
+
+def test_max_rounds():
+    log = []
+    scheduler = CooperativeScheduler()
+    scheduler.spawn('while True:\n    act()', Recorder('a', log))
+    scheduler.run(max_rounds=10)
+    assert len(log) == 10
+    assert not scheduler.finished
+
+
+def test_calls_in_comprehensions_are_rejected():
+    with raises(SyntaxError):
+        compile_cooperative('[act(i) for i in range(3)]', {'act'})
+
+
+@mark.parametrize('source', [
+    """
+    class Bot:
+        def go(self):
+            act(1)
+    Bot().go()
+    """,
+    """
+    class Bot:
+        def go(self):
+            def step():
+                act(1)
+            step()
+    """,
+    """
+    def f():
+        act(1)
+    g = f
+    g()
+    """,
+    """
+    g = act
+    g(1)
+    """,
+    """
+    def f():
+        act(1)
+    list(map(lambda _: f(), [0]))
+    """,
+])
+def test_indirect_calls_are_rejected(source):
+    with raises(SyntaxError):
+        compile_cooperative(dedent(source), {'act'})
+
+
+@mark.parametrize('source, expected', [
+    ('def f(x):\n    return x\nact(f(1))', ['a1']),
+    ('class Bot:\n    def value(self):\n        return 3\nact(Bot().value())', ['a3']),
+    ('def f():\n    act(2)\ndef g():\n    f()\ng()', ['a2']),
+])
+def test_direct_calls_are_accepted(source, expected):
+    log = []
+    scheduler = CooperativeScheduler()
+    actor = scheduler.spawn(source, Recorder('a', log))
+    scheduler.run()
+    assert actor.error is None
+    assert log == expected
+
+
+def test_many_agents_share_a_world():
+    rows = ['>...' for _ in range(200)]
+    simulation = Simulation(parse_world(rows))
+    scheduler = CooperativeScheduler()
+    for agent_index in range(len(rows)):
+        scheduler.spawn('forward()\nforward()', Driver(simulation, agent_index))
+    scheduler.run()
+    assert format_world(simulation.world) == ['..>.' for _ in rows]
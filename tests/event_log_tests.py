@@ -0,0 +1,71 @@
+from io import BytesIO
+
+from pytest import mark, raises
+
+from pysim.simulation.event_log import EventLogWriter, EventLogReader, EventLogError
+from pysim.simulation.levels import parse_world, format_world
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.simulation import Simulation
+
+ROWS = [
+    'v.....',
+    'B.<B..',
+    '......',
+]
+
+ACTIONS = [0, 1, 1, 0, 1, 1, 0, 0]
+
+
+def record(rows, actions, buffer_size=4096) -> BytesIO:
+    file = BytesIO()
+    writer = EventLogWriter(file, buffer_size=buffer_size)
+    simulation = Simulation(parse_world(rows))
+    for agent_index in actions:
+        writer.append(simulation.step(agent_index))
+    writer.flush()
+    file.seek(0)
+    return file
+
+
+@mark.parametrize('buffer_size', [1, 3, 4096])
+@mark.parametrize('chunk_size', [1, 2, 8, 4096])
+def test_records_round_trip(buffer_size, chunk_size):
+    file = record(ROWS, ACTIONS, buffer_size)
+    records = list(EventLogReader(file, chunk_size=chunk_size))
+    assert [r.agent_index for r in records] == ACTIONS
+    assert records[0].outcome is Outcome.PUSHED
+    assert records[1].outcome is Outcome.MOVED
+
+
+def test_writer_buffers_records():
+    file = BytesIO()
+    writer = EventLogWriter(file, buffer_size=4)
+    header_size = len(file.getvalue())
+    simulation = Simulation(parse_world(['>.......']))
+    for _ in range(3):
+        writer.append(simulation.step(0))
+    assert len(file.getvalue()) == header_size
+    writer.append(simulation.step(0))
+    assert len(file.getvalue()) > header_size
+    assert writer.record_count == 4
+
+
+def test_replay_recreates_run():
+    original = Simulation(parse_world(ROWS))
+    expected_events = [type(original.forward(agent_index)) for agent_index in ACTIONS]
+    replayed = Simulation(parse_world(ROWS))
+    steps = EventLogReader(record(ROWS, ACTIONS)).replay(replayed)
+    assert [type(step.event) for step in steps] == expected_events
+    assert format_world(replayed.world) == format_world(original.world)
+
+
+def test_replay_detects_divergence():
+    steps = EventLogReader(record(ROWS, ACTIONS)).replay(Simulation(parse_world(['>.....', '......', '<.....'])))
+    with raises(EventLogError):
+        list(steps)
+
+
+@mark.parametrize('contents', [b'', b'XXXX\x01\x08', b'PSEL\x01\x08\x00\x00'])
+def test_reader_rejects_invalid_files(contents):
+    with raises(EventLogError):
+        list(EventLogReader(BytesIO(contents)))
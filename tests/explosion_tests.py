@@ -0,0 +1,61 @@
+from pygame import Surface, Vector2
+from pytest import mark
+
+from pysim.graphics.animations.explosion import Explosion
+from pysim.graphics.layer import Layer
+
+
+def render(explosion: Explosion, layer: Layer, time: float) -> Surface:
+    surface = Surface((400, 400))
+    explosion[time].render(surface, layer)
+    return surface
+
+
+def pixels(surface: Surface):
+    return bytes(surface.get_buffer())
+
+
+@mark.parametrize('duration', [0.5, 1, 3])
+def test_duration(duration):
+    assert Explosion(Layer(), 10, Vector2(200, 200), duration, 0).duration == duration
+
+
+@mark.parametrize('seed', [0, 1, 12345])
+def test_same_seed_gives_same_explosion(seed):
+    layer = Layer()
+    first = Explosion(layer, 20, Vector2(200, 200), 1, seed)
+    second = Explosion(layer, 20, Vector2(200, 200), 1, seed)
+    for time in [0, 0.3, 0.9]:
+        assert pixels(render(first, layer, time)) == pixels(render(second, layer, time))
+
+
+def test_different_seeds_give_different_explosions():
+    layer = Layer()
+    first = Explosion(layer, 20, Vector2(200, 200), 1, 0)
+    second = Explosion(layer, 20, Vector2(200, 200), 1, 1)
+    assert pixels(render(first, layer, 0.5)) != pixels(render(second, layer, 0.5))
+
+
+@mark.parametrize('time', [0, 0.5, 0.99])
+def test_particles_stay_near_their_path(time):
+    layer = Layer()
+    surface = render(Explosion(layer, 50, Vector2(200, 200), 1, 0), layer, time)
+    for x in range(400):
+        for y in range(0, 400, 7):
+            r, g, b, _ = surface.get_at((x, y))
+            if (r, g, b) != (0, 0, 0):
+                assert r >= 220 and g <= 200 and b == 0
+                assert Vector2(x, y).distance_to((200, 200)) <= 100 * time + 24
+
+
+def test_explosion_starts_at_its_position():
+    layer = Layer()
+    surface = render(Explosion(layer, 5, Vector2(100, 300), 1, 0), layer, 0)
+    r, g, b, _ = surface.get_at((100, 300))
+    assert r >= 220 and b == 0
+
+
+def test_particles_are_drawn_on_their_layer_only():
+    layer = Layer()
+    surface = render(Explosion(layer, 20, Vector2(200, 200), 1, 0), Layer(), 0)
+    assert surface.get_at((200, 200)) == (0, 0, 0, 255)
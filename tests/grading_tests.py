@@ -0,0 +1,116 @@
+import json
+from io import StringIO
+from textwrap import dedent
+
+from pytest import mark
+
+from pysim.actors.code_cache import CodeCache
+from pysim.grading import Job, run_job, create_jobs, grade, FINISHED, STEP_LIMIT, TIME_LIMIT, ERROR, INVALID
+
+LEVEL = ['>B..']
+TARGETS = [(3, 0)]
+
+PUSHER = dedent('''
+while forward():
+    pass
+''')
+
+SLACKER = dedent('''
+forward()
+''')
+
+LOOPER = dedent('''
+while True:
+    try:
+        forward()
+    except Exception:
+        pass
+''')
+
+SPINNER = dedent('''
+while True:
+    pass
+''')
+
+BROKEN = dedent('''
+forward(5)
+''')
+
+
+@mark.parametrize('source, status, steps, solved', [
+    (PUSHER, FINISHED, 3, True),
+    (SLACKER, FINISHED, 1, False),
+    (LOOPER, STEP_LIMIT, 20, True),
+    (SPINNER, TIME_LIMIT, 0, False),
+    (BROKEN, ERROR, 1, False),
+])
+def test_run_job(source, status, steps, solved):
+    result = run_job(Job('program', source, 'level', LEVEL, TARGETS, max_steps=20, time_limit=0.2))
+    assert result['status'] == status
+    assert result['steps'] == steps
+    assert result['solved'] == solved
+
+
+def test_grade_streams_json_lines():
+    programs = {'pusher': PUSHER, 'slacker': SLACKER, 'spinner': SPINNER}
+    levels = {'short': (LEVEL, TARGETS), 'long': (['>B....'], [(5, 0)])}
+    output = StringIO()
+    count = grade(create_jobs(programs, levels, max_steps=100, time_limit=0.2), output, processes=2)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert count == len(results) == 6
+    solved = {(result['program'], result['level']) for result in results if result['solved']}
+    assert solved == {('pusher', 'short'), ('pusher', 'long')}
+
+
+def test_invalid_programs_are_not_run(tmp_path):
+    programs = {'pusher': PUSHER, 'importer': 'import os\n' + PUSHER}
+    output = StringIO()
+    grade(create_jobs(programs, {'short': (LEVEL, TARGETS)}), output, processes=2,
+          code_cache=CodeCache(tmp_path), validate=True)
+    statuses = {result['program']: result['status'] for result in map(json.loads, output.getvalue().splitlines())}
+    assert statuses == {'pusher': FINISHED, 'importer': INVALID}
+
+
+def grade_programs(programs: dict[str, str], **kwargs) -> dict[str, dict]:
+    output = StringIO()
+    count = grade(create_jobs(programs, {'short': (LEVEL, TARGETS)}, time_limit=0.2), output, **kwargs)
+    results = {result['program']: result for result in map(json.loads, output.getvalue().splitlines())}
+    assert count == len(results) == len(programs)
+    return results
+
+
+def test_exiting_programs_do_not_stop_grading():
+    results = grade_programs({'exiter': 'import os\nos._exit(0)\n', 'pusher': PUSHER}, processes=1)
+    assert results['exiter']['status'] == ERROR
+    assert results['pusher']['status'] == FINISHED
+
+
+def test_programs_are_killed_after_the_grace_period():
+    ignorer = 'import signal\nsignal.signal(signal.SIGALRM, signal.SIG_IGN)\n' + SPINNER
+    results = grade_programs({'ignorer': ignorer, 'pusher': PUSHER}, processes=2, grace_seconds=0.2)
+    assert results['ignorer']['status'] == TIME_LIMIT
+    assert results['pusher']['status'] == FINISHED
+
+
+def test_programs_do_not_share_state():
+    polluter = 'from pysim.simulation.simulation import Simulation\nSimulation.advance = lambda *args: 0\n'
+    results = grade_programs({'polluter': polluter, 'pusher': PUSHER}, processes=1, max_jobs_per_worker=1)
+    assert results['pusher']['status'] == FINISHED
+    assert results['pusher']['solved']
+
+
+@mark.parametrize('max_jobs_per_worker, status', [
+    (None, ERROR),
+    (1, FINISHED),
+])
+def test_workers_are_reused(max_jobs_per_worker, status):
+    marker = 'import sys\nsys.graded = True\n'
+    checker = 'import sys\nassert not hasattr(sys, "graded")\n'
+    results = grade_programs({'marker': marker, 'checker': checker}, processes=1, max_jobs_per_worker=max_jobs_per_worker)
+    assert results['checker']['status'] == status
+
+
+def test_programs_get_fresh_globals():
+    results = grade_programs({'setter': 'leaked = 1\n', 'getter': 'leaked\n'}, processes=1, max_jobs_per_worker=None)
+    assert results['getter']['status'] == ERROR
+    assert 'NameError' in results['getter']['error']
@@ -0,0 +1,38 @@
+import numpy as np
+from pytest import mark
+
+from pysim.data import Vector
+from pysim.data.orientation import NORTH, EAST, SOUTH, WEST, Orientation, DELTAS_ARRAY, TURN_LEFT_ARRAY, \
+    TURN_RIGHT_ARRAY, TURN_AROUND_ARRAY, ANGLES_ARRAY
+
+ORIENTATIONS = [NORTH, EAST, SOUTH, WEST]
+
+
+@mark.parametrize('orientation', ORIENTATIONS)
+def test_left_right_is_id(orientation):
+    assert orientation.turn_left().turn_right() is orientation
+
+
+@mark.parametrize('orientation', ORIENTATIONS)
+def test_around_is_twice_left(orientation):
+    assert orientation.turn_around() is orientation.turn_left().turn_left()
+
+
+@mark.parametrize('orientation', ORIENTATIONS)
+def test_turn_right_rotates_clockwise(orientation):
+    expected = Vector.from_orientation(orientation).rotate_clockwise()
+    assert Vector.from_orientation(orientation.turn_right()) == expected
+
+
+@mark.parametrize('orientation', ORIENTATIONS)
+def test_from_code(orientation):
+    assert Orientation.from_code(int(orientation)) is orientation
+
+
+def test_vectorized_tables_agree_with_scalar_operations():
+    codes = np.array(ORIENTATIONS, dtype=np.uint8)
+    assert [tuple(delta) for delta in DELTAS_ARRAY[codes]] == [tuple(Vector.from_orientation(o)) for o in ORIENTATIONS]
+    assert list(TURN_LEFT_ARRAY[codes]) == [o.turn_left() for o in ORIENTATIONS]
+    assert list(TURN_RIGHT_ARRAY[codes]) == [o.turn_right() for o in ORIENTATIONS]
+    assert list(TURN_AROUND_ARRAY[codes]) == [o.turn_around() for o in ORIENTATIONS]
+    assert list(ANGLES_ARRAY[codes]) == [o.angle for o in ORIENTATIONS]
@@ -0,0 +1,57 @@
+from pytest import mark
+
+from pysim.simulation.levels import parse_world
+from pysim.simulation.recording import Recording
+from pysim.simulation.simulation import Simulation
+
+ROWS = [
+    'v.......',
+    '........',
+    'B..<B...',
+    '........',
+    '......^.',
+]
+
+ACTIONS = [0, 1, 0, 1, 1, 2, 0, 2, 1, 0, 2, 0, 2]
+
+
+def expected_states(rows, actions):
+    simulation = Simulation(parse_world(rows))
+    states = [simulation.world.snapshot()]
+    for agent_index in actions:
+        simulation.advance(agent_index)
+        states.append(simulation.world.snapshot())
+    return states
+
+
+@mark.parametrize('checkpoint_interval', [1, 2, 5, 1024])
+def test_world_at_every_step(checkpoint_interval):
+    recording = Recording(parse_world(ROWS), checkpoint_interval)
+    for agent_index in ACTIONS:
+        recording.advance(agent_index)
+    states = expected_states(ROWS, ACTIONS)
+    for step_index in reversed(range(len(ACTIONS) + 1)):
+        world = recording.world_at(step_index)
+        assert world == states[step_index]
+        assert world.agent_positions == states[step_index].agent_positions
+
+
+def test_world_at_is_independent_of_recording():
+    recording = Recording(parse_world(ROWS), checkpoint_interval=2)
+    for agent_index in ACTIONS[:4]:
+        recording.step(agent_index)
+    world = recording.world_at(2)
+    Simulation(world).advance(0)
+    for agent_index in ACTIONS[4:]:
+        recording.advance(agent_index)
+    states = expected_states(ROWS, ACTIONS)
+    assert recording.world_at(2) == states[2]
+    assert recording.world == states[-1]
+
+
+def test_replay_yields_remaining_steps():
+    recording = Recording(parse_world(ROWS), checkpoint_interval=3)
+    outcomes = [recording.advance(agent_index) for agent_index in ACTIONS]
+    steps = list(recording.replay(4))
+    assert [step.agent_index for step in steps] == ACTIONS[4:]
+    assert [step.outcome for step in steps] == outcomes[4:]
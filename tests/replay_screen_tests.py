@@ -0,0 +1,83 @@
+from pygame import Surface
+from pytest import mark
+
+from pysim.graphics.animator import Animator
+from pysim.graphics.layer import Layer
+from pysim.gui.replay_screen import ReplayScreen
+from pysim.simulation.events import Event
+from pysim.simulation.levels import parse_world
+from pysim.simulation.recording import Recording
+
+TILE_SIZE = 32
+
+ROWS = [
+    '>..B.',
+    '.....',
+    '^B...',
+]
+
+ACTIONS = [0, 1, 0, 0, 1, 0]
+
+
+def create_recording() -> Recording:
+    recording = Recording(parse_world(ROWS), checkpoint_interval=2)
+    for agent_index in ACTIONS:
+        recording.advance(agent_index)
+    return recording
+
+
+def pixels(surface: Surface):
+    return bytes(surface.get_buffer())
+
+
+def render_screen(screen: ReplayScreen, world) -> Surface:
+    surface = Surface((world.width * TILE_SIZE, world.height * TILE_SIZE))
+    screen.render(surface)
+    return surface
+
+
+def render_still(world) -> Surface:
+    layers = (Layer(), Layer())
+    primitive = Animator(*layers).animate(world, Event.zero())[0]
+    surface = Surface((world.width * TILE_SIZE, world.height * TILE_SIZE))
+    for layer in layers:
+        primitive.render(surface, layer)
+    return surface
+
+
+@mark.parametrize('step_index', [0, 1, 3, len(ACTIONS)])
+def test_seek(step_index):
+    recording = create_recording()
+    screen = ReplayScreen(recording)
+    screen.update(1)
+    screen.seek(step_index)
+    assert screen.step_index == step_index
+    world = recording.world_at(step_index)
+    assert pixels(render_screen(screen, world)) == pixels(render_still(world))
+
+
+@mark.parametrize('start', [0, 4])
+def test_plays_one_step_at_a_time_to_the_end(start):
+    recording = create_recording()
+    screen = ReplayScreen(recording)
+    screen.seek(start)
+    step_indices = [screen.step_index]
+    while not screen.paused:
+        screen.update(0.5)
+        step_indices.append(screen.step_index)
+    assert sorted(set(step_indices)) == list(range(start, len(ACTIONS) + 1))
+    assert step_indices == sorted(step_indices)
+    world = recording.world
+    assert pixels(render_screen(screen, world)) == pixels(render_still(world))
+
+
+def test_paused_screen_stays_put():
+    recording = create_recording()
+    screen = ReplayScreen(recording)
+    screen.paused = True
+    screen.update(100)
+    assert screen.step_index == 0
+    screen.paused = False
+    screen.update(100)
+    assert screen.step_index == len(ACTIONS)
+    assert screen.paused
@@ -0,0 +1,161 @@
+from textwrap import dedent
+from typing import Any, List
+
+from pytest import raises
+
+from pysim.actors.environment import export
+from pysim.actors.rpc import RpcClient, RpcServer, RpcActor, RemoteError, exported_commands
+
+
+class Robot:
+    position: int
+    turns: int
+
+    def __init__(self):
+        self.position = 0
+        self.turns = 0
+
+    @export
+    def forward(self) -> None:
+        self.position += 1
+
+    @export
+    def turn_left(self) -> None:
+        self.turns += 1
+
+    @export
+    def crash(self) -> None:
+        raise ValueError('crashed')
+
+    @export
+    def where(self) -> int:
+        return self.position
+
+    @export
+    def add(self, x: int, y: int = 0) -> int:
+        return x + y
+
+
+class Replies:
+    messages: List[Any]
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message: Any) -> None:
+        self.messages.append(message)
+
+
+class Loopback:
+    """
+    Client side of a channel to a server in the same process, which handles messages as soon as they are sent.
+    """
+
+    sent: List[Any]
+    replies: Replies
+    server: RpcServer
+
+    def __init__(self, environment: Any):
+        self.sent = []
+        self.replies = Replies()
+        self.server = RpcServer(environment, self.replies)
+
+    def send(self, message: Any) -> None:
+        self.sent.append(message)
+        self.server.handle(message)
+
+    def receive(self) -> Any:
+        return self.replies.messages.pop(0)
+
+
+def create_client(batch_size=64):
+    robot = Robot()
+    channel = Loopback(robot)
+    return robot, channel, RpcClient(channel, batch_size)
+
+
+def test_commands_are_recognized():
+    assert exported_commands(Robot) == {
+        'forward': True,
+        'turn_left': True,
+        'crash': True,
+        'where': False,
+        'add': False,
+    }
+
+
+def test_commands_and_query_take_one_round_trip():
+    robot, channel, client = create_client()
+    client.command('forward')
+    client.command('forward')
+    client.command('turn_left')
+    assert robot.position == 0
+    assert client.call('where') == 2
+    assert len(channel.sent) == 1
+    assert robot.turns == 1
+
+
+def test_futures_are_pipelined():
+    robot, channel, client = create_client()
+    futures = [client.submit('add', i, y=10) for i in range(5)]
+    assert not any(future.done for future in futures)
+    assert futures[-1].result() == 14
+    assert all(future.done for future in futures)
+    assert [future.result() for future in futures] == [10, 11, 12, 13, 14]
+    assert len(channel.sent) == 1
+
+
+def test_batches_are_limited_in_size():
+    robot, channel, client = create_client(batch_size=3)
+    for _ in range(7):
+        client.command('forward')
+    assert len(channel.sent) == 2
+    client.close()
+    assert robot.position == 7
+
+
+def test_command_errors_surface_at_next_wait():
+    robot, channel, client = create_client()
+    client.command('crash')
+    client.command('forward')
+    with raises(RemoteError, match='crashed'):
+        client.call('where')
+    assert client.call('where') == 1
+
+
+def test_query_errors_surface_in_result():
+    robot, channel, client = create_client()
+    future = client.submit('add')
+    with raises(RemoteError):
+        future.result()
+    with raises(RemoteError, match='not exported'):
+        client.call('teleport')
+
+
+def test_rpc_actor():
+    source = dedent('''
+    forward()
+    forward()
+    turn_left()
+    assert where() == 2
+    forward()
+    ''')
+    robot = Robot()
+    actor = RpcActor(source, robot)
+    actor.serve()
+    assert actor.finished
+    assert robot.position == 3
+    assert robot.turns == 1
+
+
+def test_rpc_actor_executes_calls_made_before_an_error():
+    source = dedent('''
+    forward()
+    forward()
+    raise ValueError('stopped')
+    ''')
+    robot = Robot()
+    actor = RpcActor(source, robot)
+    actor.serve()
+    assert actor.finished
+    assert robot.position == 2
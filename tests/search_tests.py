@@ -0,0 +1,123 @@
+from pytest import mark, raises
+
+from pysim.data import Vector
+from pysim.search import Problem, PushDistances, breadth_first_search, a_star, iterative_deepening_a_star, \
+    solve, SearchLimitReached
+from pysim.simulation.levels import parse_world, format_world
+from pysim.simulation.simulation import Simulation
+
+SEARCHES = [breadth_first_search, a_star, iterative_deepening_a_star]
+
+SOLVABLE = [
+    (['>B..'], [Vector(3, 0)], 2),
+    (['>.B.'], [Vector(3, 0)], 2),
+    (['>B.', '...'], [Vector(2, 0)], 1),
+    (
+        [
+            'WWWWWW',
+            'W>B..W',
+            'W.B..W',
+            'W.^..W',
+            'WWWWWW',
+        ],
+        [Vector(4, 1), Vector(2, 1)],
+        3,
+    ),
+    (
+        [
+            'WWWWWWW',
+            'Wv....W',
+            'W.>B..W',
+            'WB....W',
+            'W.....W',
+            'WWWWWWW',
+        ],
+        [Vector(1, 4), Vector(5, 2)],
+        4,
+    ),
+]
+
+UNSOLVABLE = [
+    (['>BW'], [Vector(2, 0)]),
+    (['<B.'], [Vector(2, 0)]),
+    (['>BB.'], [Vector(3, 0)]),
+    (
+        [
+            'WWWWWW',
+            'W>.B.W',
+            'W^...W',
+            'W.B..W',
+            'W....W',
+            'WWWWWW',
+        ],
+        [Vector(4, 1), Vector(2, 1)],
+    ),
+]
+
+
+def replay(rows, actions):
+    simulation = Simulation(parse_world(rows))
+    for agent_index in actions:
+        simulation.forward(agent_index)
+    return simulation.world
+
+
+@mark.parametrize('search', SEARCHES)
+@mark.parametrize('rows, targets, expected_length', SOLVABLE)
+def test_finds_optimal_solution(search, rows, targets, expected_length):
+    problem = Problem(parse_world(rows), targets)
+    actions = search(problem)
+    assert actions is not None
+    assert len(actions) == expected_length
+    final = replay(rows, actions)
+    assert problem.is_goal(problem.encode(final))
+
+
+@mark.parametrize('search', SEARCHES)
+@mark.parametrize('rows, targets', UNSOLVABLE)
+def test_detects_unsolvable_levels(search, rows, targets):
+    assert search(Problem(parse_world(rows), targets)) is None
+
+
+@mark.parametrize('rows, targets, expected_length', SOLVABLE)
+def test_successors_agree_with_simulation(rows, targets, expected_length):
+    world = parse_world(rows)
+    problem = Problem(world, targets)
+    for agent_index in range(problem.agent_count):
+        simulation = Simulation(parse_world(rows))
+        simulation.forward(agent_index)
+        expected = problem.encode(simulation.world)
+        actual = problem.successor(problem.initial_state, agent_index)
+        assert (actual or problem.initial_state) == expected
+
+
+def test_dead_cells():
+    rows = [
+        'WWWWW',
+        'W>B.W',
+        'W...W',
+        'WWWWW',
+    ]
+    problem = Problem(parse_world(rows), [Vector(3, 1)])
+    distances = PushDistances(problem)
+    block_code = next(code for _, code in problem.blocks(problem.initial_state))
+    dead = {problem.position(cell) for cell in distances.dead_cells(block_code)}
+    assert Vector(2, 1) not in dead
+    assert Vector(3, 1) not in dead
+    assert Vector(2, 2) in dead
+    assert distances.distance(block_code, problem.cell(Vector(2, 1)), problem.cell(Vector(3, 1))) == 1
+
+
+def test_search_limit():
+    rows = [
+        'WWWWWWW',
+        'Wv....W',
+        'W.>B..W',
+        'WB....W',
+        'W.....W',
+        'WWWWWWW',
+    ]
+    world = parse_world(rows)
+    with raises(SearchLimitReached):
+        solve(world, [Vector(1, 4), Vector(5, 2)], max_states=1)
+    assert format_world(world) == rows
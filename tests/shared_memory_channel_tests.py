@@ -0,0 +1,91 @@
+from queue import Empty, Full
+from textwrap import dedent
+
+from pytest import fixture, mark, raises
+
+from pysim.actors.actor import Actor
+from pysim.actors.shared_memory_channel import SharedMemoryChannel, _encode
+from actor_tests import Environment
+
+
+@fixture
+def channels():
+    first, second = SharedMemoryChannel.pair(capacity=4096, timeout=0.1)
+    yield first, second
+    first.close()
+    second.close()
+
+
+@mark.parametrize('message', [
+    None, True, False, 0, -1, 2 ** 63 - 1, 1.5, '', 'forward', 'é' * 100,
+    ('forward',), ('turn', -1), ('move', 1, 2, 3),
+])
+def test_common_messages_are_encoded(channels, message):
+    first, second = channels
+    assert _encode(message) is not None
+    first.send(message)
+    received = second.receive()
+    assert received == message and type(received) is type(message)
+
+
+@mark.parametrize('message', [2 ** 64, 'x' * 2000, [1, 2], {'key': 'value'}, ('name', 'text'), (1, 2)])
+def test_other_messages_fall_back_to_queue(channels, message):
+    first, second = channels
+    assert _encode(message) is None
+    first.send(message)
+    assert second.receive() == message
+
+
+def test_order_is_preserved_across_fallback(channels):
+    first, second = channels
+    messages = ['a', [1], ('forward', 0), {'b': 2}, 3, None]
+    for message in messages:
+        first.send(message)
+    assert [second.receive() for _ in messages] == messages
+
+
+def test_full_ring_buffer_leaves_fallback_unsent(channels):
+    first, second = channels
+    sent = 0
+    # None takes as little room as a fallback marker
+    with raises(Full):
+        while True:
+            first.send(None)
+            sent += 1
+    with raises(Full):
+        first.send(['dropped'])
+    assert [second.receive() for _ in range(sent)] == [None] * sent
+    first.send(['sent'])
+    assert second.receive() == ['sent']
+    with raises(Empty):
+        second.receive()
+
+
+def test_wraps_around(channels):
+    first, second = channels
+    for index in range(1000):
+        message = ('step', index) if index % 3 else 'x' * (index % 700)
+        first.send(message)
+        assert second.receive() == message
+
+
+def test_directions_are_independent(channels):
+    first, second = channels
+    first.send('forth')
+    second.send('back')
+    assert first.receive() == 'back'
+    assert second.receive() == 'forth'
+    with raises(Empty):
+        first.receive()
+
+
+def test_actor_over_shared_memory():
+    source = dedent('''
+    message = hear()
+    say(message)
+    say([message])
+    ''')
+    actor = Actor[str](source, Environment, shared_memory=True)
+    actor.send('ping')
+    assert actor.receive() == 'ping'
+    assert actor.receive() == ['ping']
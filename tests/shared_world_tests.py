@@ -0,0 +1,106 @@
+from multiprocessing import Process, Queue
+
+from pytest import fixture, mark
+
+from pysim.data import Vector
+from pysim.simulation.kinds import encode_world, entity_codes, entity_kinds, EMPTY, NO_ENTITY, WALL
+from pysim.simulation.levels import parse_world
+from pysim.simulation.shared_world import SharedWorldPublisher, SharedWorldView
+from pysim.simulation.simulation import Simulation
+from pysim.simulation.entities import Block
+
+ROWS = [
+    '>B.W',
+    '....',
+    '^..<',
+]
+
+
+@fixture
+def simulation():
+    return Simulation(parse_world(ROWS))
+
+
+@fixture
+def publisher(simulation):
+    publisher = SharedWorldPublisher(simulation.world)
+    yield publisher
+    publisher.close()
+
+
+def test_view_matches_world(simulation, publisher):
+    view = publisher.view()
+    encoded = encode_world(simulation.world)
+    assert (view.tiles == encoded.codes).all()
+    assert (view.entities == entity_codes(encoded)).all()
+    assert view.agent_positions.tolist() == [[0, 0], [0, 2], [3, 2]]
+    assert view.agent_orientations.tolist() == [1, 0, 3]
+    assert not view.tiles.flags.writeable
+    view.close()
+
+
+def test_publish_updates_view(simulation, publisher):
+    view = publisher.view()
+    version = view.version
+    simulation.advance(0)
+    publisher.publish()
+    assert view.version == version + 2
+    assert view.agent_positions[0].tolist() == [1, 0]
+    snapshot_version, tiles, entities, positions, orientations = view.snapshot()
+    assert snapshot_version == view.version
+    assert entities[0, 2] == entity_kinds.code_of(Block())
+    view.close()
+
+
+def test_ahead(publisher):
+    view = publisher.view()
+    assert view.ahead(0) == (EMPTY, entity_kinds.code_of(Block()))
+    assert view.ahead(0, distance=3)[0] == WALL
+    assert view.ahead(1, distance=3) is None
+    view.close()
+
+
+def _read_in_child(view: SharedWorldView, results: Queue) -> None:
+    results.put((view.version, view.agent_positions.tolist()))
+    view.close()
+
+
+def test_view_in_other_process(simulation, publisher):
+    simulation.advance(2)
+    publisher.publish()
+    results = Queue()
+    process = Process(target=_read_in_child, args=(publisher.view(), results))
+    process.start()
+    version, positions = results.get(timeout=5)
+    process.join()
+    assert version == publisher.version
+    assert positions[2] == [2, 2]
+
+
+@mark.parametrize('agent_indices', [
+    [0],
+    [0, 0, 0],
+    [2, 2, 1, 0, 1],
+    [1, 1, 1, 2, 0, 0],
+])
+def test_publish_step_matches_full_publish(simulation, publisher, agent_indices):
+    view = publisher.view()
+    for agent_index in agent_indices:
+        publisher.publish_step(simulation.step(agent_index))
+    incremental = view.snapshot()[1:]
+    publisher.publish()
+    full = view.snapshot()[1:]
+    for incremental_array, full_array in zip(incremental, full):
+        assert (incremental_array == full_array).all()
+    view.close()
+
+
+def test_publish_changed_cells_only(simulation, publisher):
+    view = publisher.view()
+    simulation.advance(0)
+    publisher.publish([Vector(0, 0)])
+    assert view.entities[0, 0] == NO_ENTITY
+    # The agent's new cell was not listed, so it still shows the block
+    assert view.entities[0, 1] == entity_kinds.code_of(Block())
+    assert view.agent_positions[0].tolist() == [1, 0]
+    view.close()
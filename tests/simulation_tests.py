@@ -4,14 +4,20 @@ from abc import ABC, abstractmethod
 from copy import deepcopy
 from typing import List, Dict, Callable, Any
 
+from pygame import Vector2
 from pytest import mark
 
 import pysim.simulation.entities as entities
 import pysim.simulation.tiles as tiles
 from pysim.data import Grid, Vector
 from pysim.data.orientation import NORTH, EAST, WEST, SOUTH, Orientation
+from pysim.graphics.context import GraphicsContext
+from pysim.graphics.primitives.operations import UnionPrimitive
+from pysim.graphics.primitives.primitive import Primitive
 from pysim.simulation.agent import Agent
 from pysim.simulation.events import Event
+from pysim.simulation.levels import parse_world, format_world
+from pysim.simulation.outcome import Outcome
 from pysim.simulation.simulation import Simulation
 from pysim.simulation.world import World
 
@@ -65,6 +71,9 @@ class TestBlock(entities.Entity):
     def is_movable(self) -> bool:
         return True
 
+    def render(self, context: GraphicsContext, center: Vector2) -> Primitive:
+        return UnionPrimitive([])
+
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, TestBlock)
 
@@ -420,3 +429,142 @@ def test_forward_push_block_into_block(state):
     event = state.forward(0)
     assert state == expected
     assert event == Event.zero()
+
+
+@changes_state(
+    DEFAULT_CHAR_MAP,
+    [
+        (
+                [
+                    '>B.',
+                ],
+                [
+                    '.>B',
+                ],
+                None,
+        ),
+    ]
+)
+def test_snapshot_is_unaffected_by_forward(state, expected, event):
+    snapshot = deepcopy(state)
+    original = deepcopy(state)
+    state.forward(0)
+    assert state == expected
+    assert snapshot == original
+    assert snapshot != state
+
+
+@mark.parametrize('rows, steps, expected', [
+    (['>...'], 2, ['..>.']),
+    (['>B..'], 2, ['..>B']),
+    (['>>..'], 1, ['.>>.']),
+    (['>.W'], 3, ['.>W']),
+])
+def test_repeated_forward(rows, steps, expected):
+    simulation = Simulation(parse_world(rows))
+    for _ in range(steps):
+        simulation.forward(0)
+    assert format_world(simulation.world) == expected
+
+
+def test_pushed_agent_keeps_track_of_position():
+    simulation = Simulation(parse_world(['>>..']))
+    simulation.forward(0)
+    assert simulation.world.agent_positions == [Vector(1, 0), Vector(2, 0)]
+    simulation.forward(1)
+    assert format_world(simulation.world) == ['.>.>']
+
+
+@mark.parametrize('rows', [
+    ['>B..'],
+    ['>>.B.'],
+    ['>.W'],
+    ['>BW'],
+])
+def test_undo_reverts_forward(rows):
+    simulation = Simulation(parse_world(rows), keep_history=True)
+    simulation.forward(0)
+    simulation.undo()
+    assert format_world(simulation.world) == rows
+    assert simulation.world.agent_positions == parse_world(rows).agent_positions
+
+
+def test_rewind_and_restore():
+    rows = [
+        'v.....',
+        'B.<B..',
+        '......',
+    ]
+    simulation = Simulation(parse_world(rows), keep_history=True)
+    states = [format_world(simulation.world)]
+    for agent_index in [0, 1, 1, 0, 1, 1]:
+        simulation.forward(agent_index)
+        states.append(format_world(simulation.world))
+    checkpoint = simulation.checkpoint()
+    simulation.rewind(2)
+    assert format_world(simulation.world) == states[-3]
+    simulation.forward(1)
+    simulation.restore(4)
+    assert format_world(simulation.world) == states[4]
+    assert simulation.step_count == 4
+    simulation.restore(0)
+    assert format_world(simulation.world) == rows
+    assert checkpoint == 6
+
+
+@mark.parametrize('rows, agent_index, expected', [
+    (['>...'], 0, Outcome.MOVED),
+    (['>B..'], 0, Outcome.PUSHED),
+    (['>>..'], 0, Outcome.PUSHED),
+    (['>W'], 0, Outcome.BLOCKED),
+    (['>B'], 0, Outcome.BLOCKED),
+    (['.<'], 0, Outcome.MOVED),
+])
+def test_advance_matches_forward(rows, agent_index, expected):
+    headless = Simulation(parse_world(rows))
+    animated = Simulation(parse_world(rows))
+    assert headless.advance(agent_index) is expected
+    animated.forward(agent_index)
+    assert headless == animated
+
+
+@changes_state(
+    DEFAULT_CHAR_MAP,
+    [
+        (
+                [
+                    '>B.',
+                ],
+                [
+                    '.>B',
+                ],
+                parallel(
+                    agent_forward(Vector(0, 0)),
+                    object_moved(Vector(1, 0), EAST),
+                ),
+        ),
+        (
+                [
+                    '>..',
+                ],
+                [
+                    '.>.',
+                ],
+                agent_forward(Vector(0, 0)),
+        ),
+        (
+                [
+                    '>W.',
+                ],
+                [
+                    '>W.',
+                ],
+                Event.zero(),
+        ),
+    ]
+)
+def test_step_creates_event_on_demand(state, expected, event):
+    step = state.step(0)
+    assert state == expected
+    assert step.event == event
+    assert step.event is step.event
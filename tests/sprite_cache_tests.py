@@ -0,0 +1,128 @@
+from pygame import Color, Surface, Vector2, transform
+from pytest import mark
+
+from pysim.data.orientation import Orientation
+from pysim.graphics.layer import Layer
+from pysim.graphics.primitives.car import create_car, _render_car
+from pysim.graphics.primitives.image import Image
+from pysim.graphics.sprite_cache import SpriteCache, sprite_cache
+
+
+def create_surface(width: int = 8, height: int = 4) -> Surface:
+    surface = Surface((width, height))
+    surface.fill((255, 0, 0))
+    surface.fill((0, 0, 255), (width - 2, 0, 2, height))
+    return surface
+
+
+def pixels(surface: Surface):
+    return surface.get_size(), bytes(surface.get_buffer())
+
+
+@mark.parametrize('angle, scale', [
+    (0, 1),
+    (90, 1),
+    (-90, 1),
+    (45, 1),
+    (180, 2),
+    (30, 0.5),
+])
+def test_transform(angle, scale):
+    surface = create_surface()
+    cache = SpriteCache()
+    expected = transform.rotozoom(surface, angle, scale) if scale != 1 else transform.rotate(surface, angle)
+    assert pixels(cache.transform(surface, angle, scale)) == pixels(expected)
+
+
+@mark.parametrize('first, second', [
+    (90, 90),
+    (90, -270),
+    (90, 90.4),
+    (0, 360),
+    (0, 359.6),
+])
+def test_equivalent_angles_share_entries(first, second):
+    surface = create_surface()
+    cache = SpriteCache()
+    assert cache.transform(surface, first) is cache.transform(surface, second)
+    assert len(cache) == 1
+
+
+@mark.parametrize('first, second', [
+    (0, 1),
+    (90, 91),
+])
+def test_distinct_angles_get_distinct_entries(first, second):
+    surface = create_surface()
+    cache = SpriteCache()
+    assert cache.transform(surface, first) is not cache.transform(surface, second)
+
+
+def test_distinct_surfaces_get_distinct_entries():
+    cache = SpriteCache()
+    assert cache.transform(create_surface(), 0) is not cache.transform(create_surface(), 0)
+
+
+def test_least_recently_used_is_evicted():
+    surface = create_surface()
+    cache = SpriteCache(capacity=2)
+    first = cache.transform(surface, 0)
+    second = cache.transform(surface, 10)
+    assert cache.transform(surface, 0) is first
+    cache.transform(surface, 20)
+    assert len(cache) == 2
+    assert cache.transform(surface, 0) is first
+    assert cache.transform(surface, 10) is not second
+
+
+def test_prebake():
+    surface = create_surface()
+    cache = SpriteCache()
+    cache.prebake(surface)
+    assert len(cache) == 4
+    for angle in [0, 90, 180, 270]:
+        cache.transform(surface, angle)
+    assert len(cache) == 4
+
+
+def test_prebaked_rotations_are_not_evicted():
+    surface = create_surface()
+    cache = SpriteCache(capacity=1)
+    cache.prebake(surface)
+    baked = [cache.transform(surface, angle) for angle in [0, 90, 180, 270]]
+    cache.transform(surface, 10)
+    cache.transform(surface, 20)
+    assert len(cache) == 5
+    for angle, surface_at_angle in zip([0, 90, 180, 270], baked):
+        assert cache.transform(surface, angle) is surface_at_angle
+
+
+def test_image_transform_rotates_clockwise():
+    layer = Layer()
+    image = Image(layer, Vector2(0, 0), create_surface())
+    target = Surface((20, 20))
+    image.transform(Vector2(10, 10), 90).render(target, layer)
+    # Facing south, the blue front ends up at the bottom
+    assert tuple(target.get_at((10, 13)))[:3] == (0, 0, 255)
+    assert tuple(target.get_at((10, 8)))[:3] == (255, 0, 0)
+
+
+def test_cars_share_surfaces():
+    layer = Layer()
+    first = create_car(layer, Color(255, 0, 0), 20)
+    second = create_car(Layer(), Color(255, 0, 0), 20)
+    assert first.surface is second.surface
+    assert create_car(layer, Color(0, 255, 0), 20).surface is not first.surface
+    assert create_car(layer, Color(255, 0, 0), 30).surface is not first.surface
+
+
+def test_car_orientations_are_prebaked():
+    sprite_cache.clear()
+    _render_car.cache_clear()
+    car = create_car(Layer(), Color(1, 2, 3), 17)
+    assert len(sprite_cache) == 4
+    rotated = [car.transform(Vector2(0, 0), orientation.angle).surface for orientation in Orientation]
+    assert len(sprite_cache) == 4
+    assert len({id(surface) for surface in rotated}) == 4
+    for orientation, surface in zip(Orientation, rotated):
+        assert car.transform(Vector2(0, 0), orientation.angle).surface is surface
@@ -0,0 +1,77 @@
+from pygame import Rect, Surface
+from pytest import mark
+
+from pysim.data import Vector
+from pysim.graphics.context import GraphicsContext
+from pysim.graphics.layer import Layer
+from pysim.graphics.tile_cache import TileCache
+from pysim.simulation.levels import parse_world
+
+EMPTY = (200, 200, 200)
+WALL = (0, 0, 0)
+CHASM = (0, 0, 255)
+AGENT = (255, 0, 0)
+BLOCK = (139, 90, 43)
+COLORS = {'.': EMPTY, 'W': WALL, 'C': CHASM, '>': AGENT, 'B': BLOCK}
+
+
+class Context(GraphicsContext):
+    tile_layer = Layer()
+    entity_layer = Layer()
+    tile_size = 16
+
+    def tile_rectangle(self, position: Vector) -> Rect:
+        return Rect(position.x * self.tile_size, position.y * self.tile_size, self.tile_size, self.tile_size)
+
+
+def render(cache: TileCache, context: Context, rows) -> Surface:
+    world = parse_world(rows)
+    surface = Surface((world.width * context.tile_size, world.height * context.tile_size))
+    cache.render(world).render(surface, context.tile_layer)
+    return surface
+
+
+def cell_color(surface: Surface, context: Context, x: int, y: int):
+    center = (x * context.tile_size + context.tile_size // 2, y * context.tile_size + context.tile_size // 2)
+    return tuple(surface.get_at(center))[:3]
+
+
+@mark.parametrize('rows', [
+    ['.'],
+    ['W.C'],
+    ['>.W', 'CBW'],
+])
+def test_render(rows):
+    context = Context()
+    surface = render(TileCache(context), context, rows)
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            assert cell_color(surface, context, x, y) == COLORS[char]
+
+
+def test_only_invalidated_cells_are_rendered_again():
+    context = Context()
+    cache = TileCache(context)
+    render(cache, context, ['..', '..'])
+    cache.invalidate(Vector(1, 0))
+    surface = render(cache, context, ['WW', 'CC'])
+    assert [cell_color(surface, context, x, y) for y in range(2) for x in range(2)] == [EMPTY, WALL, EMPTY, EMPTY]
+
+
+def test_different_dimensions_render_everything():
+    context = Context()
+    cache = TileCache(context)
+    render(cache, context, ['..'])
+    surface = render(cache, context, ['W', 'C'])
+    assert [cell_color(surface, context, 0, y) for y in range(2)] == [WALL, CHASM]
+
+
+def test_moving_entities_are_left_out():
+    context = Context()
+    cache = TileCache(context)
+    world = parse_world(['>B'])
+    surface = Surface((2 * context.tile_size, context.tile_size))
+    cache.render(world, [Vector(1, 0)]).render(surface, context.tile_layer)
+    assert [cell_color(surface, context, x, 0) for x in range(2)] == [AGENT, EMPTY]
+    cache.render(world).render(surface, context.tile_layer)
+    assert [cell_color(surface, context, x, 0) for x in range(2)] == [AGENT, BLOCK]
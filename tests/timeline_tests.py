@@ -0,0 +1,64 @@
+from math import ulp
+
+from pytest import approx
+from pytest import mark
+
+from pysim.graphics.animations.constant import ConstantAnimation
+from pysim.graphics.animations.float import LinearFloatAnimation
+from pysim.graphics.animations.parallel import ParallelAnimation
+from pysim.graphics.animations.sequence import SequenceAnimation
+from pysim.graphics.animations.timeline import Timeline
+
+
+def almost(n):
+    return n - ulp(n)
+
+
+def nested(depth: int, width: int):
+    if depth == 0:
+        return LinearFloatAnimation(0, 1, 0.1)
+    return SequenceAnimation([nested(depth - 1, width) for _ in range(width)])
+
+
+@mark.parametrize('animation', [
+    SequenceAnimation([LinearFloatAnimation(0, 1, 1)]),
+    SequenceAnimation([LinearFloatAnimation(0, 1, 1), LinearFloatAnimation(1, 0, 2)]),
+    SequenceAnimation([ConstantAnimation(5, 0), LinearFloatAnimation(0, 1, 1), ConstantAnimation(3, 0)]),
+    SequenceAnimation([SequenceAnimation([LinearFloatAnimation(0, 1, 1)]), LinearFloatAnimation(1, 0, 1)]),
+    SequenceAnimation([SequenceAnimation([]), LinearFloatAnimation(0, 1, 1)]),
+    ParallelAnimation(sum, SequenceAnimation([LinearFloatAnimation(0, 1, 1)] * 3), ConstantAnimation(1, 2)),
+    SequenceAnimation([LinearFloatAnimation(0, 1, 2)] * 4).map(lambda x: x * 2),
+    nested(3, 3),
+    nested(2, 10),
+])
+def test_compiled_animation_is_equivalent(animation):
+    compiled = animation.compile()
+    assert compiled.duration == approx(animation.duration)
+    samples = [animation.duration * i / 97 for i in range(97)] + [almost(compiled.duration)]
+    for time in samples:
+        assert compiled[time] == approx(animation[min(time, almost(animation.duration))])
+
+
+@mark.parametrize('depth, width', [
+    (1, 1),
+    (2, 3),
+    (3, 4),
+])
+def test_nested_sequences_are_flattened(depth, width):
+    compiled = nested(depth, width).compile()
+    assert isinstance(compiled, Timeline)
+    assert len(compiled.children) == width ** depth
+    assert all(isinstance(child, LinearFloatAnimation) for child in compiled.children)
+
+
+def test_children_without_duration_are_left_out():
+    compiled = SequenceAnimation([ConstantAnimation(1, 0), ConstantAnimation(2, 1), ConstantAnimation(3, 0)]).compile()
+    assert compiled.duration == 1
+    assert compiled[0] == 2
+
+
+def test_children_are_copies():
+    child = LinearFloatAnimation(0, 1, 1)
+    for animation in [SequenceAnimation([child]), Timeline([child])]:
+        animation.children.append(child)
+        assert animation.duration == 1
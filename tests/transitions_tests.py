@@ -0,0 +1,61 @@
+from typing import Any
+
+from pytest import mark
+
+import pysim.simulation.tiles as tiles
+from pysim.data.orientation import EAST
+from pysim.simulation.agent import Agent
+from pysim.simulation.entities import Block
+from pysim.simulation.kinds import tile_kinds, entity_kinds, NO_ENTITY, EMPTY, WALL, CHASM
+from pysim.simulation.outcome import Outcome
+from pysim.simulation.transitions import transition_table, forward_outcome
+
+
+class Rubble(tiles.CannotContainObject, tiles.Tile):
+    """
+    Custom tile which can be walked on, but cannot hold blocks.
+    """
+
+    def render(self, context, position):
+        raise NotImplementedError()
+
+    def __deepcopy__(self, memo: Any) -> tiles.Tile:
+        return self
+
+    def is_traversable(self) -> bool:
+        return True
+
+
+BLOCK = entity_kinds.code_of(Block())
+
+
+@mark.parametrize('destination, beyond, expected', [
+    ((EMPTY, NO_ENTITY), (EMPTY, NO_ENTITY), Outcome.MOVED),
+    ((CHASM, NO_ENTITY), (WALL, NO_ENTITY), Outcome.MOVED),
+    ((WALL, NO_ENTITY), (EMPTY, NO_ENTITY), Outcome.BLOCKED),
+    ((EMPTY, BLOCK), (EMPTY, NO_ENTITY), Outcome.PUSHED),
+    ((EMPTY, BLOCK), (CHASM, NO_ENTITY), Outcome.PUSHED),
+    ((EMPTY, BLOCK), (EMPTY, BLOCK), Outcome.BLOCKED),
+    ((EMPTY, BLOCK), (WALL, NO_ENTITY), Outcome.BLOCKED),
+])
+def test_builtin_rules(destination, beyond, expected):
+    assert transition_table().lookup(*destination, *beyond) is expected
+
+
+def test_border_of_world():
+    table = transition_table()
+    assert table.lookup(EMPTY, NO_ENTITY, table.outside, NO_ENTITY) is Outcome.MOVED
+    assert table.lookup(EMPTY, BLOCK, table.outside, NO_ENTITY) is Outcome.BLOCKED
+
+
+def test_custom_tiles_are_supported():
+    assert forward_outcome(Rubble(), None) is Outcome.MOVED
+    assert forward_outcome(tiles.Empty(Block()), Rubble()) is Outcome.BLOCKED
+    rubble = tile_kinds.code_of(Rubble())
+    assert transition_table().lookup(rubble, NO_ENTITY, EMPTY, NO_ENTITY) is Outcome.MOVED
+
+
+def test_table_agrees_with_pushing_agents():
+    agent = entity_kinds.code_of(Agent(EAST))
+    assert transition_table().lookup(EMPTY, agent, EMPTY, NO_ENTITY) is Outcome.PUSHED
+    assert forward_outcome(tiles.Empty(Agent(EAST)), tiles.Empty(Block())) is Outcome.BLOCKED
@@ -1,7 +1,7 @@
 from pytest import mark
 
 from pysim.data import Vector
-from pysim.data.vector import NORTH, EAST, SOUTH, WEST
+from pysim.data.orientation import NORTH, EAST, SOUTH, WEST
 
 
 @mark.parametrize('x, y', [(x, y) for x in range(-5, 5) for y in range(-5, 5)])
@@ -55,3 +55,22 @@ def test_4ccw_eq_id(x, y):
 def test_cw_rotation(vector, expected):
     actual = vector.rotate_clockwise()
     assert actual == expected
+
+
+@mark.parametrize('orientation, distance', [(o, d) for o in [NORTH, EAST, SOUTH, WEST] for d in [0, 1, 2, 5]])
+def test_move(orientation, distance):
+    vector = Vector(3, -2)
+    expected = vector + Vector.from_orientation(orientation) * distance
+    assert vector.move(orientation, distance) == expected
+
+
+def test_hashes_are_well_distributed():
+    vectors = [Vector(x, y) for x in range(-32, 32) for y in range(-32, 32)]
+    assert len(set(map(hash, vectors))) == len(vectors)
+
+
+def test_equal_vectors_have_equal_hashes():
+    assert hash(Vector(4, 7)) == hash(Vector(4, 7))
+    assert Vector(4, 7) == Vector(4, 7)
+    assert Vector(4, 7) != Vector(7, 4)
+    assert Vector(4, 7) != (4, 7)
@@ -0,0 +1,67 @@
+from copy import deepcopy
+from random import Random
+
+from pytest import mark
+
+from pysim.simulation.levels import parse_world
+from pysim.simulation.simulation import Simulation
+
+LEVELS = [
+    [
+        'WWWWWW',
+        'W>B.CW',
+        'W.B..W',
+        'W^..<W',
+        'WWWWWW',
+    ],
+    [
+        'WWWWWWW',
+        'W>.B.CW',
+        'WBBv..W',
+        'W..B.BW',
+        'WC.^..W',
+        'WWWWWWW',
+    ],
+]
+
+
+@mark.parametrize('level', LEVELS)
+def test_incremental_hash_matches_full_computation(level):
+    rnd = Random(1)
+    simulation = Simulation(parse_world(level), keep_history=True)
+    agent_count = len(simulation.world.agent_positions)
+    for _ in range(20):
+        simulation.forward(rnd.randrange(agent_count))
+        assert simulation.world.zobrist == simulation.world.compute_zobrist()
+    simulation.restore(0)
+    assert simulation.world.zobrist == parse_world(level).zobrist
+
+
+@mark.parametrize('level', LEVELS)
+def test_equal_worlds_have_equal_hashes(level):
+    world = parse_world(level)
+    assert hash(world) == hash(parse_world(level))
+    assert hash(world) == hash(deepcopy(world))
+
+
+@mark.parametrize('first, second', [
+    (['>B.'], ['>.B']),
+    (['>.'], ['.>']),
+    (['>.'], ['<.']),
+    (['>W'], ['>C']),
+    (['>.<'], ['<.>']),
+])
+def test_different_worlds_have_different_hashes(first, second):
+    assert hash(parse_world(first)) != hash(parse_world(second))
+    assert parse_world(first) != parse_world(second)
+
+
+def test_worlds_as_keys():
+    simulation = Simulation(parse_world(['>..B..']))
+    visited = {simulation.world.snapshot()}
+    for _ in range(3):
+        simulation.forward(0)
+        visited.add(simulation.world.snapshot())
+    assert len(visited) == 4
+    assert parse_world(['..>B..']) in visited
+    assert parse_world(['...>B.']) in visited